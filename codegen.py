@@ -43,6 +43,8 @@ text_io.close()
 
 env = Environment(
     loader=FileSystemLoader(os.path.join(__location__, "templates")),
+    # generated modules end with a newline like all other modules
+    keep_trailing_newline=True,
     # autoescape=select_autoescape(['html'])
 )
 
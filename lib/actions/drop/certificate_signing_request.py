@@ -56,4 +56,4 @@ class DropCertificateSigningRequest(AbstractCommand):
                 wait_for_certificate_signing_request_is_away(context, obj)
             else:
                 print("No CertificateSigningRequest removal executed")
-        
\ No newline at end of file
+        
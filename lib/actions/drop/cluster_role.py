@@ -56,4 +56,4 @@ class DropClusterRole(AbstractCommand):
                 wait_for_cluster_role_is_away(context, obj)
             else:
                 print("No ClusterRole removal executed")
-        
\ No newline at end of file
+        
@@ -56,4 +56,4 @@ class DropClusterRoleBinding(AbstractCommand):
                 wait_for_cluster_role_binding_is_away(context, obj)
             else:
                 print("No ClusterRoleBinding removal executed")
-        
\ No newline at end of file
+        
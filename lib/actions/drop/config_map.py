@@ -55,4 +55,4 @@ class DropConfigMap(AbstractCommand):
                 wait_for_config_map_is_away(context, namespace, obj)
             else:
                 print("No ConfigMap removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropControllerRevision(AbstractCommand):
                 wait_for_controller_revision_is_away(context, namespace, obj)
             else:
                 print("No ControllerRevision removal executed")
-        
\ No newline at end of file
+        
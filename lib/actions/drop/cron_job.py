@@ -55,4 +55,4 @@ class DropCronJob(AbstractCommand):
                 wait_for_cron_job_is_away(context, namespace, obj)
             else:
                 print("No CronJob removal executed")
-        
\ No newline at end of file
+        
@@ -56,4 +56,4 @@ class DropCustomResourceDefinition(AbstractCommand):
                 wait_for_custom_resource_definition_is_away(context, obj)
             else:
                 print("No CustomResourceDefinition removal executed")
-        
\ No newline at end of file
+        
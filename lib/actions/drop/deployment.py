@@ -55,4 +55,4 @@ class DropDeployment(AbstractCommand):
                 wait_for_deployment_is_away(context, namespace, obj)
             else:
                 print("No Deployment removal executed")
-        
\ No newline at end of file
+        
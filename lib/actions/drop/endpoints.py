@@ -55,4 +55,4 @@ class DropEndpoints(AbstractCommand):
                 wait_for_endpoints_is_away(context, namespace, obj)
             else:
                 print("No Endpoints removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropEvent(AbstractCommand):
                 wait_for_event_is_away(context, namespace, obj)
             else:
                 print("No Event removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropHorizontalPodAutoscaler(AbstractCommand):
                 wait_for_horizontal_pod_autoscaler_is_away(context, namespace, obj)
             else:
                 print("No HorizontalPodAutoscaler removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropIngress(AbstractCommand):
                 wait_for_ingress_is_away(context, namespace, obj)
             else:
                 print("No Ingress removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropJob(AbstractCommand):
                 wait_for_job_is_away(context, namespace, obj)
             else:
                 print("No Job removal executed")
-        
\ No newline at end of file
+        
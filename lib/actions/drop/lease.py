@@ -55,4 +55,4 @@ class DropLease(AbstractCommand):
                 wait_for_lease_is_away(context, namespace, obj)
             else:
                 print("No Lease removal executed")
-        
\ No newline at end of file
+        
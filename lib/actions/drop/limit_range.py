@@ -55,4 +55,4 @@ class DropLimitRange(AbstractCommand):
                 wait_for_limit_range_is_away(context, namespace, obj)
             else:
                 print("No LimitRange removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropNetworkPolicy(AbstractCommand):
                 wait_for_network_policy_is_away(context, namespace, obj)
             else:
                 print("No NetworkPolicy removal executed")
-        
\ No newline at end of file
+        
@@ -56,4 +56,4 @@ class DropNode(AbstractCommand):
                 wait_for_node_is_away(context, obj)
             else:
                 print("No Node removal executed")
-        
\ No newline at end of file
+        
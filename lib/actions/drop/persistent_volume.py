@@ -56,4 +56,4 @@ class DropPersistentVolume(AbstractCommand):
                 wait_for_persistent_volume_is_away(context, obj)
             else:
                 print("No PersistentVolume removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropPersistentVolumeClaim(AbstractCommand):
                 wait_for_persistent_volume_claim_is_away(context, namespace, obj)
             else:
                 print("No PersistentVolumeClaim removal executed")
-        
\ No newline at end of file
+        
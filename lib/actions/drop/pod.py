@@ -55,4 +55,4 @@ class DropPod(AbstractCommand):
                 wait_for_pod_is_away(context, namespace, obj)
             else:
                 print("No Pod removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropPodDisruptionBudget(AbstractCommand):
                 wait_for_pod_disruption_budget_is_away(context, namespace, obj)
             else:
                 print("No PodDisruptionBudget removal executed")
-        
\ No newline at end of file
+        
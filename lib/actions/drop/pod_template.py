@@ -55,4 +55,4 @@ class DropPodTemplate(AbstractCommand):
                 wait_for_pod_template_is_away(context, namespace, obj)
             else:
                 print("No PodTemplate removal executed")
-        
\ No newline at end of file
+        
@@ -56,4 +56,4 @@ class DropPriorityClass(AbstractCommand):
                 wait_for_priority_class_is_away(context, obj)
             else:
                 print("No PriorityClass removal executed")
-        
\ No newline at end of file
+        
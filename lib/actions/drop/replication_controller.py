@@ -55,4 +55,4 @@ class DropReplicationController(AbstractCommand):
                 wait_for_replication_controller_is_away(context, namespace, obj)
             else:
                 print("No ReplicationController removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropResourceQuota(AbstractCommand):
                 wait_for_resource_quota_is_away(context, namespace, obj)
             else:
                 print("No ResourceQuota removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropRole(AbstractCommand):
                 wait_for_role_is_away(context, namespace, obj)
             else:
                 print("No Role removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropRoleBinding(AbstractCommand):
                 wait_for_role_binding_is_away(context, namespace, obj)
             else:
                 print("No RoleBinding removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropSecret(AbstractCommand):
                 wait_for_secret_is_away(context, namespace, obj)
             else:
                 print("No Secret removal executed")
-        
\ No newline at end of file
+        
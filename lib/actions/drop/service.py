@@ -55,4 +55,4 @@ class DropService(AbstractCommand):
                 wait_for_service_is_away(context, namespace, obj)
             else:
                 print("No Service removal executed")
-        
\ No newline at end of file
+        
@@ -55,4 +55,4 @@ class DropServiceAccount(AbstractCommand):
                 wait_for_service_account_is_away(context, namespace, obj)
             else:
                 print("No ServiceAccount removal executed")
-        
\ No newline at end of file
+        
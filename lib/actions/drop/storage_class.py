@@ -56,4 +56,4 @@ class DropStorageClass(AbstractCommand):
                 wait_for_storage_class_is_away(context, obj)
             else:
                 print("No StorageClass removal executed")
-        
\ No newline at end of file
+        
@@ -56,4 +56,4 @@ class DropVolumeAttachment(AbstractCommand):
                 wait_for_volume_attachment_is_away(context, obj)
             else:
                 print("No VolumeAttachment removal executed")
-        
\ No newline at end of file
+        
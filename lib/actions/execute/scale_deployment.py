@@ -21,10 +21,9 @@
 # specific language governing permissions and limitations
 # under the License.
 #
-from kubernetes import client
-
 from lib.common import AbstractCommand, ArgumentConfig, choose_context_and_namespace, confirm_number
 from lib.confirmer import confirm_deployment, confirm
+from lib.discovery import get_api
 
 
 class ScaleDeployment(AbstractCommand):
@@ -50,7 +49,7 @@ class ScaleDeployment(AbstractCommand):
         else:
             deployment = confirm_deployment(context, namespace)
 
-        api = client.ExtensionsV1beta1Api()
+        api = get_api(context, "Deployment", "AppsV1Api")
         ret, status, _ = api.read_namespaced_deployment_scale_with_http_info(deployment, namespace)
 
         # detected desired and current state
@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from lib.common import AbstractCommand, ArgumentConfig, choose_context
+from lib.output import list_kind
+
+# DO NOT TOUCH! this file is auto-generated and will be overwritten. Use templates/action_list.py.j2
+
+
+class ListCertificateSigningRequest(AbstractCommand):
+    """
+    Prints the CertificateSigningRequest table of the API server, page by page
+    """
+
+    def get_command(self) -> str:
+        return "list certificate_signing_request"
+
+    def get_attr_config(self) -> ArgumentConfig:
+        arg = ArgumentConfig()
+        arg.context = True
+        arg.contexts = True
+        arg.selector = True
+        arg.field_selector = True
+        arg.page_size = True
+        arg.no_gzip = True
+        arg.output = True
+        return arg
+
+    def run(self, args):
+        context = choose_context(args.context)
+        list_kind(context, "CertificateSigningRequest", args)
@@ -21,16 +21,26 @@
 # specific language governing permissions and limitations
 # under the License.
 #
-from kubernetes import client
-
-from lib.common import AbstractCommand, ArgumentConfig, load_kube
+from lib.common import AbstractCommand, ArgumentConfig
 from lib.confirmer import confirm_context
+from lib.discovery import get_api
+from lib.fields import list_options, namespaced
+from lib.informer import iter_cached_fields
+from lib.output import ROW_FORMATS, TABLE, print_table, write_rows
 
 
 class ListCronJobsByContext(AbstractCommand):
     def get_attr_config(self) -> ArgumentConfig:
         attr = ArgumentConfig()
         attr.context = True
+        attr.wire_format = True
+        attr.no_gzip = True
+        attr.contexts = True
+        attr.page_size = True
+        attr.namespace = True
+        attr.selector = True
+        attr.field_selector = True
+        attr.output = True
         return attr
 
     def run(self, args):
@@ -38,15 +48,25 @@ class ListCronJobsByContext(AbstractCommand):
             context = args.context
         else:
             context = confirm_context()
-        load_kube(context)
 
-        api = client.BatchV1beta1Api()
-        print("Listing cronjobs in all namespaces of context:", context)
-        ret = api.list_cron_job_for_all_namespaces()
+        api = get_api(context, "CronJob", "BatchV1Api")
+        print("Listing cronjobs in", args.namespace or "all namespaces", "of context:", context)
+        list_method = namespaced(api.list_namespaced_cron_job, api.list_cron_job_for_all_namespaces, args.namespace)
+        if getattr(args, "output", None) == TABLE:
+            print("results:", print_table(list_method, namespace_column=not args.namespace, **list_options(args)))
+            return
+        ret = iter_cached_fields(context, "CronJob", list_method, ["status.active", "metadata.namespace", "metadata.name"],
+                                 args.namespace, **list_options(args))
+
+        if getattr(args, "output", None) in ROW_FORMATS:
+            print("results:", write_rows(args, context, ["active", "namespace", "name"], ret))
+            return
 
-        print("results:", len(ret.items))
-        for i in ret.items:
-            print("%s\t%s\t%s\t" % (i.status.active, i.metadata.namespace, i.metadata.name))
+        count = 0
+        for active, namespace, name in ret:
+            print("%s\t%s\t%s\t" % (active, namespace, name))
+            count += 1
+        print("results:", count)
 
     def get_command(self) -> str:
         return "list cronjobs-by-context"
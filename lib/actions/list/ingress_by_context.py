@@ -21,10 +21,12 @@
 # specific language governing permissions and limitations
 # under the License.
 #
-from kubernetes import client
-
-from lib.common import AbstractCommand, ArgumentConfig, load_kube
+from lib.common import AbstractCommand, ArgumentConfig
 from lib.confirmer import confirm_context
+from lib.discovery import get_api
+from lib.fields import list_options, namespaced
+from lib.informer import iter_cached_fields
+from lib.output import ROW_FORMATS, TABLE, print_table, write_rows
 
 
 class ListIngressByContext(AbstractCommand):
@@ -35,6 +37,14 @@ class ListIngressByContext(AbstractCommand):
     def get_attr_config(self) -> ArgumentConfig:
         attr = ArgumentConfig()
         attr.context = True
+        attr.wire_format = True
+        attr.no_gzip = True
+        attr.contexts = True
+        attr.page_size = True
+        attr.namespace = True
+        attr.selector = True
+        attr.field_selector = True
+        attr.output = True
         return attr
 
     def run(self, args):
@@ -42,19 +52,28 @@ class ListIngressByContext(AbstractCommand):
             context = args.context
         else:
             context = confirm_context()
-        load_kube(context)
 
         # use the following for manual interaction with the k8s python api:
-        # api = client.ExtensionsV1beta1Api()
-        # api = client.CoreV1Api()
+        # api = get_api(context, "Ingress", "NetworkingV1Api")
         # ret = api.list_ingress_for_all_namespaces()
 
-        api = client.ExtensionsV1beta1Api()
-        print("Listing ingresses in all namespaces of context:", context)
-        ret = api.list_ingress_for_all_namespaces()
+        api = get_api(context, "Ingress", "NetworkingV1Api")
+        print("Listing ingresses in", args.namespace or "all namespaces", "of context:", context)
+        list_method = namespaced(api.list_namespaced_ingress, api.list_ingress_for_all_namespaces, args.namespace)
+        if getattr(args, "output", None) == TABLE:
+            print("results:", print_table(list_method, namespace_column=not args.namespace, **list_options(args)))
+            return
+        ret = iter_cached_fields(context, "Ingress", list_method, ["spec.rules", "metadata.namespace", "metadata.name"],
+                                 args.namespace, **list_options(args))
+
+        if getattr(args, "output", None) in ROW_FORMATS:
+            print("results:", write_rows(args, context, ["rules", "namespace", "name"], ret))
+            return
 
-        print("results:", len(ret.items))
-        for i in ret.items:
-            if i.spec.rules is not None:
-                for rule in i.spec.rules:
-                    print("%s\t%s\t%s\t" % (rule.host, i.metadata.namespace, i.metadata.name))
+        count = 0
+        for rules, namespace, name in ret:
+            if rules is not None:
+                for rule in rules:
+                    print("%s\t%s\t%s\t" % (rule.get("host"), namespace, name))
+            count += 1
+        print("results:", count)
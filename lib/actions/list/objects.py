@@ -0,0 +1,56 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from typing import Iterable
+
+from lib.common import AbstractCommand, ArgumentConfig, CustomParameter, DynamicArgs, choose_context
+from lib.output import list_kind
+
+
+class ListObjects(AbstractCommand):
+    """
+    Prints the table of any kind the cluster serves, e.g. of custom resources which have no own list command
+    """
+
+    def get_command(self) -> str:
+        return "list objects"
+
+    def get_additional_attr_config(self) -> Iterable[CustomParameter]:
+        return (CustomParameter("kind", "a kind served by the cluster, e.g. Deployment or Certificate", str),)
+
+    def get_attr_config(self) -> ArgumentConfig:
+        args = ArgumentConfig()
+        args.context = True
+        args.contexts = True
+        args.namespace = True
+        args.selector = True
+        args.field_selector = True
+        args.page_size = True
+        args.no_gzip = True
+        args.output = True
+        return args
+
+    def run(self, args):
+        context = choose_context(args.context)
+        arguments = DynamicArgs(context, args, self.get_additional_attr_config())
+        list_kind(context, arguments.val("kind"), args)
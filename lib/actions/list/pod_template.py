@@ -21,39 +21,32 @@
 # specific language governing permissions and limitations
 # under the License.
 #
-from lib.checker import wait_for_pod_security_policy_is_away
-from lib.common import AbstractCommand, choose_context_and_namespace, ArgumentConfig
-from lib.confirmer import confirm_pod_security_policy, confirm
-from lib.remover import remove_pod_security_policy
+from lib.common import AbstractCommand, ArgumentConfig, choose_context
+from lib.output import list_kind
 
-# DO NOT TOUCH! this file is auto-generated and will be overwritten. Use templates/action_removal.py.j2
+# DO NOT TOUCH! this file is auto-generated and will be overwritten. Use templates/action_list.py.j2
 
 
-class DropPodSecurityPolicy(AbstractCommand):
+class ListPodTemplate(AbstractCommand):
+    """
+    Prints the PodTemplate table of the API server, page by page
+    """
 
     def get_command(self) -> str:
-        return "drop pod_security_policy"
+        return "list pod_template"
 
     def get_attr_config(self) -> ArgumentConfig:
         arg = ArgumentConfig()
         arg.context = True
+        arg.contexts = True
         arg.namespace = True
-        arg.pod_security_policy = True
+        arg.selector = True
+        arg.field_selector = True
+        arg.page_size = True
+        arg.no_gzip = True
+        arg.output = True
         return arg
 
     def run(self, args):
-        
-        from lib.common import choose_context
         context = choose_context(args.context)
-
-        if args.pod_security_policy:
-            remove_pod_security_policy(context, args.pod_security_policy)
-            wait_for_pod_security_policy_is_away(context, args.pod_security_policy)
-        else:
-            obj = confirm_pod_security_policy(context)
-            if obj is not None and confirm("Do you really want to delete PodSecurityPolicy " + obj + "?"):
-                remove_pod_security_policy(context, obj)
-                wait_for_pod_security_policy_is_away(context, obj)
-            else:
-                print("No PodSecurityPolicy removal executed")
-        
\ No newline at end of file
+        list_kind(context, "PodTemplate", args)
@@ -23,8 +23,16 @@
 #
 from kubernetes import client
 
-from lib.common import AbstractCommand, load_kube, ArgumentConfig
+from lib.common import AbstractCommand, ArgumentConfig
 from lib.confirmer import confirm_context
+from lib.fields import list_options, namespaced
+from lib.informer import iter_cached_fields
+from lib.output import ROW_FORMATS, TABLE, print_table, write_rows
+from lib.pool import get_api_client
+
+POD_FIELDS = ["status.podIP", "metadata.namespace", "metadata.name", "metadata.ownerReferences.0.kind",
+              "metadata.ownerReferences.0.name"]
+POD_COLUMNS = ["ip", "namespace", "name", "owner_kind", "owner_name"]
 
 
 class ListPodsByContext(AbstractCommand):
@@ -32,6 +40,14 @@ class ListPodsByContext(AbstractCommand):
     def get_attr_config(self) -> ArgumentConfig:
         ac = ArgumentConfig()
         ac.context = True
+        ac.wire_format = True
+        ac.no_gzip = True
+        ac.contexts = True
+        ac.page_size = True
+        ac.namespace = True
+        ac.selector = True
+        ac.field_selector = True
+        ac.output = True
         return ac
 
     def run(self, args):
@@ -39,19 +55,29 @@ class ListPodsByContext(AbstractCommand):
             context = args.context
         else:
             context = confirm_context()
-        load_kube(context)
 
-        v1 = client.CoreV1Api()
+        v1 = client.CoreV1Api(get_api_client(context))
         print("Listing pods with their IPs and owner in context:", context)
-        ret = v1.list_pod_for_all_namespaces(watch=False)
+        list_method = namespaced(v1.list_namespaced_pod, v1.list_pod_for_all_namespaces, args.namespace)
+        if getattr(args, "output", None) == TABLE:
+            print("results:", print_table(list_method, namespace_column=not args.namespace, **list_options(args)))
+            return
+        ret = iter_cached_fields(context, "Pod", list_method, POD_FIELDS, args.namespace, watch=False,
+                                 **list_options(args))
+
+        if getattr(args, "output", None) in ROW_FORMATS:
+            print("results:", write_rows(args, context, POD_COLUMNS, ret))
+            return
 
-        print("results:", len(ret.items))
-        for i in ret.items:
+        # rows are printed page by page
+        count = 0
+        for pod_ip, namespace, name, owner_kind, owner_name in ret:
             owner_reference = ''
-            if i.metadata.owner_references:
-                owner = i.metadata.owner_references[0]
-                owner_reference = owner.kind + "(" + owner.name + ")"
-            print("%s\t%s\t%s\t%s\t" % (i.status.pod_ip, i.metadata.namespace, i.metadata.name, owner_reference))
+            if owner_kind:
+                owner_reference = owner_kind + "(" + owner_name + ")"
+            print("%s\t%s\t%s\t%s\t" % (pod_ip, namespace, name, owner_reference))
+            count += 1
+        print("results:", count)
 
     def get_command(self) -> str:
         return "list pods-by-context"
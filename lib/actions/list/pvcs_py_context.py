@@ -23,14 +23,31 @@
 #
 from kubernetes import client
 
-from lib.common import AbstractCommand, ArgumentConfig, load_kube
+from lib.common import AbstractCommand, ArgumentConfig
 from lib.confirmer import confirm_context
+from lib.fields import list_options, namespaced
+from lib.informer import iter_cached_fields
+from lib.output import ROW_FORMATS, TABLE, print_table, write_rows
+from lib.pool import get_api_client
+
+# claims have no IP like pods, their phase is shown instead
+PVC_FIELDS = ["status.phase", "metadata.namespace", "metadata.name", "metadata.ownerReferences.0.kind",
+              "metadata.ownerReferences.0.name"]
+PVC_COLUMNS = ["phase", "namespace", "name", "owner_kind", "owner_name"]
 
 
 class ListPvcsByContext(AbstractCommand):
     def get_attr_config(self) -> ArgumentConfig:
         attr = ArgumentConfig()
         attr.context = True
+        attr.wire_format = True
+        attr.no_gzip = True
+        attr.contexts = True
+        attr.page_size = True
+        attr.namespace = True
+        attr.selector = True
+        attr.field_selector = True
+        attr.output = True
         return attr
 
     def run(self, args):
@@ -38,19 +55,30 @@ class ListPvcsByContext(AbstractCommand):
             context = args.context
         else:
             context = confirm_context()
-        load_kube(context)
 
-        api = client.CoreV1Api()
-        print("Listing pvcs in all namespaces of context:", context)
-        ret = api.list_persistent_volume_claim_for_all_namespaces()
+        api = client.CoreV1Api(get_api_client(context))
+        print("Listing pvcs in", args.namespace or "all namespaces", "of context:", context)
+        list_method = namespaced(api.list_namespaced_persistent_volume_claim,
+                                 api.list_persistent_volume_claim_for_all_namespaces, args.namespace)
+        if getattr(args, "output", None) == TABLE:
+            print("results:", print_table(list_method, namespace_column=not args.namespace, **list_options(args)))
+            return
+        ret = iter_cached_fields(context, "PersistentVolumeClaim", list_method, PVC_FIELDS, args.namespace,
+                                 **list_options(args))
+
+        if getattr(args, "output", None) in ROW_FORMATS:
+            print("results:", write_rows(args, context, PVC_COLUMNS, ret))
+            return
 
-        print("results:", len(ret.items))
-        for i in ret.items:
+        # rows are printed page by page
+        count = 0
+        for phase, namespace, name, owner_kind, owner_name in ret:
             owner_reference = ''
-            if i.metadata.owner_references:
-                owner = i.metadata.owner_references[0]
-                owner_reference = owner.kind + "(" + owner.name + ")"
-            print("%s\t%s\t%s\t%s\t" % (i.status.pod_ip, i.metadata.namespace, i.metadata.name, owner_reference))
+            if owner_kind:
+                owner_reference = owner_kind + "(" + owner_name + ")"
+            print("%s\t%s\t%s\t%s\t" % (phase, namespace, name, owner_reference))
+            count += 1
+        print("results:", count)
 
     def get_command(self) -> str:
         return "list pvc-by-context"
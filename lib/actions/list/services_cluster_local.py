@@ -24,6 +24,11 @@
 from kubernetes import client
 
 from lib.common import AbstractCommand, ArgumentConfig, choose_context
+from lib.discovery import get_api
+from lib.fields import list_options, namespaced
+from lib.informer import iter_cached_fields
+from lib.output import ROW_FORMATS, TABLE, write_rows
+from lib.pool import get_api_client
 
 
 class ServicesClusterLocal(AbstractCommand):
@@ -39,32 +44,76 @@ class ServicesClusterLocal(AbstractCommand):
     def get_attr_config(self) -> ArgumentConfig:
         args = ArgumentConfig()
         args.context = True
+        args.wire_format = True
+        args.no_gzip = True
+        args.contexts = True
+        args.page_size = True
+        args.namespace = True
+        args.selector = True
+        args.field_selector = True
+        args.output = True
         return args
 
     def run(self, args):
-        context = choose_context()
+        # the server-side table has no column to filter the host names by
+        if getattr(args, "output", None) == TABLE:
+            raise SystemExit("list svc-cluster-local has no table output, use text, "
+                             + ", ".join(ROW_FORMATS) + " instead")
+        context = choose_context(args.context)
         print("Listing all services with cluster.local in external_name", context)
 
-        api = client.CoreV1Api()
-        svcs = api.list_service_for_all_namespaces()
-        print("Found", len(svcs.items), "services in all namespaces")
-        counter = 0
+        api = client.CoreV1Api(get_api_client(context))
+        svcs = iter_cached_fields(context, "Service",
+                                  namespaced(api.list_namespaced_service, api.list_service_for_all_namespaces,
+                                             args.namespace),
+                                  ["metadata.namespace", "metadata.name", "spec.externalName"], args.namespace,
+                                  **list_options(args))
         key = "cluster.local"
+        if getattr(args, "output", None) in ROW_FORMATS:
+            print("results:", write_rows(args, context, ["kind", "namespace", "name", "host"],
+                                         self.cluster_local_rows(context, args, svcs, key)))
+            return
+        total = 0
+        counter = 0
         print("Namespace\tService\tExternalName\t")
-        for svc in svcs.items:
-            if key in str(svc.spec.external_name):
-                print("%s\t%s\t%s" % (svc.metadata.namespace, svc.metadata.name, svc.spec.external_name))
+        for namespace, name, external_name in svcs:
+            if key in str(external_name):
+                print("%s\t%s\t%s" % (namespace, name, external_name))
                 counter += 1
+            total += 1
+        print("Found", total, "services in all namespaces")
         print("Found %u services with an external name containing '%s'" % (counter, key))
         # ingress hosts
-        api2 = client.ExtensionsV1beta1Api()
-        ingresses = api2.list_ingress_for_all_namespaces()
-        print("Found %d ingresses in all namespaces" % len(ingresses.items))
+        ingresses = self.ingresses(context, args)
+        total = 0
         counter = 0
         print("Namespace\tIngress name\tHost name")
-        for ing in ingresses.items:
-            if ing.spec.rules is not None:
-                for rule in ing.spec.rules:
-                    if key in str(rule.host):
-                        print("%s\t%s\t%s" % (ing.metadata.namespace, ing.metadata.name, rule.host))
+        for namespace, name, rules in ingresses:
+            if rules is not None:
+                for rule in rules:
+                    if key in str(rule.get("host")):
+                        print("%s\t%s\t%s" % (namespace, name, rule.get("host")))
+                        counter += 1
+            total += 1
+        print("Found %d ingresses in all namespaces" % total)
         print("Found %u ingresses with host names containing '%s'" % (counter, key))
+
+    def ingresses(self, context, args):
+        api = get_api(context, "Ingress", "NetworkingV1Api")
+        return iter_cached_fields(context, "Ingress",
+                                  namespaced(api.list_namespaced_ingress, api.list_ingress_for_all_namespaces,
+                                             args.namespace),
+                                  ["metadata.namespace", "metadata.name", "spec.rules"], args.namespace,
+                                  **list_options(args))
+
+    def cluster_local_rows(self, context, args, services, key):
+        """
+        Services and ingress hosts which contain the key as (kind, namespace, name, host)
+        """
+        for namespace, name, external_name in services:
+            if key in str(external_name):
+                yield "Service", namespace, name, external_name
+        for namespace, name, rules in self.ingresses(context, args):
+            for rule in rules or ():
+                if key in str(rule.get("host")):
+                    yield "Ingress", namespace, name, rule.get("host")
@@ -26,7 +26,6 @@ import os
 from abc import abstractmethod, ABC
 
 from lib.checker import wait_for_pod_is_up
-from lib.common import load_kube
 from lib.exec import CommandChecker, run_command_in_pod, RemoteFileHash, DownloadFile, LocalFileHash, EnoughSpaceCheck, \
     RemoteDirExists, UploadFile
 
@@ -152,8 +151,6 @@ class Migrator(ABC):
             print("file size:", file_size_kb, "KB")
         else:
             print("file size:", file_size_mb, "MB")
-        # switch kube-ctl context
-        load_kube(context_dest)
         has_enough_space = EnoughSpaceCheck(context_src, namespace_src, pod_src, file_size_mb).run()
         if not has_enough_space:
             raise SystemExit(
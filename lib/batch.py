@@ -0,0 +1,171 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import argparse
+import io
+import json
+import shlex
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import lib.input
+from lib.input import NonInteractiveAdapter, set_current_input_adapter
+from lib.register import get_register
+from lib.runner import run_command_line
+from lib.util import ThreadLocalStream
+
+
+class BatchLine:
+    """
+    A single command line of a batch file and the result of its execution
+    """
+
+    def __init__(self, number, argv):
+        self.number = number
+        self.argv = argv
+        self.status = None
+        self.duration = 0.0
+
+    def command(self) -> str:
+        return " ".join(shlex.quote(i) for i in self.argv)
+
+
+def parse_batch_line(line) -> list:
+    """
+    A line is either a shell-like command line or a json list of arguments or a json object with key "argv".
+    Returns None for empty lines and comments.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("[") or line.startswith("{"):
+        data = json.loads(line)
+        argv = data.get("argv") if isinstance(data, dict) else data
+        if not isinstance(argv, list):
+            raise ValueError("json line without list of arguments")
+        return [str(i) for i in argv]
+    return shlex.split(line)
+
+
+def read_batch_file(file) -> [BatchLine]:
+    lines = list()
+    for number, line in enumerate(file, start=1):
+        try:
+            argv = parse_batch_line(line)
+        except ValueError as e:
+            raise SystemExit("invalid batch line %d: %s" % (number, e))
+        if argv:
+            lines.append(BatchLine(number, argv))
+    return lines
+
+
+class Batch:
+    """
+    Executes the lines of a batch file in this process, optionally several lines at once.
+    Lines which run in parallel have to be independent of each other.
+    """
+
+    def __init__(self, lines: [BatchLine], parallel=1, register=None):
+        self.lines = lines
+        self.parallel = max(1, parallel)
+        self.register = register if register is not None else get_register()
+
+    def run(self) -> int:
+        # nobody answers dialogs of a batch run, a shell keeps its own input afterwards
+        input_adapter = lib.input.current_input_adapter
+        set_current_input_adapter(NonInteractiveAdapter())
+        # read the manifest once before threads use the registry
+        self.register.manifest()
+        try:
+            if self.parallel == 1:
+                for line in self.lines:
+                    self.execute(line)
+            else:
+                self.run_parallel()
+        finally:
+            set_current_input_adapter(input_adapter)
+        self.print_summary()
+        return 0 if all(i.status == 0 for i in self.lines) else 1
+
+    def run_parallel(self):
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = ThreadLocalStream(stdout), ThreadLocalStream(stderr)
+        try:
+            with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+                for line, output in executor.map(self.execute_captured, self.lines):
+                    # output of a line is printed in one piece and in order of the batch file
+                    stdout.write(output)
+                    stdout.flush()
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+    def execute_captured(self, line: BatchLine) -> (BatchLine, str):
+        output = io.StringIO()
+        with sys.stdout.redirect(output), sys.stderr.redirect(output):
+            self.execute(line)
+        return line, output.getvalue()
+
+    def execute(self, line: BatchLine):
+        print("[%d] %s" % (line.number, line.command()))
+        start = time.monotonic()
+        line.status = run_command_line(line.argv, self.register)
+        line.duration = time.monotonic() - start
+
+    def print_summary(self):
+        print("------")
+        print("Line\tStatus\tSeconds\tCommand")
+        for i in self.lines:
+            print("%d\t%s\t%.2f\t%s" % (i.number, i.status, i.duration, i.command()))
+        failed = len([i for i in self.lines if i.status != 0])
+        print("%d of %d command lines failed" % (failed, len(self.lines)))
+
+
+def run_batch(argv) -> int:
+    """
+    Entry point of "main.py batch"
+    """
+    parser = argparse.ArgumentParser(prog="python3 main.py batch",
+                                     description="execute the command lines of a file in one process")
+    parser.add_argument("file", type=str, help="file with one command line or json list of arguments per line, "
+                                               "'-' reads stdin")
+    parser.add_argument("--parallel", type=int, default=1, help="number of independent lines executed at once")
+    args = parser.parse_args(argv)
+
+    if args.file == "-":
+        lines = read_batch_file(sys.stdin)
+    else:
+        try:
+            with open(args.file, 'r') as file:
+                lines = read_batch_file(file)
+        except OSError as e:
+            raise SystemExit("Could not read batch file: %s" % e)
+    return Batch(lines, args.parallel).run()
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,10 @@
 #
 from kubernetes.client.rest import ApiException
 
-from lib.common import load_kube, SetType
+from lib.common import SetType
+from lib.discovery import get_api
+from lib.informer import get_informer
+from lib.pool import get_api_client
 from kubernetes import client
 import time
 import datetime
@@ -41,10 +44,9 @@ def wait_for_namespace_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Namespace", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Namespace", name,
+    api = get_api(context, "Namespace", "CoreV1Api")
+    return general_away_check(context, namespace, "Namespace", name,
                               lambda: api.read_namespace_with_http_info(namespace))
 
 
@@ -55,10 +57,9 @@ def wait_for_deployment_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Deployment", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_away_check(namespace, "Deployment", name,
+    api = get_api(context, "Deployment", "AppsV1Api")
+    return general_away_check(context, namespace, "Deployment", name,
                               lambda: api.read_namespaced_deployment_status_with_http_info(name, namespace=namespace))
 
 
@@ -69,10 +70,9 @@ def wait_for_pod_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Pod", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Pod", name,
+    api = get_api(context, "Pod", "CoreV1Api")
+    return general_away_check(context, namespace, "Pod", name,
                               lambda: api.read_namespaced_pod_status_with_http_info(name, namespace=namespace))
 
 
@@ -83,10 +83,9 @@ def wait_for_service_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Service", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Service", name,
+    api = get_api(context, "Service", "CoreV1Api")
+    return general_away_check(context, namespace, "Service", name,
                               lambda: api.read_namespaced_service_status_with_http_info(name, namespace=namespace))
 
 
@@ -97,10 +96,9 @@ def wait_for_replication_controller_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "ReplicationController", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "ReplicationController", name,
+    api = get_api(context, "ReplicationController", "CoreV1Api")
+    return general_away_check(context, namespace, "ReplicationController", name,
                               lambda: api.read_namespaced_replication_controller_status_with_http_info(name, namespace=namespace))
 
 
@@ -111,10 +109,9 @@ def wait_for_persistent_volume_claim_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "PersistentVolumeClaim", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "PersistentVolumeClaim", name,
+    api = get_api(context, "PersistentVolumeClaim", "CoreV1Api")
+    return general_away_check(context, namespace, "PersistentVolumeClaim", name,
                               lambda: api.read_namespaced_persistent_volume_claim_with_http_info(name, namespace=namespace))
 
 
@@ -125,10 +122,9 @@ def wait_for_ingress_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Ingress", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_away_check(namespace, "Ingress", name,
+    api = get_api(context, "Ingress", "NetworkingV1Api")
+    return general_away_check(context, namespace, "Ingress", name,
                               lambda: api.read_namespaced_ingress_status_with_http_info(name, namespace=namespace))
 
 
@@ -139,10 +135,9 @@ def wait_for_network_policy_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "NetworkPolicy", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_away_check(namespace, "NetworkPolicy", name,
+    api = get_api(context, "NetworkPolicy", "NetworkingV1Api")
+    return general_away_check(context, namespace, "NetworkPolicy", name,
                               lambda: api.read_namespaced_network_policy_with_http_info(name, namespace=namespace))
 
 
@@ -153,10 +148,9 @@ def wait_for_job_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Job", name, "in namespace", namespace)
-    api = client.BatchV1Api()
-    return general_away_check(namespace, "Job", name,
+    api = get_api(context, "Job", "BatchV1Api")
+    return general_away_check(context, namespace, "Job", name,
                               lambda: api.read_namespaced_job_status_with_http_info(name, namespace=namespace))
 
 
@@ -167,10 +161,9 @@ def wait_for_cron_job_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "CronJob", name, "in namespace", namespace)
-    api = client.BatchV1beta1Api()
-    return general_away_check(namespace, "CronJob", name,
+    api = get_api(context, "CronJob", "BatchV1Api")
+    return general_away_check(context, namespace, "CronJob", name,
                               lambda: api.read_namespaced_cron_job_status_with_http_info(name, namespace=namespace))
 
 
@@ -181,10 +174,9 @@ def wait_for_config_map_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "ConfigMap", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "ConfigMap", name,
+    api = get_api(context, "ConfigMap", "CoreV1Api")
+    return general_away_check(context, namespace, "ConfigMap", name,
                               lambda: api.read_namespaced_config_map_with_http_info(name, namespace=namespace))
 
 
@@ -195,10 +187,9 @@ def wait_for_secret_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Secret", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Secret", name,
+    api = get_api(context, "Secret", "CoreV1Api")
+    return general_away_check(context, namespace, "Secret", name,
                               lambda: api.read_namespaced_secret_with_http_info(name, namespace=namespace))
 
 
@@ -209,10 +200,9 @@ def wait_for_service_account_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "ServiceAccount", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "ServiceAccount", name,
+    api = get_api(context, "ServiceAccount", "CoreV1Api")
+    return general_away_check(context, namespace, "ServiceAccount", name,
                               lambda: api.read_namespaced_service_account_with_http_info(name, namespace=namespace))
 
 
@@ -223,10 +213,9 @@ def wait_for_resource_quota_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "ResourceQuota", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "ResourceQuota", name,
+    api = get_api(context, "ResourceQuota", "CoreV1Api")
+    return general_away_check(context, namespace, "ResourceQuota", name,
                               lambda: api.read_namespaced_resource_quota_with_http_info(name, namespace=namespace))
 
 
@@ -237,10 +226,9 @@ def wait_for_endpoints_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Endpoints", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Endpoints", name,
+    api = get_api(context, "Endpoints", "CoreV1Api")
+    return general_away_check(context, namespace, "Endpoints", name,
                               lambda: api.read_namespaced_endpoints_with_http_info(name, namespace=namespace))
 
 
@@ -251,10 +239,9 @@ def wait_for_pod_template_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "PodTemplate", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "PodTemplate", name,
+    api = get_api(context, "PodTemplate", "CoreV1Api")
+    return general_away_check(context, namespace, "PodTemplate", name,
                               lambda: api.read_namespaced_pod_template_with_http_info(name, namespace=namespace))
 
 
@@ -265,10 +252,9 @@ def wait_for_role_binding_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "RoleBinding", name, "in namespace", namespace)
-    api = client.RbacAuthorizationV1Api()
-    return general_away_check(namespace, "RoleBinding", name,
+    api = get_api(context, "RoleBinding", "RbacAuthorizationV1Api")
+    return general_away_check(context, namespace, "RoleBinding", name,
                               lambda: api.read_namespaced_role_binding_with_http_info(name, namespace=namespace))
 
 
@@ -279,10 +265,9 @@ def wait_for_role_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Role", name, "in namespace", namespace)
-    api = client.RbacAuthorizationV1Api()
-    return general_away_check(namespace, "Role", name,
+    api = get_api(context, "Role", "RbacAuthorizationV1Api")
+    return general_away_check(context, namespace, "Role", name,
                               lambda: api.read_namespaced_role_with_http_info(name, namespace=namespace))
 
 
@@ -293,10 +278,9 @@ def wait_for_pod_disruption_budget_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "PodDisruptionBudget", name, "in namespace", namespace)
-    api = client.PolicyV1beta1Api()
-    return general_away_check(namespace, "PodDisruptionBudget", name,
+    api = get_api(context, "PodDisruptionBudget", "PolicyV1Api")
+    return general_away_check(context, namespace, "PodDisruptionBudget", name,
                               lambda: api.read_namespaced_pod_disruption_budget_with_http_info(name, namespace=namespace))
 
 
@@ -307,10 +291,9 @@ def wait_for_event_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Event", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "Event", name,
+    api = get_api(context, "Event", "CoreV1Api")
+    return general_away_check(context, namespace, "Event", name,
                               lambda: api.read_namespaced_event_with_http_info(name, namespace=namespace))
 
 
@@ -321,10 +304,9 @@ def wait_for_lease_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "Lease", name, "in namespace", namespace)
-    api = client.CoordinationV1beta1Api()
-    return general_away_check(namespace, "Lease", name,
+    api = get_api(context, "Lease", "CoordinationV1Api")
+    return general_away_check(context, namespace, "Lease", name,
                               lambda: api.read_namespaced_lease_with_http_info(name, namespace=namespace))
 
 
@@ -335,10 +317,9 @@ def wait_for_horizontal_pod_autoscaler_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "HorizontalPodAutoscaler", name, "in namespace", namespace)
-    api = client.AutoscalingV1Api()
-    return general_away_check(namespace, "HorizontalPodAutoscaler", name,
+    api = get_api(context, "HorizontalPodAutoscaler", "AutoscalingV1Api")
+    return general_away_check(context, namespace, "HorizontalPodAutoscaler", name,
                               lambda: api.read_namespaced_horizontal_pod_autoscaler_with_http_info(name, namespace=namespace))
 
 
@@ -349,10 +330,9 @@ def wait_for_controller_revision_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "ControllerRevision", name, "in namespace", namespace)
-    api = client.AppsV1Api()
-    return general_away_check(namespace, "ControllerRevision", name,
+    api = get_api(context, "ControllerRevision", "AppsV1Api")
+    return general_away_check(context, namespace, "ControllerRevision", name,
                               lambda: api.read_namespaced_controller_revision_with_http_info(name, namespace=namespace))
 
 
@@ -363,10 +343,9 @@ def wait_for_limit_range_is_away(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check removal of", "LimitRange", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_away_check(namespace, "LimitRange", name,
+    api = get_api(context, "LimitRange", "CoreV1Api")
+    return general_away_check(context, namespace, "LimitRange", name,
                               lambda: api.read_namespaced_limit_range_with_http_info(name, namespace=namespace))
 
 
@@ -375,10 +354,9 @@ def wait_for_cluster_role_is_away(context, name):
         raise SystemExit("invalid empty name for ClusterRole given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "ClusterRole", name)
-    api = client.RbacAuthorizationV1Api()
-    return general_away_check(None, "ClusterRole", name,
+    api = get_api(context, "ClusterRole", "RbacAuthorizationV1Api")
+    return general_away_check(context, None, "ClusterRole", name,
                               lambda: api.read_cluster_role_with_http_info(name))
 
 
@@ -387,34 +365,20 @@ def wait_for_cluster_role_binding_is_away(context, name):
         raise SystemExit("invalid empty name for ClusterRoleBinding given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "ClusterRoleBinding", name)
-    api = client.RbacAuthorizationV1Api()
-    return general_away_check(None, "ClusterRoleBinding", name,
+    api = get_api(context, "ClusterRoleBinding", "RbacAuthorizationV1Api")
+    return general_away_check(context, None, "ClusterRoleBinding", name,
                               lambda: api.read_cluster_role_binding_with_http_info(name))
 
 
-def wait_for_pod_security_policy_is_away(context, name):
-    if name is None:
-        raise SystemExit("invalid empty name for PodSecurityPolicy given")
-    if context is None:
-        raise SystemExit("invalid empty name context given")
-    load_kube(context)
-    print("check removal of", "PodSecurityPolicy", name)
-    api = client.PolicyV1beta1Api()
-    return general_away_check(None, "PodSecurityPolicy", name,
-                              lambda: api.read_pod_security_policy_with_http_info(name))
-
-
 def wait_for_persistent_volume_is_away(context, name):
     if name is None:
         raise SystemExit("invalid empty name for PersistentVolume given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "PersistentVolume", name)
-    api = client.CoreV1Api()
-    return general_away_check(None, "PersistentVolume", name,
+    api = get_api(context, "PersistentVolume", "CoreV1Api")
+    return general_away_check(context, None, "PersistentVolume", name,
                               lambda: api.read_persistent_volume_with_http_info(name))
 
 
@@ -423,10 +387,9 @@ def wait_for_volume_attachment_is_away(context, name):
         raise SystemExit("invalid empty name for VolumeAttachment given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "VolumeAttachment", name)
-    api = client.StorageV1Api()
-    return general_away_check(None, "VolumeAttachment", name,
+    api = get_api(context, "VolumeAttachment", "StorageV1Api")
+    return general_away_check(context, None, "VolumeAttachment", name,
                               lambda: api.read_volume_attachment_with_http_info(name))
 
 
@@ -435,10 +398,9 @@ def wait_for_storage_class_is_away(context, name):
         raise SystemExit("invalid empty name for StorageClass given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "StorageClass", name)
-    api = client.StorageV1Api()
-    return general_away_check(None, "StorageClass", name,
+    api = get_api(context, "StorageClass", "StorageV1Api")
+    return general_away_check(context, None, "StorageClass", name,
                               lambda: api.read_storage_class_with_http_info(name))
 
 
@@ -447,10 +409,9 @@ def wait_for_priority_class_is_away(context, name):
         raise SystemExit("invalid empty name for PriorityClass given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "PriorityClass", name)
-    api = client.SchedulingV1beta1Api()
-    return general_away_check(None, "PriorityClass", name,
+    api = get_api(context, "PriorityClass", "SchedulingV1Api")
+    return general_away_check(context, None, "PriorityClass", name,
                               lambda: api.read_priority_class_with_http_info(name))
 
 
@@ -459,10 +420,9 @@ def wait_for_node_is_away(context, name):
         raise SystemExit("invalid empty name for Node given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "Node", name)
-    api = client.CoreV1Api()
-    return general_away_check(None, "Node", name,
+    api = get_api(context, "Node", "CoreV1Api")
+    return general_away_check(context, None, "Node", name,
                               lambda: api.read_node_with_http_info(name))
 
 
@@ -471,10 +431,9 @@ def wait_for_custom_resource_definition_is_away(context, name):
         raise SystemExit("invalid empty name for CustomResourceDefinition given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "CustomResourceDefinition", name)
-    api = client.ApiextensionsV1beta1Api()
-    return general_away_check(None, "CustomResourceDefinition", name,
+    api = get_api(context, "CustomResourceDefinition", "ApiextensionsV1Api")
+    return general_away_check(context, None, "CustomResourceDefinition", name,
                               lambda: api.read_custom_resource_definition_with_http_info(name))
 
 
@@ -483,10 +442,9 @@ def wait_for_certificate_signing_request_is_away(context, name):
         raise SystemExit("invalid empty name for CertificateSigningRequest given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check removal of", "CertificateSigningRequest", name)
-    api = client.CertificatesV1beta1Api()
-    return general_away_check(None, "CertificateSigningRequest", name,
+    api = get_api(context, "CertificateSigningRequest", "CertificatesV1Api")
+    return general_away_check(context, None, "CertificateSigningRequest", name,
                               lambda: api.read_certificate_signing_request_with_http_info(name))
 
 
@@ -498,10 +456,9 @@ def wait_for_namespace_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Namespace", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Namespace", name,
+    api = get_api(context, "Namespace", "CoreV1Api")
+    return general_up_check(context, namespace, "Namespace", name,
                             lambda: api.read_namespace_with_http_info(namespace))
 
 
@@ -512,10 +469,9 @@ def wait_for_deployment_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Deployment", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_up_check(namespace, "Deployment", name,
+    api = get_api(context, "Deployment", "AppsV1Api")
+    return general_up_check(context, namespace, "Deployment", name,
                             lambda: api.read_namespaced_deployment_status_with_http_info(name, namespace=namespace))
 
 
@@ -526,10 +482,9 @@ def wait_for_pod_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Pod", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Pod", name,
+    api = get_api(context, "Pod", "CoreV1Api")
+    return general_up_check(context, namespace, "Pod", name,
                             lambda: api.read_namespaced_pod_status_with_http_info(name, namespace=namespace))
 
 
@@ -540,10 +495,9 @@ def wait_for_service_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Service", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Service", name,
+    api = get_api(context, "Service", "CoreV1Api")
+    return general_up_check(context, namespace, "Service", name,
                             lambda: api.read_namespaced_service_status_with_http_info(name, namespace=namespace))
 
 
@@ -554,10 +508,9 @@ def wait_for_replication_controller_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "ReplicationController", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "ReplicationController", name,
+    api = get_api(context, "ReplicationController", "CoreV1Api")
+    return general_up_check(context, namespace, "ReplicationController", name,
                             lambda: api.read_namespaced_replication_controller_status_with_http_info(name, namespace=namespace))
 
 
@@ -568,10 +521,9 @@ def wait_for_persistent_volume_claim_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "PersistentVolumeClaim", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "PersistentVolumeClaim", name,
+    api = get_api(context, "PersistentVolumeClaim", "CoreV1Api")
+    return general_up_check(context, namespace, "PersistentVolumeClaim", name,
                             lambda: api.read_namespaced_persistent_volume_claim_with_http_info(name, namespace=namespace))
 
 
@@ -582,10 +534,9 @@ def wait_for_ingress_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Ingress", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_up_check(namespace, "Ingress", name,
+    api = get_api(context, "Ingress", "NetworkingV1Api")
+    return general_up_check(context, namespace, "Ingress", name,
                             lambda: api.read_namespaced_ingress_status_with_http_info(name, namespace=namespace))
 
 
@@ -596,10 +547,9 @@ def wait_for_network_policy_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "NetworkPolicy", name, "in namespace", namespace)
-    api = client.ExtensionsV1beta1Api()
-    return general_up_check(namespace, "NetworkPolicy", name,
+    api = get_api(context, "NetworkPolicy", "NetworkingV1Api")
+    return general_up_check(context, namespace, "NetworkPolicy", name,
                             lambda: api.read_namespaced_network_policy_with_http_info(name, namespace=namespace))
 
 
@@ -610,10 +560,9 @@ def wait_for_job_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Job", name, "in namespace", namespace)
-    api = client.BatchV1Api()
-    return general_up_check(namespace, "Job", name,
+    api = get_api(context, "Job", "BatchV1Api")
+    return general_up_check(context, namespace, "Job", name,
                             lambda: api.read_namespaced_job_status_with_http_info(name, namespace=namespace))
 
 
@@ -624,10 +573,9 @@ def wait_for_cron_job_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "CronJob", name, "in namespace", namespace)
-    api = client.BatchV1beta1Api()
-    return general_up_check(namespace, "CronJob", name,
+    api = get_api(context, "CronJob", "BatchV1Api")
+    return general_up_check(context, namespace, "CronJob", name,
                             lambda: api.read_namespaced_cron_job_status_with_http_info(name, namespace=namespace))
 
 
@@ -638,10 +586,9 @@ def wait_for_config_map_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "ConfigMap", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "ConfigMap", name,
+    api = get_api(context, "ConfigMap", "CoreV1Api")
+    return general_up_check(context, namespace, "ConfigMap", name,
                             lambda: api.read_namespaced_config_map_with_http_info(name, namespace=namespace))
 
 
@@ -652,10 +599,9 @@ def wait_for_secret_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Secret", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Secret", name,
+    api = get_api(context, "Secret", "CoreV1Api")
+    return general_up_check(context, namespace, "Secret", name,
                             lambda: api.read_namespaced_secret_with_http_info(name, namespace=namespace))
 
 
@@ -666,10 +612,9 @@ def wait_for_service_account_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "ServiceAccount", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "ServiceAccount", name,
+    api = get_api(context, "ServiceAccount", "CoreV1Api")
+    return general_up_check(context, namespace, "ServiceAccount", name,
                             lambda: api.read_namespaced_service_account_with_http_info(name, namespace=namespace))
 
 
@@ -680,10 +625,9 @@ def wait_for_resource_quota_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "ResourceQuota", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "ResourceQuota", name,
+    api = get_api(context, "ResourceQuota", "CoreV1Api")
+    return general_up_check(context, namespace, "ResourceQuota", name,
                             lambda: api.read_namespaced_resource_quota_with_http_info(name, namespace=namespace))
 
 
@@ -694,10 +638,9 @@ def wait_for_endpoints_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Endpoints", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Endpoints", name,
+    api = get_api(context, "Endpoints", "CoreV1Api")
+    return general_up_check(context, namespace, "Endpoints", name,
                             lambda: api.read_namespaced_endpoints_with_http_info(name, namespace=namespace))
 
 
@@ -708,10 +651,9 @@ def wait_for_pod_template_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "PodTemplate", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "PodTemplate", name,
+    api = get_api(context, "PodTemplate", "CoreV1Api")
+    return general_up_check(context, namespace, "PodTemplate", name,
                             lambda: api.read_namespaced_pod_template_with_http_info(name, namespace=namespace))
 
 
@@ -722,10 +664,9 @@ def wait_for_role_binding_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "RoleBinding", name, "in namespace", namespace)
-    api = client.RbacAuthorizationV1Api()
-    return general_up_check(namespace, "RoleBinding", name,
+    api = get_api(context, "RoleBinding", "RbacAuthorizationV1Api")
+    return general_up_check(context, namespace, "RoleBinding", name,
                             lambda: api.read_namespaced_role_binding_with_http_info(name, namespace=namespace))
 
 
@@ -736,10 +677,9 @@ def wait_for_role_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Role", name, "in namespace", namespace)
-    api = client.RbacAuthorizationV1Api()
-    return general_up_check(namespace, "Role", name,
+    api = get_api(context, "Role", "RbacAuthorizationV1Api")
+    return general_up_check(context, namespace, "Role", name,
                             lambda: api.read_namespaced_role_with_http_info(name, namespace=namespace))
 
 
@@ -750,10 +690,9 @@ def wait_for_pod_disruption_budget_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "PodDisruptionBudget", name, "in namespace", namespace)
-    api = client.PolicyV1beta1Api()
-    return general_up_check(namespace, "PodDisruptionBudget", name,
+    api = get_api(context, "PodDisruptionBudget", "PolicyV1Api")
+    return general_up_check(context, namespace, "PodDisruptionBudget", name,
                             lambda: api.read_namespaced_pod_disruption_budget_with_http_info(name, namespace=namespace))
 
 
@@ -764,10 +703,9 @@ def wait_for_event_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Event", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "Event", name,
+    api = get_api(context, "Event", "CoreV1Api")
+    return general_up_check(context, namespace, "Event", name,
                             lambda: api.read_namespaced_event_with_http_info(name, namespace=namespace))
 
 
@@ -778,10 +716,9 @@ def wait_for_lease_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "Lease", name, "in namespace", namespace)
-    api = client.CoordinationV1beta1Api()
-    return general_up_check(namespace, "Lease", name,
+    api = get_api(context, "Lease", "CoordinationV1Api")
+    return general_up_check(context, namespace, "Lease", name,
                             lambda: api.read_namespaced_lease_with_http_info(name, namespace=namespace))
 
 
@@ -792,10 +729,9 @@ def wait_for_horizontal_pod_autoscaler_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "HorizontalPodAutoscaler", name, "in namespace", namespace)
-    api = client.AutoscalingV1Api()
-    return general_up_check(namespace, "HorizontalPodAutoscaler", name,
+    api = get_api(context, "HorizontalPodAutoscaler", "AutoscalingV1Api")
+    return general_up_check(context, namespace, "HorizontalPodAutoscaler", name,
                             lambda: api.read_namespaced_horizontal_pod_autoscaler_with_http_info(name, namespace=namespace))
 
 
@@ -806,10 +742,9 @@ def wait_for_controller_revision_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "ControllerRevision", name, "in namespace", namespace)
-    api = client.AppsV1Api()
-    return general_up_check(namespace, "ControllerRevision", name,
+    api = get_api(context, "ControllerRevision", "AppsV1Api")
+    return general_up_check(context, namespace, "ControllerRevision", name,
                             lambda: api.read_namespaced_controller_revision_with_http_info(name, namespace=namespace))
 
 
@@ -820,10 +755,9 @@ def wait_for_limit_range_is_up(context, namespace, name):
         raise SystemExit("invalid empty name context given")
     if namespace is None:
         raise SystemExit("invalid empty name namespace given")
-    load_kube(context)
     print("check availability of", "LimitRange", name, "in namespace", namespace)
-    api = client.CoreV1Api()
-    return general_up_check(namespace, "LimitRange", name,
+    api = get_api(context, "LimitRange", "CoreV1Api")
+    return general_up_check(context, namespace, "LimitRange", name,
                             lambda: api.read_namespaced_limit_range_with_http_info(name, namespace=namespace))
 
 
@@ -832,10 +766,9 @@ def wait_for_cluster_role_is_up(context, name):
         raise SystemExit("invalid empty name for ClusterRole given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "ClusterRole", name)
-    api = client.RbacAuthorizationV1Api()
-    return general_up_check(None, "ClusterRole", name,
+    api = get_api(context, "ClusterRole", "RbacAuthorizationV1Api")
+    return general_up_check(context, None, "ClusterRole", name,
                             lambda: api.read_cluster_role_with_http_info(name))
 
 
@@ -844,34 +777,20 @@ def wait_for_cluster_role_binding_is_up(context, name):
         raise SystemExit("invalid empty name for ClusterRoleBinding given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "ClusterRoleBinding", name)
-    api = client.RbacAuthorizationV1Api()
-    return general_up_check(None, "ClusterRoleBinding", name,
+    api = get_api(context, "ClusterRoleBinding", "RbacAuthorizationV1Api")
+    return general_up_check(context, None, "ClusterRoleBinding", name,
                             lambda: api.read_cluster_role_binding_with_http_info(name))
 
 
-def wait_for_pod_security_policy_is_up(context, name):
-    if name is None:
-        raise SystemExit("invalid empty name for PodSecurityPolicy given")
-    if context is None:
-        raise SystemExit("invalid empty name context given")
-    load_kube(context)
-    print("check availability of", "PodSecurityPolicy", name)
-    api = client.PolicyV1beta1Api()
-    return general_up_check(None, "PodSecurityPolicy", name,
-                            lambda: api.read_pod_security_policy_with_http_info(name))
-
-
 def wait_for_persistent_volume_is_up(context, name):
     if name is None:
         raise SystemExit("invalid empty name for PersistentVolume given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "PersistentVolume", name)
-    api = client.CoreV1Api()
-    return general_up_check(None, "PersistentVolume", name,
+    api = get_api(context, "PersistentVolume", "CoreV1Api")
+    return general_up_check(context, None, "PersistentVolume", name,
                             lambda: api.read_persistent_volume_with_http_info(name))
 
 
@@ -880,10 +799,9 @@ def wait_for_volume_attachment_is_up(context, name):
         raise SystemExit("invalid empty name for VolumeAttachment given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "VolumeAttachment", name)
-    api = client.StorageV1Api()
-    return general_up_check(None, "VolumeAttachment", name,
+    api = get_api(context, "VolumeAttachment", "StorageV1Api")
+    return general_up_check(context, None, "VolumeAttachment", name,
                             lambda: api.read_volume_attachment_with_http_info(name))
 
 
@@ -892,10 +810,9 @@ def wait_for_storage_class_is_up(context, name):
         raise SystemExit("invalid empty name for StorageClass given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "StorageClass", name)
-    api = client.StorageV1Api()
-    return general_up_check(None, "StorageClass", name,
+    api = get_api(context, "StorageClass", "StorageV1Api")
+    return general_up_check(context, None, "StorageClass", name,
                             lambda: api.read_storage_class_with_http_info(name))
 
 
@@ -904,10 +821,9 @@ def wait_for_priority_class_is_up(context, name):
         raise SystemExit("invalid empty name for PriorityClass given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "PriorityClass", name)
-    api = client.SchedulingV1beta1Api()
-    return general_up_check(None, "PriorityClass", name,
+    api = get_api(context, "PriorityClass", "SchedulingV1Api")
+    return general_up_check(context, None, "PriorityClass", name,
                             lambda: api.read_priority_class_with_http_info(name))
 
 
@@ -916,10 +832,9 @@ def wait_for_node_is_up(context, name):
         raise SystemExit("invalid empty name for Node given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "Node", name)
-    api = client.CoreV1Api()
-    return general_up_check(None, "Node", name,
+    api = get_api(context, "Node", "CoreV1Api")
+    return general_up_check(context, None, "Node", name,
                             lambda: api.read_node_with_http_info(name))
 
 
@@ -928,10 +843,9 @@ def wait_for_custom_resource_definition_is_up(context, name):
         raise SystemExit("invalid empty name for CustomResourceDefinition given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "CustomResourceDefinition", name)
-    api = client.ApiextensionsV1beta1Api()
-    return general_up_check(None, "CustomResourceDefinition", name,
+    api = get_api(context, "CustomResourceDefinition", "ApiextensionsV1Api")
+    return general_up_check(context, None, "CustomResourceDefinition", name,
                             lambda: api.read_custom_resource_definition_with_http_info(name))
 
 
@@ -940,16 +854,14 @@ def wait_for_certificate_signing_request_is_up(context, name):
         raise SystemExit("invalid empty name for CertificateSigningRequest given")
     if context is None:
         raise SystemExit("invalid empty name context given")
-    load_kube(context)
     print("check availability of", "CertificateSigningRequest", name)
-    api = client.CertificatesV1beta1Api()
-    return general_up_check(None, "CertificateSigningRequest", name,
+    api = get_api(context, "CertificateSigningRequest", "CertificatesV1Api")
+    return general_up_check(context, None, "CertificateSigningRequest", name,
                             lambda: api.read_certificate_signing_request_with_http_info(name))
 
 def wait_for_set_is_away(context, namespace, set_type, set_name):
-    load_kube(context)
     print("check removal of set", set_name, "of type", set_type, "in namespace", namespace)
-    api = client.AppsV1Api()
+    api = client.AppsV1Api(get_api_client(context))
     def handle_sets():
         if set_type == SetType.replica_set:
             return api.read_namespaced_replica_set_with_http_info(set_name, namespace=namespace)
@@ -960,20 +872,31 @@ def wait_for_set_is_away(context, namespace, set_type, set_name):
         else:
             raise SystemExit("Invalid type", set_type)
 
-    return general_away_check(namespace, set_type, set_name, handle_sets)
+    return general_away_check(context, namespace, set_type, set_name, handle_sets)
 
 # internal methods (used by methods above)
 
 
-def general_away_check(namespace, object_name, name, api_query_lambda):
-    return general_status_check(namespace, object_name, name, api_query_lambda, 404)
+def general_away_check(context, namespace, object_name, name, api_query_lambda):
+    return general_status_check(context, namespace, object_name, name, api_query_lambda, 404)
+
 
+def general_up_check(context, namespace, object_name, name, api_query_lambda):
+    return general_status_check(context, namespace, object_name, name, api_query_lambda, 200)
 
-def general_up_check(namespace, object_name, name, api_query_lambda):
-    return general_status_check(namespace, object_name, name, api_query_lambda, 200)
 
+def general_status_check(context, namespace, object_name, name, api_query_lambda, expected_status):
+    # only the existence of the object matters
+    informer = get_informer(context, object_name, namespace, metadata_only=True)
+    if informer is not None:
+        # the watch of the informer reports the change, nothing is polled
+        if informer.wait_for(namespace, name, expected_status == 200, wait_timeout_seconds):
+            print("Status", expected_status, "received.", object_name, name)
+            return True
+        print(object_name, "status", expected_status,
+              "could not be checked after a timeout of", wait_timeout_seconds, "seconds")
+        return False
 
-def general_status_check(namespace, object_name, name, api_query_lambda, expected_status):
     status = 0
     attempts = 0
     start_date = time.mktime(datetime.datetime.utcnow().timetuple())
@@ -981,13 +904,16 @@ def general_status_check(namespace, object_name, name, api_query_lambda, expecte
         try:
             attempts += 1
             ret, status, _ = api_query_lambda()
-        except ApiException:
-            if namespace is not None:
+        except ApiException as e:
+            status = e.status
+            if status != 404:
+                # throttling and server errors are already retried by the client, nothing is removed here
+                print("Unexpected status", status, "while checking", object_name, name, ":", e.reason)
+            elif expected_status == 404 and namespace is not None:
                 print("Status", expected_status,
                       "received.", object_name, name, "in namespace", namespace, "is removed")
-            else:
+            elif expected_status == 404:
                 print("Status", expected_status, "received.", object_name, name)
-            status = 404
         time.sleep(0.75)
         if time.mktime(datetime.datetime.utcnow().timetuple()) - start_date > wait_timeout_seconds:
             print(object_name, "status", expected_status,
@@ -1001,4 +927,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -27,22 +27,8 @@ from abc import abstractmethod, ABC
 from enum import Enum
 from typing import Iterable
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape, meta
-from kubernetes import client, config
-from kubernetes.client.rest import ApiException
-
 from lib.input import get_current_input_adapter
-
-current_context = None
-
-
-def load_kube(context):
-    global current_context
-    if current_context is not context:
-        print("Loading context: ", context)
-    config.load_kube_config(context=context)
-    current_context = context
-
+from lib.pool import get_api_client
 
 def choose_context_and_namespace(given_context=None, given_namespace=None) -> (str, str):
     context = choose_context(given_context)
@@ -73,10 +59,6 @@ def choose_context(given_context=None) -> str:
 
     if context is None:
         raise SystemExit("No context found! Probably invalid configuration...")
-
-    # TODO basic (network) connection check before this step happens
-    # load context
-    load_kube(context)
     return context
 
 
@@ -90,6 +72,7 @@ class SetType(Enum):
 
 
 def detect_set_type(namespaced_set) -> SetType:
+    from kubernetes import client
     if isinstance(namespaced_set, client.models.v1_replica_set.V1ReplicaSet):
         return SetType.replica_set
     if isinstance(namespaced_set, client.models.v1_stateful_set.V1StatefulSet):
@@ -100,11 +83,12 @@ def detect_set_type(namespaced_set) -> SetType:
 
 
 def get_sets(context, namespace) -> list:
+    from kubernetes import client
+    from kubernetes.client.rest import ApiException
     if namespace is None:
         raise BaseException("null namespace")
 
-    load_kube(context)
-    api = client.AppsV1Api()
+    api = client.AppsV1Api(get_api_client(context))
     set_list = list()
     # replica
     try:
@@ -150,7 +134,6 @@ class ArgumentConfig:
     replication_controllers = False
     endpoints = False
     pod_template = False
-    pod_security_policy = False
     persistent_volume = False
     persistent_volume_claim = False
     ingress = False
@@ -177,6 +160,13 @@ class ArgumentConfig:
     node = False
     custom_resource_definition = False
     certificate_signing_request = False
+    wire_format = False
+    no_gzip = False
+    contexts = False
+    page_size = False
+    selector = False
+    field_selector = False
+    output = False
 
 
 class CustomParameter:
@@ -241,84 +231,110 @@ class AbstractCommand(ABC):
                 str += i.name + ": " + arg_key + "\n"
         print(str)
 
-    # the following method does the "magic" of adding the defined arguments to a cmd
-    # TODO consistent definition + docs of shortcuts
     def build_args(self, argument_config: ArgumentConfig, parser):
-        group = parser.add_argument_group("optional")
-
-        if argument_config.context:
-            group.add_argument("--context", "-c", type=str, help="a name of the cluster to work on")
-        if argument_config.namespace:
-            group.add_argument("--namespace", "-n", type=str, help="a namespace name")
-        if argument_config.pod:
-            group.add_argument("--pod", "-p", type=str, help="a name of a pod")
-        if argument_config.deployment:
-            group.add_argument("--deployment", "-d", help="a name of a deployment", type=str)
-        if argument_config.service:
-            group.add_argument("--service", "-s", help="a name of a Service", type=str)
-        if argument_config.replication_controllers:
-            group.add_argument("--replication-controller", "-rc", help="a name of a ReplicationController", type=str)
-        if argument_config.set_type:
-            group.add_argument("--set-type", "-st", type=SetType, help="a SetType", choices=list(SetType))
-        if argument_config.set_name:
-            group.add_argument("--set-name", "-sn", help="a name of a Set", type=str)
-        if argument_config.no_wait:
-            group.add_argument("--no-wait", "-nw", type=bool, help="true, false")
-        if argument_config.persistent_volume_claim:
-            group.add_argument("--persistent-volume-claim", "-pvc", help="a name of a PersistentVolumeClaim", type=str)
-        if argument_config.persistent_volume:
-            group.add_argument("--persistent-volume", help="a name of a PersistentVolume", type=str)
-        if argument_config.ingress:
-            group.add_argument("--ingress", help="a name of a Ingress", type=str)
-        if argument_config.network_policy:
-            group.add_argument("--network-policy", help="a name of a NetworkPolicy", type=str)
-        if argument_config.job:
-            group.add_argument("--job", help="a name of a Job", type=str)
-        if argument_config.config_map:
-            group.add_argument("--config-map", help="a name of a ConfigMap", type=str)
-        if argument_config.secret:
-            group.add_argument("--secret", help="a name of a Secret", type=str)
-        if argument_config.service_account:
-            group.add_argument("--service-account", help="a name of a ServiceAccount", type=str)
-        if argument_config.resource_quota:
-            group.add_argument("--resource-quota", help="a name of a ResourceQuota", type=str)
-        if argument_config.endpoints:
-            group.add_argument("--endpoints", help="a name of an Endpoint", type=str)
-        if argument_config.pod_template:
-            group.add_argument("--pod-template", help="a name of a PodTemplate", type=str)
-        if argument_config.pod_security_policy:
-            group.add_argument("--pod-security-policy", help="a name of a PodSecurityPolicy", type=str)
-        if argument_config.role_binding:
-            group.add_argument("--role-binding", help="a name of a RoleBinding", type=str)
-        if argument_config.role_binding:
-            group.add_argument("--role", help="a name of a Role", type=str)
-        if argument_config.pod_disruption_budget:
-            group.add_argument("--pod-disruption-budget", help="a name of a PodDisruptionBudget", type=str)
-        if argument_config.event:
-            group.add_argument("--event", help="a name of an Event", type=str)
-        if argument_config.lease:
-            group.add_argument("--lease", help="a name of a Lease", type=str)
-        if argument_config.horizontal_pod_autoscaler:
-            group.add_argument("--horizontal-pod-autoscaler", help="a name of a HorizontalPodAutoscaler", type=str)
-        if argument_config.controller_revision:
-            group.add_argument("--controller-revision", help="a name of a ControllerRevision", type=str)
-        if argument_config.limit_range:
-            group.add_argument("--limit-range", help="a name of a LimitRange", type=str)
-        if argument_config.cluster_role:
-            group.add_argument("--cluster-role", help="a name of a ClusterRole", type=str)
-        if argument_config.cluster_role_binding:
-            group.add_argument("--cluster-role-binding", help="a name of a ClusterRoleBinding", type=str)
-        if argument_config.volume_attachment:
-            group.add_argument("--volume-attachment", help="a name of a VolumeAttachment", type=str)
-        if argument_config.storage_class:
-            group.add_argument("--storage-class", help="a name of a StorageClass", type=str)
-        if argument_config.priority_class:
-            group.add_argument("--priority-class", help="a name of a PriorityClass", type=str)
-        if argument_config.node:
-            group.add_argument("--node", help="a name of a Node", type=str)
-        if argument_config.certificate_signing_request:
-            group.add_argument("--certificate-signing-request", "-csr", help="a name of a CertificateSigningRequest",
-                               type=str)
+        build_arguments(argument_config, parser)
+
+
+# the following method does the "magic" of adding the defined arguments to a cmd
+# TODO consistent definition + docs of shortcuts
+def build_arguments(argument_config: ArgumentConfig, parser):
+    group = parser.add_argument_group("optional")
+
+    if argument_config.context:
+        group.add_argument("--context", "-c", type=str, help="a name of the cluster to work on")
+    if argument_config.namespace:
+        group.add_argument("--namespace", "-n", type=str, help="a namespace name")
+    if argument_config.pod:
+        group.add_argument("--pod", "-p", type=str, help="a name of a pod")
+    if argument_config.deployment:
+        group.add_argument("--deployment", "-d", help="a name of a deployment", type=str)
+    if argument_config.service:
+        group.add_argument("--service", "-s", help="a name of a Service", type=str)
+    if argument_config.replication_controllers:
+        group.add_argument("--replication-controller", "-rc", help="a name of a ReplicationController", type=str)
+    if argument_config.set_type:
+        group.add_argument("--set-type", "-st", type=SetType, help="a SetType", choices=list(SetType))
+    if argument_config.set_name:
+        group.add_argument("--set-name", "-sn", help="a name of a Set", type=str)
+    if argument_config.no_wait:
+        group.add_argument("--no-wait", "-nw", type=bool, help="true, false")
+    if argument_config.persistent_volume_claim:
+        group.add_argument("--persistent-volume-claim", "-pvc", help="a name of a PersistentVolumeClaim", type=str)
+    if argument_config.persistent_volume:
+        group.add_argument("--persistent-volume", help="a name of a PersistentVolume", type=str)
+    if argument_config.ingress:
+        group.add_argument("--ingress", help="a name of a Ingress", type=str)
+    if argument_config.network_policy:
+        group.add_argument("--network-policy", help="a name of a NetworkPolicy", type=str)
+    if argument_config.job:
+        group.add_argument("--job", help="a name of a Job", type=str)
+    if argument_config.config_map:
+        group.add_argument("--config-map", help="a name of a ConfigMap", type=str)
+    if argument_config.secret:
+        group.add_argument("--secret", help="a name of a Secret", type=str)
+    if argument_config.service_account:
+        group.add_argument("--service-account", help="a name of a ServiceAccount", type=str)
+    if argument_config.resource_quota:
+        group.add_argument("--resource-quota", help="a name of a ResourceQuota", type=str)
+    if argument_config.endpoints:
+        group.add_argument("--endpoints", help="a name of an Endpoint", type=str)
+    if argument_config.pod_template:
+        group.add_argument("--pod-template", help="a name of a PodTemplate", type=str)
+    if argument_config.role_binding:
+        group.add_argument("--role-binding", help="a name of a RoleBinding", type=str)
+    if argument_config.role_binding:
+        group.add_argument("--role", help="a name of a Role", type=str)
+    if argument_config.pod_disruption_budget:
+        group.add_argument("--pod-disruption-budget", help="a name of a PodDisruptionBudget", type=str)
+    if argument_config.event:
+        group.add_argument("--event", help="a name of an Event", type=str)
+    if argument_config.lease:
+        group.add_argument("--lease", help="a name of a Lease", type=str)
+    if argument_config.horizontal_pod_autoscaler:
+        group.add_argument("--horizontal-pod-autoscaler", help="a name of a HorizontalPodAutoscaler", type=str)
+    if argument_config.controller_revision:
+        group.add_argument("--controller-revision", help="a name of a ControllerRevision", type=str)
+    if argument_config.limit_range:
+        group.add_argument("--limit-range", help="a name of a LimitRange", type=str)
+    if argument_config.cluster_role:
+        group.add_argument("--cluster-role", help="a name of a ClusterRole", type=str)
+    if argument_config.cluster_role_binding:
+        group.add_argument("--cluster-role-binding", help="a name of a ClusterRoleBinding", type=str)
+    if argument_config.volume_attachment:
+        group.add_argument("--volume-attachment", help="a name of a VolumeAttachment", type=str)
+    if argument_config.storage_class:
+        group.add_argument("--storage-class", help="a name of a StorageClass", type=str)
+    if argument_config.priority_class:
+        group.add_argument("--priority-class", help="a name of a PriorityClass", type=str)
+    if argument_config.node:
+        group.add_argument("--node", help="a name of a Node", type=str)
+    if argument_config.certificate_signing_request:
+        group.add_argument("--certificate-signing-request", "-csr", help="a name of a CertificateSigningRequest",
+                           type=str)
+    if argument_config.wire_format:
+        group.add_argument("--wire-format", choices=["json", "protobuf"], default="json",
+                           help="format of the API responses, protobuf is smaller and faster for large lists")
+    if argument_config.no_gzip:
+        group.add_argument("--no-gzip", action="store_true", help="do not ask for compressed API responses")
+    if argument_config.contexts:
+        group.add_argument("--contexts", type=str, help="comma separated names of clusters, all are queried at once")
+        group.add_argument("--all-contexts", action="store_true", help="query all clusters of the kubeconfig at once")
+    if argument_config.page_size:
+        from lib.fields import DEFAULT_PAGE_SIZE
+        group.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                           help="number of objects per request, 0 requests all at once")
+    if argument_config.selector:
+        group.add_argument("--selector", "-l", type=str,
+                           help="label selector, filtered by the API server (e.g. app=web,tier!=cache)")
+    if argument_config.field_selector:
+        group.add_argument("--field-selector", type=str,
+                           help="field selector, filtered by the API server (e.g. status.phase!=Running)")
+    if argument_config.output:
+        from lib.output import OUTPUT_FORMATS, TEXT
+        group.add_argument("--output", "-o", choices=OUTPUT_FORMATS, default=TEXT,
+                           help="table prints the columns rendered by the API server (as kubectl get), jsonl, csv, "
+                                "tsv and parquet write the rows only, all messages go to stderr")
+        group.add_argument("--output-file", type=str, help="file of the jsonl, csv, tsv or parquet output")
 
 
 class DynamicArgs(object):
@@ -479,6 +495,7 @@ class YamlTemplateRunner:
     """
 
     def __init__(self, path, tpl_file_name, slug, presets=None):
+        from jinja2 import Environment, FileSystemLoader, select_autoescape, meta
         self.path = path
         self.tpl_file_name = tpl_file_name
         self.slug = slug
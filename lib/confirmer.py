@@ -21,11 +21,16 @@
 # specific language governing permissions and limitations
 # under the License.
 #
-import numpy
-from kubernetes import client, config
+from kubernetes import client
 
-from lib.common import load_kube, get_sets
+from lib.common import get_sets
+from lib.discovery import get_api
+from lib.fields import list_fields
+from lib.informer import list_cached
 from lib.input import get_current_input_adapter, PromptToolkitAdapter
+from lib.kubeconfig import list_kube_config_contexts
+from lib.pool import get_api_client
+from lib.probe import probe_contexts
 
 # DO NOT EDIT this file manually, use "python codegen.py" in root folder. Use templates/def_confirm.py.j2
 
@@ -35,11 +40,13 @@ def confirm_pod(context, namespace):
         raise SystemExit("invalid empty context for Pod given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Pod given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Pod", "CoreV1Api")
     return general_confirm("Pod",
-                           lambda: api.list_namespaced_pod(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Pod", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_pod, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_deployment(context, namespace):
@@ -47,11 +54,13 @@ def confirm_deployment(context, namespace):
         raise SystemExit("invalid empty context for Deployment given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Deployment given")
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "Deployment", "AppsV1Api")
     return general_confirm("Deployment",
-                           lambda: api.list_namespaced_deployment(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Deployment", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_deployment, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_service(context, namespace):
@@ -59,11 +68,13 @@ def confirm_service(context, namespace):
         raise SystemExit("invalid empty context for Service given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Service given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Service", "CoreV1Api")
     return general_confirm("Service",
-                           lambda: api.list_namespaced_service(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Service", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_service, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_replication_controller(context, namespace):
@@ -71,11 +82,13 @@ def confirm_replication_controller(context, namespace):
         raise SystemExit("invalid empty context for ReplicationController given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for ReplicationController given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ReplicationController", "CoreV1Api")
     return general_confirm("ReplicationController",
-                           lambda: api.list_namespaced_replication_controller(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ReplicationController", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_replication_controller, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_persistent_volume_claim(context, namespace):
@@ -83,11 +96,13 @@ def confirm_persistent_volume_claim(context, namespace):
         raise SystemExit("invalid empty context for PersistentVolumeClaim given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for PersistentVolumeClaim given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PersistentVolumeClaim", "CoreV1Api")
     return general_confirm("PersistentVolumeClaim",
-                           lambda: api.list_namespaced_persistent_volume_claim(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "PersistentVolumeClaim", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_persistent_volume_claim, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_ingress(context, namespace):
@@ -95,11 +110,13 @@ def confirm_ingress(context, namespace):
         raise SystemExit("invalid empty context for Ingress given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Ingress given")
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "Ingress", "NetworkingV1Api")
     return general_confirm("Ingress",
-                           lambda: api.list_namespaced_ingress(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Ingress", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_ingress, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_network_policy(context, namespace):
@@ -107,11 +124,13 @@ def confirm_network_policy(context, namespace):
         raise SystemExit("invalid empty context for NetworkPolicy given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for NetworkPolicy given")
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "NetworkPolicy", "NetworkingV1Api")
     return general_confirm("NetworkPolicy",
-                           lambda: api.list_namespaced_network_policy(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "NetworkPolicy", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_network_policy, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_job(context, namespace):
@@ -119,11 +138,13 @@ def confirm_job(context, namespace):
         raise SystemExit("invalid empty context for Job given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Job given")
-    load_kube(context)
-    api = client.BatchV1Api()
+    api = get_api(context, "Job", "BatchV1Api")
     return general_confirm("Job",
-                           lambda: api.list_namespaced_job(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Job", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_job, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_cron_job(context, namespace):
@@ -131,11 +152,13 @@ def confirm_cron_job(context, namespace):
         raise SystemExit("invalid empty context for CronJob given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for CronJob given")
-    load_kube(context)
-    api = client.BatchV1beta1Api()
+    api = get_api(context, "CronJob", "BatchV1Api")
     return general_confirm("CronJob",
-                           lambda: api.list_namespaced_cron_job(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "CronJob", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_cron_job, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_config_map(context, namespace):
@@ -143,11 +166,13 @@ def confirm_config_map(context, namespace):
         raise SystemExit("invalid empty context for ConfigMap given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for ConfigMap given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ConfigMap", "CoreV1Api")
     return general_confirm("ConfigMap",
-                           lambda: api.list_namespaced_config_map(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ConfigMap", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_config_map, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_secret(context, namespace):
@@ -155,11 +180,13 @@ def confirm_secret(context, namespace):
         raise SystemExit("invalid empty context for Secret given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Secret given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Secret", "CoreV1Api")
     return general_confirm("Secret",
-                           lambda: api.list_namespaced_secret(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Secret", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_secret, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_service_account(context, namespace):
@@ -167,11 +194,13 @@ def confirm_service_account(context, namespace):
         raise SystemExit("invalid empty context for ServiceAccount given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for ServiceAccount given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ServiceAccount", "CoreV1Api")
     return general_confirm("ServiceAccount",
-                           lambda: api.list_namespaced_service_account(namespace=namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ServiceAccount", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_service_account, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_resource_quota(context, namespace):
@@ -179,11 +208,13 @@ def confirm_resource_quota(context, namespace):
         raise SystemExit("invalid empty context for ResourceQuota given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for ResourceQuota given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ResourceQuota", "CoreV1Api")
     return general_confirm("ResourceQuota",
-                           lambda: api.list_namespaced_resource_quota(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ResourceQuota", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_resource_quota, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_endpoints(context, namespace):
@@ -191,11 +222,13 @@ def confirm_endpoints(context, namespace):
         raise SystemExit("invalid empty context for Endpoints given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Endpoints given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Endpoints", "CoreV1Api")
     return general_confirm("Endpoints",
-                           lambda: api.list_namespaced_endpoints(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Endpoints", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_endpoints, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_pod_template(context, namespace):
@@ -203,11 +236,13 @@ def confirm_pod_template(context, namespace):
         raise SystemExit("invalid empty context for PodTemplate given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for PodTemplate given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PodTemplate", "CoreV1Api")
     return general_confirm("PodTemplate",
-                           lambda: api.list_namespaced_pod_template(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "PodTemplate", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_pod_template, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_role_binding(context, namespace):
@@ -215,11 +250,13 @@ def confirm_role_binding(context, namespace):
         raise SystemExit("invalid empty context for RoleBinding given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for RoleBinding given")
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "RoleBinding", "RbacAuthorizationV1Api")
     return general_confirm("RoleBinding",
-                           lambda: api.list_namespaced_role_binding(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "RoleBinding", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_role_binding, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_role(context, namespace):
@@ -227,11 +264,13 @@ def confirm_role(context, namespace):
         raise SystemExit("invalid empty context for Role given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Role given")
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "Role", "RbacAuthorizationV1Api")
     return general_confirm("Role",
-                           lambda: api.list_namespaced_role(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Role", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_role, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_pod_disruption_budget(context, namespace):
@@ -239,11 +278,13 @@ def confirm_pod_disruption_budget(context, namespace):
         raise SystemExit("invalid empty context for PodDisruptionBudget given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for PodDisruptionBudget given")
-    load_kube(context)
-    api = client.PolicyV1beta1Api()
+    api = get_api(context, "PodDisruptionBudget", "PolicyV1Api")
     return general_confirm("PodDisruptionBudget",
-                           lambda: api.list_namespaced_pod_disruption_budget(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "PodDisruptionBudget", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_pod_disruption_budget, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_event(context, namespace):
@@ -251,11 +292,13 @@ def confirm_event(context, namespace):
         raise SystemExit("invalid empty context for Event given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Event given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Event", "CoreV1Api")
     return general_confirm("Event",
-                           lambda: api.list_namespaced_event(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Event", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_event, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_lease(context, namespace):
@@ -263,11 +306,13 @@ def confirm_lease(context, namespace):
         raise SystemExit("invalid empty context for Lease given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for Lease given")
-    load_kube(context)
-    api = client.CoordinationV1beta1Api()
+    api = get_api(context, "Lease", "CoordinationV1Api")
     return general_confirm("Lease",
-                           lambda: api.list_namespaced_lease(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Lease", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_lease, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_horizontal_pod_autoscaler(context, namespace):
@@ -275,11 +320,13 @@ def confirm_horizontal_pod_autoscaler(context, namespace):
         raise SystemExit("invalid empty context for HorizontalPodAutoscaler given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for HorizontalPodAutoscaler given")
-    load_kube(context)
-    api = client.AutoscalingV1Api()
+    api = get_api(context, "HorizontalPodAutoscaler", "AutoscalingV1Api")
     return general_confirm("HorizontalPodAutoscaler",
-                           lambda: api.list_namespaced_horizontal_pod_autoscaler(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "HorizontalPodAutoscaler", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_horizontal_pod_autoscaler, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_controller_revision(context, namespace):
@@ -287,11 +334,13 @@ def confirm_controller_revision(context, namespace):
         raise SystemExit("invalid empty context for ControllerRevision given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for ControllerRevision given")
-    load_kube(context)
-    api = client.AppsV1Api()
+    api = get_api(context, "ControllerRevision", "AppsV1Api")
     return general_confirm("ControllerRevision",
-                           lambda: api.list_namespaced_controller_revision(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ControllerRevision", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_controller_revision, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_limit_range(context, namespace):
@@ -299,111 +348,103 @@ def confirm_limit_range(context, namespace):
         raise SystemExit("invalid empty context for LimitRange given")
     if namespace is None:
         raise SystemExit("invalid empty namespace for LimitRange given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "LimitRange", "CoreV1Api")
     return general_confirm("LimitRange",
-                           lambda: api.list_namespaced_limit_range(namespace),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "LimitRange", ["metadata.name"],
+                                               lambda: list_fields(api.list_namespaced_limit_range, ["metadata.name"],
+                                                                   namespace=namespace),
+                                               namespace),
+                           lambda i: i[0])
 
 
 def confirm_cluster_role(context):
     if context is None:
         raise SystemExit("invalid empty context for ClusterRole given")
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "ClusterRole", "RbacAuthorizationV1Api")
     return general_confirm("ClusterRole",
-                           lambda: api.list_cluster_role(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ClusterRole", ["metadata.name"],
+                                               lambda: list_fields(api.list_cluster_role, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_cluster_role_binding(context):
     if context is None:
         raise SystemExit("invalid empty context for ClusterRoleBinding given")
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "ClusterRoleBinding", "RbacAuthorizationV1Api")
     return general_confirm("ClusterRoleBinding",
-                           lambda: api.list_cluster_role_binding(),
-                           lambda i: i.metadata.name)
-
-
-def confirm_pod_security_policy(context):
-    if context is None:
-        raise SystemExit("invalid empty context for PodSecurityPolicy given")
-    load_kube(context)
-    api = client.PolicyV1beta1Api()
-    return general_confirm("PodSecurityPolicy",
-                           lambda: api.list_pod_security_policy(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "ClusterRoleBinding", ["metadata.name"],
+                                               lambda: list_fields(api.list_cluster_role_binding, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_persistent_volume(context):
     if context is None:
         raise SystemExit("invalid empty context for PersistentVolume given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PersistentVolume", "CoreV1Api")
     return general_confirm("PersistentVolume",
-                           lambda: api.list_persistent_volume(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "PersistentVolume", ["metadata.name"],
+                                               lambda: list_fields(api.list_persistent_volume, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_volume_attachment(context):
     if context is None:
         raise SystemExit("invalid empty context for VolumeAttachment given")
-    load_kube(context)
-    api = client.StorageV1Api()
+    api = get_api(context, "VolumeAttachment", "StorageV1Api")
     return general_confirm("VolumeAttachment",
-                           lambda: api.list_volume_attachment(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "VolumeAttachment", ["metadata.name"],
+                                               lambda: list_fields(api.list_volume_attachment, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_storage_class(context):
     if context is None:
         raise SystemExit("invalid empty context for StorageClass given")
-    load_kube(context)
-    api = client.StorageV1Api()
+    api = get_api(context, "StorageClass", "StorageV1Api")
     return general_confirm("StorageClass",
-                           lambda: api.list_storage_class(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "StorageClass", ["metadata.name"],
+                                               lambda: list_fields(api.list_storage_class, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_priority_class(context):
     if context is None:
         raise SystemExit("invalid empty context for PriorityClass given")
-    load_kube(context)
-    api = client.SchedulingV1beta1Api()
+    api = get_api(context, "PriorityClass", "SchedulingV1Api")
     return general_confirm("PriorityClass",
-                           lambda: api.list_priority_class(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "PriorityClass", ["metadata.name"],
+                                               lambda: list_fields(api.list_priority_class, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_node(context):
     if context is None:
         raise SystemExit("invalid empty context for Node given")
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Node", "CoreV1Api")
     return general_confirm("Node",
-                           lambda: api.list_node(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "Node", ["metadata.name"],
+                                               lambda: list_fields(api.list_node, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_custom_resource_definition(context):
     if context is None:
         raise SystemExit("invalid empty context for CustomResourceDefinition given")
-    load_kube(context)
-    api = client.ApiextensionsV1beta1Api()
+    api = get_api(context, "CustomResourceDefinition", "ApiextensionsV1Api")
     return general_confirm("CustomResourceDefinition",
-                           lambda: api.list_custom_resource_definition(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "CustomResourceDefinition", ["metadata.name"],
+                                               lambda: list_fields(api.list_custom_resource_definition, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm_certificate_signing_request(context):
     if context is None:
         raise SystemExit("invalid empty context for CertificateSigningRequest given")
-    load_kube(context)
-    api = client.CertificatesV1beta1Api()
+    api = get_api(context, "CertificateSigningRequest", "CertificatesV1Api")
     return general_confirm("CertificateSigningRequest",
-                           lambda: api.list_certificate_signing_request(),
-                           lambda i: i.metadata.name)
+                           lambda: list_cached(context, "CertificateSigningRequest", ["metadata.name"],
+                                               lambda: list_fields(api.list_certificate_signing_request, ["metadata.name"])),
+                           lambda i: i[0])
 
 
 def confirm(question) -> bool:
@@ -414,8 +455,6 @@ def confirm(question) -> bool:
 
 # custom pick call, no usage of general confirm here
 def confirm_set(context, namespace):
-    load_kube(context)
-
     try:
         kube_sets = get_sets(context, namespace)
     except Exception as e:
@@ -463,16 +502,16 @@ def confirm_set(context, namespace):
 
 
 def general_confirm(name, collection_lambda, collection_selector_lambda):
-    response = collection_lambda()
+    """
+    :param collection_lambda: returns the items to choose from, e.g. field tuples of list_fields
+    """
+    items = collection_lambda()
 
-    if response is None or response.items is None:
+    if items is None:
         raise SystemExit("no valid response received for " + name)
 
-    if len(response.items) > 0:
-        try:
-            return pick_operation(response.items, collection_selector_lambda, name)
-        except:
-            return pick_operation(response, collection_selector_lambda, name)
+    if len(items) > 0:
+        return pick_operation(items, collection_selector_lambda, name)
     else:
         print("No", name + "s", "found!")
     raise SystemExit("No " + name + "s chosen or available")
@@ -497,28 +536,30 @@ def pick_operation(iterable, collection_selector_lambda, title):
 def confirm_namespace(context, show_warning=True):
     if context is None:
         raise SystemExit("null context given")
-    load_kube(context)
-    api_instance = client.CoreV1Api()
+    api_instance = client.CoreV1Api(get_api_client(context))
 
     def all_namespaces():
-        return api_instance.list_namespace(watch=False)
+        return list_cached(context, "Namespace", ["metadata.name"],
+                           lambda: list_fields(api_instance.list_namespace, ["metadata.name"], watch=False))
 
     if show_warning:
-        ret = api_instance.list_pod_for_all_namespaces(watch=False)
+        import numpy
         non_empty_ns = set()
-        for i in ret.items:
-            non_empty_ns.add(i.metadata.namespace)
+        for i in list_cached(context, "Pod", ["metadata.namespace"],
+                             lambda: list_fields(api_instance.list_pod_for_all_namespaces, ["metadata.namespace"],
+                                                 watch=False)):
+            non_empty_ns.add(i[0])
 
         all_ns = set()
-        for j in all_namespaces().items:
-            all_ns.add(j.metadata.namespace)
+        for j in all_namespaces():
+            all_ns.add(j[0])
 
         print("Empty namespaces:", numpy.array(all_ns) - numpy.array(non_empty_ns))
-    return general_confirm("Namespace", all_namespaces, lambda i: i.metadata.name)
+    return general_confirm("Namespace", all_namespaces, lambda i: i[0])
 
 
 def confirm_context() -> str:
-    contexts, active_context = config.list_kube_config_contexts()
+    contexts, active_context = list_kube_config_contexts()
     if not contexts:
         print("Cannot find any context in kube-config file.")
         raise SystemExit("no context retrievable")
@@ -530,11 +571,14 @@ def confirm_context() -> str:
 
     context_list = []
     input_adapter = get_current_input_adapter()
+    if isinstance(input_adapter, PromptToolkitAdapter):
+        # all contexts are probed at once, the dialog shows which clusters answer
+        probes = probe_contexts(contexts)
     for i in sorted(contexts):
         if isinstance(input_adapter, PromptToolkitAdapter):
-            context_list.append((i, i))
+            context_list.append((i, probes[i].label()))
         else:
-            context_list.append(label)
+            context_list.append(i)
 
     answer = input_adapter.radio_list("Context", "", context_list)
     return answer
@@ -545,4 +589,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
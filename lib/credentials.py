@@ -0,0 +1,150 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import datetime
+import hashlib
+import json
+import logging
+import os
+
+from kubernetes.config.dateutil import parse_rfc3339
+from kubernetes.config.exec_provider import ExecProvider
+from kubernetes.config.kube_config import KubeConfigLoader, FileOrData
+
+from lib.util import cache_dir
+
+"""On-disk cache of the credentials of exec based auth plugins (e.g. aws eks get-token, gke-gcloud-auth-plugin).
+A plugin is run again only after the expirationTimestamp of its last credential. Credentials without an expiration
+are never written to disk."""
+
+CREDENTIALS_DIR = "credentials"
+
+# a cached credential is not used anymore if it expires within this time
+EXPIRY_MARGIN = datetime.timedelta(seconds=60)
+
+
+class CredentialCache:
+    """
+    ExecCredential status objects, one file per exec configuration and cluster, readable by the owner only
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def directory(self) -> str:
+        path = self.path or cache_dir(CREDENTIALS_DIR)
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        os.chmod(path, 0o700)
+        return path
+
+    def key(self, exec_config: dict, server) -> str:
+        data = json.dumps({"exec": exec_config, "server": server}, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached status or None if there is no valid one
+        """
+        file_name = os.path.join(self.directory(), key + ".json")
+        try:
+            with open(file_name, 'r') as file:
+                stat = os.fstat(file.fileno())
+                # never trust a file other users could have written or read
+                if stat.st_mode & 0o077 or (hasattr(os, "getuid") and stat.st_uid != os.getuid()):
+                    return None
+                status = json.load(file)
+            if self.is_expired(status):
+                return None
+            return status
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def put(self, key, status: dict):
+        if "expirationTimestamp" not in status:
+            return
+        file_name = os.path.join(self.directory(), key + ".json")
+        tmp_file = file_name + ".%d.tmp" % os.getpid()
+        try:
+            descriptor = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(status, file)
+            os.replace(tmp_file, file_name)
+        except OSError as e:
+            print("Could not write credential cache", file_name, e)
+
+    def is_expired(self, status: dict) -> bool:
+        expiry = parse_rfc3339(status["expirationTimestamp"])
+        return expiry <= datetime.datetime.now(datetime.timezone.utc) + EXPIRY_MARGIN
+
+
+credential_cache = CredentialCache()
+
+
+class CachingKubeConfigLoader(KubeConfigLoader):
+    """
+    KubeConfigLoader which asks the credential cache before it runs an exec plugin
+    """
+
+    credential_cache = credential_cache
+
+    def _load_from_exec_plugin(self):
+        if 'exec' not in self._user:
+            return
+        try:
+            base_path = self._get_base_path(self._cluster.path)
+            key = self.credential_cache.key(self._user['exec'].value, self._cluster.safe_get('server'))
+            status = self.credential_cache.get(key)
+            if status is None:
+                status = ExecProvider(self._user['exec'], base_path, self._cluster).run()
+                self.credential_cache.put(key, status)
+            return self._set_exec_status(status, base_path)
+        except Exception as e:
+            logging.error(str(e))
+
+    def _set_exec_status(self, status, base_path):
+        if 'token' in status:
+            self.token = "Bearer %s" % status['token']
+        elif 'clientCertificateData' in status:
+            if 'clientKeyData' not in status:
+                logging.error('exec: missing clientKeyData field in plugin output')
+                return None
+            self.cert_file = FileOrData(status, None, data_key_name='clientCertificateData',
+                                        file_base_path=base_path, base64_file_content=False,
+                                        temp_file_path=self._temp_file_path).as_file()
+            self.key_file = FileOrData(status, None, data_key_name='clientKeyData',
+                                       file_base_path=base_path, base64_file_content=False,
+                                       temp_file_path=self._temp_file_path).as_file()
+        else:
+            logging.error('exec: missing token or clientCertificateData field in plugin output')
+            return None
+        if 'expirationTimestamp' in status:
+            self.expiry = parse_rfc3339(status['expirationTimestamp'])
+        return True
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stdout, redirect_stderr
+
+from lib.util import cache_dir
+
+"""Long-lived daemon which keeps modules, the command registry and kubernetes clients loaded and a thin client
+forwarding command lines to it over a unix domain socket. Only the standard library is imported at module level,
+the client has to start fast."""
+
+# set this env key to forward all commands of main.py to a running daemon
+DAEMON_ENV = "K8S_PYTHON_TOOLS_DAEMON"
+# optional location of the unix domain socket
+SOCKET_ENV = "K8S_PYTHON_TOOLS_SOCKET"
+SOCKET_FILE = "daemon.sock"
+# env keys which change what a command does, the daemon only runs commands of clients with the same values
+ENV_PREFIX = "K8S_PYTHON_TOOLS_"
+KUBECONFIG_ENV = "KUBECONFIG"
+
+
+def daemon_socket_path() -> str:
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    return os.path.join(cache_dir(), SOCKET_FILE)
+
+
+def is_daemon_enabled() -> bool:
+    return os.environ.get(DAEMON_ENV, "").lower() in ("1", "true", "yes")
+
+
+def command_environment() -> dict:
+    """
+    The kubeconfig and all settings (limits, timeouts, caches) of this tool in the environment of this process
+    """
+    return {key: value for key, value in os.environ.items()
+            if key == KUBECONFIG_ENV or (key.startswith(ENV_PREFIX) and key not in (DAEMON_ENV, SOCKET_ENV))}
+
+
+def environment_differences(env: dict) -> [str]:
+    """
+    Keys of the command environment of a client which differ from the one of this process
+    """
+    own = command_environment()
+    return sorted(key for key in set(own) | set(env) if own.get(key) != env.get(key))
+
+
+def send_frame(connection, frame: dict):
+    connection.sendall(json.dumps(frame).encode("utf-8") + b"\n")
+
+
+def read_frames(connection):
+    with connection.makefile("rb") as file:
+        for line in file:
+            yield json.loads(line.decode("utf-8"))
+
+
+class FrameWriter(io.TextIOBase):
+    """
+    Text stream which sends everything written to it as a frame to the client
+    """
+
+    def __init__(self, connection, stream):
+        self.connection = connection
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            send_frame(self.connection, {"stream": self.stream, "data": data})
+        return len(data)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """
+    One request per connection: a json line with argv and cwd, answered by output frames and a final exit frame
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError:
+            send_frame(self.connection, {"stream": "stderr", "data": "invalid request\n"})
+            send_frame(self.connection, {"exit": 2})
+            return
+
+        if request.get("command") == "ping":
+            send_frame(self.connection, {"exit": 0})
+            return
+        if request.get("command") == "stop":
+            send_frame(self.connection, {"exit": 0})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        # the daemon has loaded its clients and limits with its own environment
+        differences = environment_differences(request.get("env") or dict())
+        if differences:
+            send_frame(self.connection, {"stream": "stderr", "data": "The daemon runs with other values of %s, please "
+                                         "restart it with your environment or unset %s\n"
+                                         % (", ".join(differences), DAEMON_ENV)})
+            send_frame(self.connection, {"exit": 1})
+            return
+
+        status = self.server.execute(request.get("argv", []), request.get("cwd"),
+                                     FrameWriter(self.connection, "stdout"), FrameWriter(self.connection, "stderr"))
+        send_frame(self.connection, {"exit": status})
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Executes forwarded command lines one after another in this process. stdout, stderr and the working directory
+    are process wide, so commands do not run in parallel.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        from lib.informer import enable_informers
+        from lib.input import NonInteractiveAdapter, set_current_input_adapter
+        from lib.register import get_register
+
+        self.socket_path = socket_path
+        self.lock = threading.Lock()
+        # nobody can answer a dialog of the daemon
+        set_current_input_adapter(NonInteractiveAdapter())
+        self.register = get_register()
+        self.register.manifest()
+        # frequently used kinds are listed once and watched instead of listed by every command
+        enable_informers()
+
+        if os.path.exists(socket_path):
+            if forward_command(socket_path, {"command": "ping"}) is not None:
+                raise SystemExit("A daemon is already listening on " + socket_path)
+            os.unlink(socket_path)
+        # only the current user is allowed to connect, the daemon acts with the user's kubernetes credentials
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, DaemonRequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def execute(self, argv, cwd, stdout, stderr) -> int:
+        from lib.runner import run_command_line
+
+        with self.lock:
+            previous_cwd = os.getcwd()
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    return run_command_line(argv, self.register)
+            except OSError as e:
+                print("daemon could not execute command:", e, file=stderr)
+                return 1
+            finally:
+                os.chdir(previous_cwd)
+
+    def server_close(self):
+        from lib.informer import enable_informers
+        enable_informers(False)
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def forward_command(socket_path, request: dict, stdout=None, stderr=None):
+    """
+    Sends a request to the daemon and streams its output. Returns the exit status or None if no daemon is listening.
+    """
+    stdout = stdout if stdout is not None else sys.stdout
+    stderr = stderr if stderr is not None else sys.stderr
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+
+    with connection:
+        send_frame(connection, request)
+        for frame in read_frames(connection):
+            if "exit" in frame:
+                return frame["exit"]
+            stream = stdout if frame.get("stream") == "stdout" else stderr
+            stream.write(frame.get("data", ""))
+            stream.flush()
+    print("connection to daemon lost", file=stderr)
+    return 1
+
+
+def forward_to_daemon(argv, socket_path=None):
+    """
+    Thin client: runs the command line in the daemon. Returns the exit status or None if no daemon is listening.
+    """
+    return forward_command(socket_path or daemon_socket_path(), {"argv": list(argv), "cwd": os.getcwd(),
+                                                                 "env": command_environment()})
+
+
+def run_daemon(argv) -> int:
+    """
+    Entry point of "main.py daemon"
+    """
+    parser = argparse.ArgumentParser(prog="python3 main.py daemon",
+                                     description="keeps the tool loaded and executes commands forwarded by "
+                                                 + DAEMON_ENV + "=1 python3 main.py ...")
+    parser.add_argument("--socket", type=str, help="path of the unix domain socket")
+    parser.add_argument("--stop", action="store_true", help="stop a running daemon")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("The daemon mode needs unix domain sockets")
+    socket_path = args.socket or daemon_socket_path()
+
+    if args.stop:
+        if forward_command(socket_path, {"command": "stop"}) is None:
+            print("No daemon is listening on", socket_path)
+            return 1
+        print("Daemon stopped")
+        return 0
+
+    daemon = Daemon(socket_path)
+    print("Daemon listening on", socket_path)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+    return 0
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import json
+import os
+import re
+import threading
+import time
+
+from lib.util import cache_dir
+
+"""Discovery of the API groups, versions and resources a cluster serves. The preferred group/version of every kind
+is cached on disk per cluster (like kubectl does in ~/.kube/cache/discovery), so commands pick the endpoint the cluster
+actually serves without paying the discovery requests on every run."""
+
+DISCOVERY_DIR = "discovery"
+
+# seconds a cached discovery document is used, 0 disables the on-disk cache
+TTL_ENV = "K8S_PYTHON_TOOLS_DISCOVERY_TTL"
+DEFAULT_TTL = 6 * 60 * 60
+
+# aggregated discovery (kubernetes 1.26+) returns all groups with their resources in a single response
+AGGREGATED_ACCEPT = "application/json;g=apidiscovery.k8s.io;v=v2;as=APIGroupDiscoveryList," \
+                    "application/json;g=apidiscovery.k8s.io;v=v2beta1;as=APIGroupDiscoveryList," \
+                    "application/json"
+
+# the core group is served as v1 only, its kinds never need a discovery request
+CORE_API = "CoreV1Api"
+# plural name and scope of the kinds of the core group
+CORE_RESOURCES = {"Pod": ("pods", True), "Service": ("services", True), "Endpoints": ("endpoints", True),
+                  "ReplicationController": ("replicationcontrollers", True),
+                  "PersistentVolumeClaim": ("persistentvolumeclaims", True), "ConfigMap": ("configmaps", True),
+                  "Secret": ("secrets", True), "ServiceAccount": ("serviceaccounts", True),
+                  "ResourceQuota": ("resourcequotas", True), "PodTemplate": ("podtemplates", True),
+                  "Event": ("events", True), "LimitRange": ("limitranges", True),
+                  "PersistentVolume": ("persistentvolumes", False), "Node": ("nodes", False),
+                  "Namespace": ("namespaces", False)}
+
+
+class Resource:
+    """
+    A kind as served by one group/version
+    """
+
+    def __init__(self, kind, group, version, name, namespaced):
+        self.kind = kind
+        self.group = group
+        self.version = version
+        self.name = name
+        self.namespaced = namespaced
+
+    def group_version(self) -> str:
+        return self.group + "/" + self.version if self.group else self.version
+
+    def path(self, namespace=None) -> str:
+        """
+        Path of the collection below the API server URL, of all namespaces if no namespace is given
+        """
+        base = "/apis/%s/%s" % (self.group, self.version) if self.group else "/api/" + self.version
+        if namespace and self.namespaced:
+            base += "/namespaces/" + namespace
+        return base + "/" + self.name
+
+    def api_class_name(self) -> str:
+        """
+        Name of the API class of the kubernetes client for this group/version, e.g. NetworkingV1Api
+        """
+        group = re.sub(r"\.k8s\.io$", "", self.group) if self.group else "core"
+        return "".join(i.capitalize() for i in group.split(".")) + self.version.capitalize() + "Api"
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "group": self.group, "version": self.version, "name": self.name,
+                "namespaced": self.namespaced}
+
+    @staticmethod
+    def from_dict(data: dict):
+        return Resource(data["kind"], data["group"], data["version"], data["name"], data["namespaced"])
+
+    def __repr__(self):
+        return "%s(%s)" % (self.kind, self.group_version())
+
+
+def discovery_ttl() -> float:
+    try:
+        return float(os.environ.get(TTL_ENV, DEFAULT_TTL))
+    except ValueError:
+        raise SystemExit("invalid value of %s: %s" % (TTL_ENV, os.environ.get(TTL_ENV)))
+
+
+def get_json(api_client, path, accept="application/json"):
+    """
+    GET request of a discovery path with the authentication of the given client. Returns the decoded body or None if
+    the cluster answered with an error, e.g. for an unavailable aggregated API.
+    """
+    method, url, headers, body, post_params = api_client.param_serialize(
+        "GET", path, header_params={"Accept": accept}, auth_settings=["BearerToken"])
+    response = api_client.call_api(method, url, headers, body, post_params)
+    data = response.read()
+    if not 200 <= response.status < 300:
+        print("Discovery of %s failed with status %s" % (path, response.status))
+        return None
+    return json.loads(data)
+
+
+def aggregated_resources(document: dict) -> list:
+    """
+    Resources of an APIGroupDiscoveryList, the versions of a group are listed in order of preference
+    """
+    resources = list()
+    for group in document.get("items") or ():
+        name = (group.get("metadata") or {}).get("name") or ""
+        for version in group.get("versions") or ():
+            for resource in version.get("resources") or ():
+                kind = (resource.get("responseKind") or {}).get("kind")
+                if kind:
+                    resources.append(Resource(kind, name, version["version"], resource["resource"],
+                                              resource.get("scope") == "Namespaced"))
+    return resources
+
+
+def group_version_resources(group, version, document: dict) -> list:
+    """
+    Resources of an APIResourceList, subresources like pods/log are skipped
+    """
+    return [Resource(i["kind"], group, version, i["name"], bool(i.get("namespaced")))
+            for i in document.get("resources") or () if "/" not in i["name"]]
+
+
+def discover(api_client) -> list:
+    """
+    All resources of a cluster: core group first, then all groups in the order of /apis, preferred versions first
+    """
+    core = get_json(api_client, "/api", AGGREGATED_ACCEPT)
+    groups = get_json(api_client, "/apis", AGGREGATED_ACCEPT)
+    if core is None or groups is None:
+        raise SystemExit("Discovery of the API groups failed")
+    if core.get("kind") == "APIGroupDiscoveryList" and groups.get("kind") == "APIGroupDiscoveryList":
+        return aggregated_resources(core) + aggregated_resources(groups)
+
+    # older clusters: one request per group/version
+    resources = list()
+    for version in core.get("versions") or ():
+        document = get_json(api_client, "/api/" + version)
+        if document is not None:
+            resources += group_version_resources("", version, document)
+    for group in groups.get("groups") or ():
+        preferred = (group.get("preferredVersion") or {}).get("version")
+        versions = [i["version"] for i in group.get("versions") or ()]
+        for version in sorted(versions, key=lambda i: i != preferred):
+            document = get_json(api_client, "/apis/%s/%s" % (group["name"], version))
+            if document is not None:
+                resources += group_version_resources(group["name"], version, document)
+    return resources
+
+
+class DiscoveryCache:
+    """
+    Discovered resources keyed by API server URL, kept in memory and in one file per cluster
+    """
+
+    def __init__(self, path=None, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.clusters = dict()
+        self.lock = threading.Lock()
+
+    def file_name(self, host) -> str:
+        # same naming as kubectl: https://10.0.0.1:6443 is cached in 10.0.0.1_6443
+        cluster = re.sub(r"[^\w.-]", "_", re.sub(r"^https?://", "", host)).strip("_")
+        return os.path.join(self.path or cache_dir(DISCOVERY_DIR), cluster + ".json")
+
+    def read(self, host):
+        ttl = discovery_ttl()
+        if ttl <= 0:
+            return None
+        try:
+            with open(self.file_name(host), 'r') as file:
+                data = json.load(file)
+            if data["host"] != host or self.clock() - data["time"] > ttl:
+                return None
+            return data
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write(self, data: dict):
+        if discovery_ttl() <= 0:
+            return
+        file_name = self.file_name(data["host"])
+        tmp_file = file_name + ".%d.tmp" % os.getpid()
+        try:
+            with open(tmp_file, 'w') as file:
+                json.dump(data, file)
+            os.replace(tmp_file, file_name)
+        except OSError as e:
+            print("Could not write discovery cache", file_name, e)
+
+    def resources(self, api_client) -> list:
+        host = api_client.configuration.host
+        ttl = discovery_ttl()
+        with self.lock:
+            data = self.clusters.get(host)
+            # without on-disk cache the resources are discovered once per process
+            if data is None or 0 < ttl < self.clock() - data["time"]:
+                data = self.read(host)
+                if data is None:
+                    data = {"host": host, "time": self.clock(),
+                            "resources": [i.to_dict() for i in discover(api_client)]}
+                    self.write(data)
+                self.clusters[host] = data
+        return [Resource.from_dict(i) for i in data["resources"]]
+
+    def resolve(self, api_client, kind) -> [Resource]:
+        """
+        All group/versions serving the kind, the preferred one first
+        """
+        return [i for i in self.resources(api_client) if i.kind == kind]
+
+    def invalidate(self, api_client):
+        host = api_client.configuration.host
+        with self.lock:
+            self.clusters.pop(host, None)
+            try:
+                os.remove(self.file_name(host))
+            except OSError:
+                pass
+
+
+discovery_cache = DiscoveryCache()
+
+
+def resolve_resource(context, kind) -> Resource:
+    """
+    The preferred group/version of a kind in the cluster of the context
+    """
+    from lib.pool import get_api_client
+    resources = discovery_cache.resolve(get_api_client(context), kind)
+    if not resources:
+        raise SystemExit("The cluster of context %s serves no %s" % (context, kind))
+    return resources[0]
+
+
+def core_resource(kind) -> Resource:
+    """
+    The resource of a kind of the core group without a discovery request or None for every other kind
+    """
+    if kind not in CORE_RESOURCES:
+        return None
+    name, namespaced = CORE_RESOURCES[kind]
+    return Resource(kind, "", "v1", name, namespaced)
+
+
+# query parameters of the list methods of the API classes
+QUERY_PARAMETERS = {"label_selector": "labelSelector", "field_selector": "fieldSelector", "_continue": "continue",
+                    "limit": "limit", "resource_version": "resourceVersion", "watch": "watch",
+                    "timeout_seconds": "timeoutSeconds", "allow_watch_bookmarks": "allowWatchBookmarks"}
+
+
+def list_method(context, resource: Resource, namespace=None):
+    """
+    List method of a discovered resource, called like the list methods of the API classes with
+    _preload_content=False, e.g. by lib.fields.list_fields. Works for custom resources, too.
+    """
+    from kubernetes.client.rest import ApiException
+    from lib.pool import get_api_client
+    api_client = get_api_client(context)
+    path = resource.path(namespace)
+
+    def list_resource(_preload_content=False, _headers=None, _request_timeout=None, **kwargs):
+        query = [(QUERY_PARAMETERS[key], value) for key, value in kwargs.items() if value is not None]
+        headers = dict({"Accept": "application/json"}, **(_headers or {}))
+        method, url, headers, body, post_params = api_client.param_serialize(
+            "GET", path, query_params=query, header_params=headers, auth_settings=["BearerToken"])
+        response = api_client.call_api(method, url, headers, body, post_params, _request_timeout=_request_timeout)
+        if not 200 <= response.status < 300:
+            response.read()
+            raise ApiException.from_response(http_resp=response, body=response.data.decode("utf-8", "replace"),
+                                             data=None)
+        return response.response
+
+    return list_resource
+
+
+def get_api(context, kind, fallback_api=None):
+    """
+    Instance of the client API class for the preferred group/version of a kind, e.g. get_api(context, "Deployment")
+    returns an AppsV1Api. The fallback API class is used for the core group and for kinds whose served versions are
+    unknown to the installed kubernetes client.
+    """
+    from kubernetes import client
+    from lib.pool import get_api_client
+    api_client = get_api_client(context)
+    names = list()
+    if fallback_api != CORE_API:
+        names += [i.api_class_name() for i in discovery_cache.resolve(api_client, kind)]
+    if fallback_api is not None:
+        names.append(fallback_api)
+    for name in names:
+        api_class = getattr(client, name, None)
+        if api_class is not None:
+            return api_class(api_client)
+    raise SystemExit("The cluster of context %s serves no %s API known to the installed kubernetes client"
+                     % (context, kind))
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,7 @@ from kubernetes import stream, client
 from kubernetes.client.apis import core_v1_api
 from kubernetes.client.rest import ApiException
 
-from lib.common import load_kube
+from lib.pool import get_api_client
 
 JOB_COMPLETION_WAIT_LIMIT = 3600
 
@@ -48,8 +48,7 @@ def run_command_in_pod(context, namespace, pod, command):
     """
     if context is None:
         raise SystemExit("Null context given")
-    load_kube(context)
-    api = core_v1_api.CoreV1Api()
+    api = core_v1_api.CoreV1Api(get_api_client(context))
     try:
         command_ = init_exec_command + ["-c", command]
         resp = stream.stream(api.connect_get_namespaced_pod_exec, name=pod, namespace=namespace,
@@ -66,7 +65,6 @@ def run_command_in_pod(context, namespace, pod, command):
 def apply_kube_yaml(context, abs_file_location):
     if context is None:
         raise SystemExit('Null context given')
-    load_kube(context)
     apply_cmd = "kubectl apply -f {0} --context {1}".format(abs_file_location, context)
     print('Executing cmd: %s' % apply_cmd)
     output = subprocess.check_output(apply_cmd, shell=True)
@@ -81,9 +79,8 @@ def get_pod_logs(context, namespace, pod) -> str:
     if pod is None:
         raise SystemExit('Null pod given')
 
-    load_kube(context)
     try:
-        api_instance = client.CoreV1Api()
+        api_instance = client.CoreV1Api(get_api_client(context))
         api_response = api_instance.read_namespaced_pod_log(name=pod, namespace=namespace)
         return api_response
     except ApiException as e:
@@ -103,9 +100,8 @@ class DownloadFile:
         self.dest_file = local_dest_file
 
     def run(self):
-        load_kube(self.context)
-
-        cmd = "kubectl cp {0}/{1}:{2} {3}".format(self.namespace, self.pod, self.source_file, self.dest_file)
+        cmd = "kubectl cp {0}/{1}:{2} {3} --context {4}".format(self.namespace, self.pod, self.source_file,
+                                                                 self.dest_file, self.context)
         print("executing:", cmd)
         process = subprocess.run(cmd, shell=True)
         print(process)
@@ -124,10 +120,8 @@ class UploadFile:
         self.dest_file_in_pod = dest_file_in_pod
 
     def run(self):
-        load_kube(self.context)
-
-        cmd = "kubectl cp {0} {1}/{2}:{3}".format(self.local_source_file, self.namespace, self.pod,
-                                                  self.dest_file_in_pod)
+        cmd = "kubectl cp {0} {1}/{2}:{3} --context {4}".format(self.local_source_file, self.namespace, self.pod,
+                                                                self.dest_file_in_pod, self.context)
         print("executing:", cmd)
         process = subprocess.run(cmd, shell=True)
         print(process)
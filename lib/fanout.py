@@ -0,0 +1,194 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import copy
+import io
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import lib.input
+from lib.input import NonInteractiveAdapter, set_current_input_adapter
+from lib.probe import probe
+from lib.stats import request_stats
+from lib.util import ThreadLocalStream
+
+"""Runs one command against several contexts at once. Every context uses its own pooled client, each line of output
+is printed as soon as it is complete with the context name in front, so a slow or unreachable cluster does not hold
+back the others. Contexts which do not answer a probe are skipped."""
+
+# upper limit of contexts which are queried at the same time
+FANOUT_WORKERS = 16
+
+
+class ContextResult:
+    """
+    Outcome of the command for a single context
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.status = None
+        self.error = ""
+        self.duration = 0.0
+        self.requests = 0
+
+
+def fan_out_contexts(args) -> list:
+    """
+    Contexts of --contexts or --all-contexts, None if the command runs against a single context
+    """
+    names = getattr(args, "contexts", None)
+    all_contexts = getattr(args, "all_contexts", False)
+    if not names and not all_contexts:
+        return None
+    if getattr(args, "context", None):
+        raise SystemExit("use either --context or --contexts/--all-contexts")
+    if all_contexts:
+        from lib.kubeconfig import list_kube_config_contexts
+        from lib.pool import client_pool
+        contexts, active_context = list_kube_config_contexts(client_pool.config_file)
+        return sorted(i["name"] for i in contexts)
+    contexts = list()
+    for i in names.split(","):
+        if i.strip() and i.strip() not in contexts:
+            contexts.append(i.strip())
+    if not contexts:
+        raise SystemExit("no context given in --contexts")
+    return contexts
+
+
+class ContextLines(io.TextIOBase):
+    """
+    Text stream of a single context which writes every completed line with the context name in front to a stream
+    shared by all contexts
+    """
+
+    def __init__(self, context, stream, lock):
+        self.context = context
+        self.stream = stream
+        self.lock = lock
+        self.pending = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        lines = (self.pending + data).split("\n")
+        self.pending = lines.pop()
+        if lines:
+            with self.lock:
+                self.stream.write("".join("%s\t%s\n" % (self.context, i) for i in lines))
+                self.stream.flush()
+        return len(data)
+
+    def close(self):
+        # an incomplete last line
+        if self.pending:
+            self.write("\n")
+        super().close()
+
+
+class FanOut:
+    """
+    Executes a command once per context in a thread pool. Nobody can answer dialogs of the parallel runs, every
+    missing argument ends the run of that context.
+    """
+
+    def __init__(self, command, args, contexts: [str], workers=FANOUT_WORKERS):
+        self.command = command
+        self.args = args
+        self.contexts = contexts
+        self.workers = max(1, min(workers, len(contexts)))
+        self.results = [ContextResult(i) for i in contexts]
+
+    def run(self) -> int:
+        stdout, stderr = sys.stdout, sys.stderr
+        input_adapter = lib.input.current_input_adapter
+        set_current_input_adapter(NonInteractiveAdapter())
+        sys.stdout, sys.stderr = ThreadLocalStream(stdout), ThreadLocalStream(stderr)
+        lock = threading.Lock()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(self.execute_captured, i, ContextLines(i.context, stdout, lock))
+                           for i in self.results]
+                for future in futures:
+                    future.result()
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            set_current_input_adapter(input_adapter)
+        self.print_summary()
+        return 0 if all(i.status == 0 for i in self.results) else 1
+
+    def execute_captured(self, result: ContextResult, output: ContextLines):
+        try:
+            with sys.stdout.redirect(output), sys.stderr.redirect(output):
+                self.execute(result)
+        finally:
+            output.close()
+
+    def execute(self, result: ContextResult):
+        args = copy.copy(self.args)
+        args.context = result.context
+        requests = request_stats.get(result.context, "requests")
+        start = time.monotonic()
+        # a dead cluster is skipped after the probe timeout
+        reachable = probe(result.context)
+        if not reachable.reachable:
+            result.status = 1
+            result.error = "unreachable: " + reachable.error
+            result.duration = time.monotonic() - start
+            return
+        try:
+            self.command.run(args)
+            result.status = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                result.status = e.code or 0
+            else:
+                result.status = 1
+                result.error = str(e.code).strip().split("\n")[0]
+        except Exception as e:
+            traceback.print_exc()
+            result.status = 1
+            result.error = "%s: %s" % (type(e).__name__, str(e).strip().split("\n")[0])
+        result.duration = time.monotonic() - start
+        result.requests = request_stats.get(result.context, "requests") - requests
+
+    def print_summary(self, file=None):
+        file = file or sys.stderr
+        print("Context\tStatus\tSeconds\tRequests\tError", file=file)
+        for i in self.results:
+            print("%s\t%s\t%.2f\t%d\t%s" % (i.context, i.status, i.duration, i.requests, i.error), file=file)
+        failed = len([i for i in self.results if i.status != 0])
+        print("%d of %d contexts failed" % (failed, len(self.results)), file=file)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import codecs
+import functools
+import json
+import os
+import re
+
+"""Fast path for read-only commands: list responses are read as raw JSON (_preload_content=False) and only the
+requested field paths of every item are kept. The kubernetes models are never built, the items are decoded one by
+one while the response is read."""
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+decoder = json.JSONDecoder()
+
+JSON = "json"
+PROTOBUF = "protobuf"
+WIRE_FORMATS = [JSON, PROTOBUF]
+
+# K8S_PYTHON_TOOLS_GZIP=0 disables compressed responses
+GZIP_ENV = "K8S_PYTHON_TOOLS_GZIP"
+
+CHUNK_SIZE = 64 * 1024
+
+# decoded text is dropped from the buffer of a stream after this size
+COMPACT_SIZE = 1024 * 1024
+
+# lists of metadata only (kubernetes 1.15+), older API servers answer with the full objects of the next media type
+AS_METADATA = ";as=PartialObjectMetadataList;g=meta.k8s.io;v=v1"
+# the events of a watch hold single objects, so a watch asks for the metadata of one object
+AS_METADATA_WATCH = ";as=PartialObjectMetadata;g=meta.k8s.io;v=v1"
+
+# items per request of the list commands, same default as the --chunk-size of kubectl
+DEFAULT_PAGE_SIZE = 500
+
+
+def split_path(path) -> tuple:
+    """
+    "metadata.ownerReferences.0.kind" -> ("metadata", "ownerReferences", 0, "kind"), field names as in the JSON
+    (camelCase) of the API server
+    """
+    return tuple(int(i) if i.isdigit() else i for i in path.split("."))
+
+
+def extract(item, path: tuple):
+    """
+    Returns the value of a split path or None if any part is missing
+    """
+    for key in path:
+        if isinstance(item, dict):
+            item = item.get(key)
+        elif isinstance(item, list) and isinstance(key, int) and key < len(item):
+            item = item[key]
+        else:
+            return None
+    return item
+
+
+class JsonStream:
+    """
+    Text of a JSON document which is decoded from chunks (e.g. a decompressed HTTP response) on demand. The text
+    which is already decoded is dropped from time to time.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.index = 0
+        self.done = False
+
+    def fill(self) -> bool:
+        """
+        Reads the next chunk, returns False at the end of the document
+        """
+        if self.done:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.done = True
+            chunk = self.utf8.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            chunk = self.utf8.decode(chunk)
+        if self.index > COMPACT_SIZE:
+            self.text = self.text[self.index:]
+            self.index = 0
+        self.text += chunk
+        return True
+
+    def peek(self) -> str:
+        """
+        Returns the next character which is not whitespace, an empty string at the end
+        """
+        while True:
+            self.index = WHITESPACE.match(self.text, self.index).end()
+            if self.index < len(self.text):
+                return self.text[self.index]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError("one of '%s' expected in JSON document" % characters)
+        self.index += 1
+        return character
+
+    def value(self):
+        """
+        Decodes the next complete JSON value
+        """
+        while True:
+            self.peek()
+            try:
+                value, end = decoder.raw_decode(self.text, self.index)
+                # a value at the end of the text may be continued in the next chunk
+                if end < len(self.text) or self.done:
+                    self.index = end
+                    return value
+            except json.JSONDecodeError:
+                if self.done:
+                    raise
+            self.fill()
+
+
+def decode_stream(chunks, paths, items_key="items", document=None) -> (list, dict):
+    """
+    Decodes a JSON list object (e.g. PodList) of the given chunks and returns a tuple of the given field paths for
+    every item and the list metadata
+    :param paths: None keeps the whole items (dicts)
+    :param items_key: name of the list of items, e.g. "rows" of a Table
+    :param document: dict which receives all other values of the list object, e.g. the kind
+    """
+    split_paths = None if paths is None else [split_path(i) for i in paths]
+    items = list()
+    metadata = dict()
+
+    stream = JsonStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return items, metadata
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == items_key and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    item = stream.value()
+                    items.append(item if split_paths is None else tuple(extract(item, i) for i in split_paths))
+                    if stream.expect(",]") == "]":
+                        break
+        else:
+            value = stream.value()
+            if key == "metadata":
+                metadata = value or dict()
+            if document is not None:
+                document[key] = value
+        if stream.expect(",}") == "}":
+            return items, metadata
+
+
+def decode_list(data, paths) -> (list, dict):
+    """
+    Same as decode_stream for a complete document
+    """
+    return decode_stream([data], paths)
+
+
+def list_options(args) -> dict:
+    """
+    Returns the list_fields options of the parsed command line arguments of a list command
+    """
+    options = dict()
+    if getattr(args, "wire_format", None):
+        options["wire_format"] = args.wire_format
+    if getattr(args, "no_gzip", False):
+        options["compress"] = False
+    if getattr(args, "page_size", None) is not None:
+        options["page_size"] = args.page_size
+    if getattr(args, "selector", None):
+        options["label_selector"] = args.selector
+    if getattr(args, "field_selector", None):
+        options["field_selector"] = args.field_selector
+    if getattr(args, "max_staleness", None) is not None:
+        options["max_staleness"] = args.max_staleness
+    return options
+
+
+def namespaced(namespaced_method, all_namespaces_method, namespace):
+    """
+    Returns the list method of a single namespace (e.g. api.list_namespaced_pod) if a namespace is given and the one
+    of all namespaces (e.g. api.list_pod_for_all_namespaces) otherwise
+    """
+    if namespace:
+        return functools.partial(namespaced_method, namespace=namespace)
+    return all_namespaces_method
+
+
+def compression_enabled() -> bool:
+    return os.environ.get(GZIP_ENV, "1") != "0"
+
+
+def is_metadata_only(paths) -> bool:
+    return all(i.startswith("metadata.") for i in paths)
+
+
+def accept_header(wire_format, metadata_only, watch=False) -> str:
+    media_types = ["application/json"]
+    if wire_format == PROTOBUF:
+        from lib.protobuf import CONTENT_TYPE
+        media_types.insert(0, CONTENT_TYPE)
+    if metadata_only:
+        as_metadata = AS_METADATA_WATCH if watch else AS_METADATA
+        media_types = [i + as_metadata for i in media_types] + media_types
+    return ", ".join(media_types)
+
+
+def list_page(api_method, paths, wire_format=JSON, compress=None, metadata_only=None, **kwargs) -> (list, dict):
+    """
+    Calls a list method of the kubernetes API (e.g. api.list_namespaced_pod) once and returns a tuple of the given
+    field paths for every item and the list metadata
+    :param wire_format: json or protobuf, the API server answers with json if it cannot send protobuf
+    :param compress: asks for a gzip compressed response, by default unless K8S_PYTHON_TOOLS_GZIP=0 is set
+    :param metadata_only: asks for the metadata of the items only (PartialObjectMetadataList), by default if all
+    paths are below metadata, e.g. the names for a selection dialog
+    """
+    if metadata_only is None:
+        metadata_only = is_metadata_only(paths)
+    headers = dict()
+    if wire_format == PROTOBUF or metadata_only:
+        headers["Accept"] = accept_header(wire_format, metadata_only)
+    if compress is None:
+        compress = compression_enabled()
+    if compress:
+        headers["Accept-Encoding"] = "gzip"
+    if headers:
+        kwargs["_headers"] = headers
+    response = api_method(_preload_content=False, **kwargs)
+    try:
+        if wire_format == PROTOBUF:
+            data = response.data
+            if data[:4] == b"k8s\x00":
+                from lib.protobuf import decode_list as decode_protobuf_list
+                return decode_protobuf_list(data, paths)
+            return decode_list(data, paths)
+        # the response is decompressed while it is read
+        return decode_stream(response.stream(CHUNK_SIZE), paths)
+    finally:
+        response.release_conn()
+
+
+def iter_pages(page_function, page_size=None, **kwargs):
+    """
+    Calls a function which reads one page of a list (e.g. list_page) with limit and continue until the last page
+    and yields its results. The list metadata has to be the last value of a result.
+    """
+    from kubernetes.client.rest import ApiException
+    if page_size:
+        kwargs["limit"] = page_size
+    while True:
+        try:
+            result = page_function(**kwargs)
+        except ApiException as e:
+            # continue tokens expire after some minutes (etcd compaction)
+            if e.status == 410 and "_continue" in kwargs:
+                raise SystemExit("The list expired while reading its pages, please try again with a larger page size")
+            raise
+        yield result
+        token = result[-1].get("continue")
+        if not page_size or not token:
+            return
+        kwargs["_continue"] = token
+
+
+def iter_fields(api_method, paths, page_size=None, **kwargs):
+    """
+    Same as list_fields, but the list is requested in pages of page_size items (limit and continue) and the items
+    of a page are returned as soon as it is read. Memory is bounded by the page size.
+    """
+    for items, metadata in iter_pages(functools.partial(list_page, api_method, paths), page_size, **kwargs):
+        yield from items
+
+
+def list_fields(api_method, paths, wire_format=JSON, compress=None, page_size=None, **kwargs) -> [tuple]:
+    """
+    Calls a list method of the kubernetes API (e.g. api.list_namespaced_pod) and returns a tuple of the given field
+    paths for every item
+    :param wire_format: json or protobuf, the API server answers with json if it cannot send protobuf
+    :param compress: asks for a gzip compressed response, by default unless K8S_PYTHON_TOOLS_GZIP=0 is set
+    :param page_size: number of items per request, None or 0 reads the whole list at once
+    :param kwargs: arguments of the list method and metadata_only
+    """
+    return list(iter_fields(api_method, paths, page_size, wire_format=wire_format, compress=compress, **kwargs))
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,523 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from lib.fields import CHUNK_SIZE, DEFAULT_PAGE_SIZE, JSON, accept_header, extract, is_metadata_only, iter_fields, \
+    iter_pages, list_page, split_path
+
+"""Informers keep the objects of frequently used kinds in memory: every kind of a context is listed once (in pages)
+and then watched from the resourceVersion of the list on. The objects are indexed by namespace and label, so list
+commands, selection dialogs and wait functions are answered without a request. An informer is limited to the
+namespace of its first use and to the metadata of the objects if that is all its first user reads. Only long running
+processes (daemon and shell mode) start informers, every other command lists as before."""
+
+# comma separated kinds which are cached in daemon and shell mode, 0 disables the informers
+INFORMERS_ENV = "K8S_PYTHON_TOOLS_INFORMERS"
+DEFAULT_INFORMER_KINDS = "Pod,PersistentVolumeClaim,Deployment,Service,Ingress,CronJob,Job,Namespace"
+
+# seconds until the API server ends a watch, it is started again at the last resourceVersion
+WATCH_TIMEOUT = 300
+# longest pause between two attempts to watch again after an error
+MAX_BACKOFF = 30.0
+# seconds until a kind whose first list failed is tried again
+RETRY_FAILED = 60.0
+
+# "app=web", "tier in (a,b)", "!canary", "release" - terms of a label selector
+LABEL_TERM = re.compile(r'^\s*(?:!\s*([^\s!=(),]+)|([^\s!=(),]+)\s*(?:(==|=|!=)\s*([^\s!=(),]*)'
+                        r'|\s+(in|notin)\s*\(([^)]*)\))?)\s*$')
+# commas which are not within the parentheses of a set
+TERM_SEPARATOR = re.compile(r',(?![^(]*\))')
+FIELD_TERM = re.compile(r'^\s*([\w.]+)\s*(==|=|!=)\s*(.*?)\s*$')
+
+
+def informer_kinds() -> [str]:
+    value = os.environ.get(INFORMERS_ENV, DEFAULT_INFORMER_KINDS)
+    if value.strip() == "0":
+        return []
+    return [i.strip() for i in value.split(",") if i.strip()]
+
+
+def parse_label_selector(selector) -> [tuple]:
+    """
+    "app=web,tier notin (a,b),!canary" -> [("app", "in", {"web"}), ("tier", "notin", {"a", "b"}),
+    ("canary", "!", set())], the operators are exists, !, in and notin
+    """
+    requirements = list()
+    for term in TERM_SEPARATOR.split(selector or ""):
+        if not term.strip():
+            continue
+        match = LABEL_TERM.match(term)
+        if match is None:
+            raise SystemExit("invalid label selector: " + selector)
+        missing_key, key, operator, value, set_operator, values = match.groups()
+        if missing_key:
+            requirements.append((missing_key, "!", set()))
+        elif set_operator:
+            requirements.append((key, set_operator, {i.strip() for i in values.split(",") if i.strip()}))
+        elif operator:
+            requirements.append((key, "notin" if operator == "!=" else "in", {value}))
+        else:
+            requirements.append((key, "exists", set()))
+    return requirements
+
+
+def matches_labels(labels: dict, requirements) -> bool:
+    for key, operator, values in requirements:
+        if operator == "exists" and key not in labels:
+            return False
+        if operator == "!" and key in labels:
+            return False
+        if operator == "in" and labels.get(key) not in values:
+            return False
+        if operator == "notin" and labels.get(key) in values:
+            return False
+    return True
+
+
+def parse_field_selector(selector) -> [tuple]:
+    """
+    "status.phase!=Running" -> [(("status", "phase"), False, "Running")]
+    """
+    requirements = list()
+    for term in (selector or "").split(","):
+        if not term.strip():
+            continue
+        match = FIELD_TERM.match(term)
+        if match is None:
+            raise SystemExit("invalid field selector: " + selector)
+        path, operator, value = match.groups()
+        requirements.append((split_path(path), operator != "!=", value))
+    return requirements
+
+
+def field_selector_paths(selector) -> [str]:
+    return [".".join(str(i) for i in path) for path, equal, value in parse_field_selector(selector)]
+
+
+def field_value(item, path: tuple) -> str:
+    """
+    A field as the API server compares it with a field selector, missing fields are empty
+    """
+    value = extract(item, path)
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def matches_fields(item, requirements) -> bool:
+    return all((field_value(item, path) == value) == equal for path, equal, value in requirements)
+
+
+def labels_of(item) -> dict:
+    return (item.get("metadata") or {}).get("labels") or {}
+
+
+def object_key(item) -> tuple:
+    """
+    (namespace, name) of an object, the namespace of cluster scoped objects is empty
+    """
+    metadata = item.get("metadata") or {}
+    return metadata.get("namespace") or "", metadata.get("name") or ""
+
+
+def slim(item) -> dict:
+    """
+    Drops the managed fields, the largest part of most objects which no command reads
+    """
+    (item.get("metadata") or {}).pop("managedFields", None)
+    return item
+
+
+def iter_lines(chunks):
+    """
+    Lines of a watch response (one event per line), each line as soon as it is complete
+    """
+    rest = b""
+    for chunk in chunks:
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if rest.strip():
+        yield rest
+
+
+class ResourceVersionExpired(Exception):
+    """
+    The resourceVersion of a watch is older than the history of the API server (410 Gone)
+    """
+
+
+def start_watch(api_method, resource_version, **kwargs):
+    """
+    Calls a list method with watch=True from the given resourceVersion on and returns the response
+    """
+    from kubernetes.client.rest import ApiException
+    try:
+        return api_method(watch=True, resource_version=resource_version, allow_watch_bookmarks=True, **kwargs)
+    except ApiException as e:
+        if e.status == 410:
+            raise ResourceVersionExpired()
+        raise
+
+
+def iter_events(response):
+    """
+    Events of a watch response, an ERROR event ends the watch with an exception
+    """
+    for line in iter_lines(response.stream(CHUNK_SIZE)):
+        event = json.loads(line.decode("utf-8"))
+        if event.get("type") == "ERROR":
+            status = event.get("object") or {}
+            if status.get("code") == 410:
+                raise ResourceVersionExpired()
+            raise ValueError("watch failed: %s" % status.get("message"))
+        yield event
+
+
+class Informer:
+    """
+    The objects of one kind in the cluster of a context. An initial list fills the store, a watch thread applies every
+    change. The store is indexed by namespace and by label, queries never send a request.
+    :param namespace: keeps the objects of this namespace only, all namespaces for None
+    :param metadata_only: keeps the metadata of the objects only (PartialObjectMetadata)
+    """
+
+    def __init__(self, context, resource, namespace=None, metadata_only=False, page_size=DEFAULT_PAGE_SIZE):
+        from lib.discovery import list_method
+        from lib.pool import get_api_client
+        from lib.probe import request_timeout
+        self.context = context
+        self.resource = resource
+        self.namespace = namespace if resource.namespaced else None
+        self.metadata_only = metadata_only
+        self.api_client = get_api_client(context)
+        self.api_method = list_method(context, resource, self.namespace)
+        self.page_size = page_size
+        # the read timeout of a watch is the time until the API server ends it
+        self.watch_timeout = (request_timeout(context)[0], WATCH_TIMEOUT + 30)
+        self.condition = threading.Condition()
+        self.objects = dict()
+        self.namespaces = dict()
+        self.labels = dict()
+        self.resource_version = None
+        self.synced = False
+        self.error = None
+        self.stopped = threading.Event()
+        self.response = None
+        self.thread = None
+
+    def start(self):
+        """
+        Reads the list in the calling thread (errors are raised) and starts to watch it
+        """
+        self.relist()
+        self.thread = threading.Thread(target=self.run, name="informer-%s-%s" % (self.context, self.resource.kind),
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        response = self.response
+        if response is not None:
+            # ends a watch which is waiting for the next event
+            getattr(response, "shutdown", response.close)()
+        with self.condition:
+            self.condition.notify_all()
+
+    def run(self):
+        failures = 0
+        while not self.stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self.relist()
+                self.watch()
+                failures = 0
+            except ResourceVersionExpired:
+                # the changes since the list are compacted, it is read again
+                self.resource_version = None
+            except (Exception, SystemExit) as e:
+                if self.stopped.is_set():
+                    return
+                failures += 1
+                with self.condition:
+                    # queries are sent to the API server until the watch is back
+                    self.synced = False
+                    self.error = e
+                self.stopped.wait(min(MAX_BACKOFF, 0.5 * 2 ** failures))
+
+    def relist(self):
+        items = list()
+        metadata = dict()
+        page_function = functools.partial(list_page, self.api_method, None, metadata_only=self.metadata_only)
+        for page, metadata in iter_pages(page_function, self.page_size):
+            items += page
+        with self.condition:
+            self.objects = dict()
+            self.namespaces = dict()
+            self.labels = dict()
+            for item in items:
+                self.put(slim(item))
+            self.resource_version = metadata.get("resourceVersion")
+            self.synced = True
+            self.error = None
+            self.condition.notify_all()
+
+    def watch(self):
+        headers = {"Accept": accept_header(JSON, self.metadata_only, watch=True)}
+        response = start_watch(self.api_method, self.resource_version, timeout_seconds=WATCH_TIMEOUT,
+                               _request_timeout=self.watch_timeout, _headers=headers)
+        self.response = response
+        completed = False
+        try:
+            with self.condition:
+                self.synced = True
+            for event in iter_events(response):
+                if self.stopped.is_set():
+                    return
+                self.apply(event)
+            completed = True
+        finally:
+            self.response = None
+            if completed:
+                response.release_conn()
+            else:
+                response.close()
+
+    def apply(self, event: dict):
+        """
+        Applies a single watch event to the store
+        """
+        event_type = event.get("type")
+        item = event.get("object") or {}
+        with self.condition:
+            if event_type in ("ADDED", "MODIFIED"):
+                self.put(slim(item))
+            elif event_type == "DELETED":
+                self.remove(object_key(item))
+            version = (item.get("metadata") or {}).get("resourceVersion")
+            if version:
+                self.resource_version = version
+            self.condition.notify_all()
+
+    def put(self, item):
+        key = object_key(item)
+        self.remove(key)
+        self.objects[key] = item
+        self.namespaces.setdefault(key[0], set()).add(key)
+        for label in labels_of(item).items():
+            self.labels.setdefault(label, set()).add(key)
+
+    def remove(self, key):
+        item = self.objects.pop(key, None)
+        if item is None:
+            return
+        self.discard(self.namespaces, key[0], key)
+        for label in labels_of(item).items():
+            self.discard(self.labels, label, key)
+
+    @staticmethod
+    def discard(index: dict, index_key, key):
+        keys = index.get(index_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[index_key]
+
+    def key(self, namespace, name) -> tuple:
+        return ((namespace or "") if self.resource.namespaced else ""), name
+
+    def get(self, namespace, name):
+        with self.condition:
+            return self.objects.get(self.key(namespace, name))
+
+    def select(self, namespace=None, label_selector=None, field_selector=None) -> list:
+        """
+        The objects of a namespace (of all namespaces for None) which match the selectors, sorted by namespace and
+        name like the lists of the API server
+        """
+        requirements = parse_label_selector(label_selector)
+        fields = parse_field_selector(field_selector)
+        with self.condition:
+            keys = None
+            if namespace and self.resource.namespaced:
+                keys = set(self.namespaces.get(namespace, ()))
+            for key, operator, values in requirements:
+                if operator == "in":
+                    candidates = set().union(*(self.labels.get((key, i), ()) for i in values))
+                    keys = candidates if keys is None else keys & candidates
+            items = [self.objects[i] for i in sorted(self.objects if keys is None else keys)]
+        return [i for i in items if matches_labels(labels_of(i), requirements) and matches_fields(i, fields)]
+
+    def wait_for(self, namespace, name, present=True, timeout=30.0) -> bool:
+        """
+        Waits until an object exists (or is removed), returns False after the timeout
+        """
+        key = self.key(namespace, name)
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while (key in self.objects) != present:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.stopped.is_set():
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+
+class InformerCache:
+    """
+    The informers of this process keyed by context, kind, namespace and metadata_only. An informer is started on
+    first use and runs until the process ends or the kubeconfig of its context changes. A query is answered by an
+    informer of all namespaces or of full objects, too.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.informers = dict()
+        self.failures = dict()
+        self.lock = threading.Lock()
+        self.key_locks = dict()
+
+    def get(self, context, kind, namespace=None, metadata_only=False):
+        """
+        The synced informer of a kind which holds (at least) the objects of the namespace (all namespaces for None),
+        None if it is not cached
+        :param metadata_only: the caller reads the metadata of the objects only
+        """
+        if not self.enabled or context is None or kind not in informer_kinds():
+            return None
+        # from the widest to the narrowest, only the narrowest one is started
+        scopes = [(None, False)] + ([(None, True)] if metadata_only else [])
+        if namespace:
+            scopes += [(namespace, False)] + ([(namespace, True)] if metadata_only else [])
+        for scope in scopes[:-1]:
+            informer = self.informer((context, kind) + scope, start=False)
+            if informer is not None:
+                return informer
+        return self.informer((context, kind) + scopes[-1], start=True)
+
+    def informer(self, key, start):
+        context, kind, namespace, metadata_only = key
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        # informers of other kinds are not blocked by the first list of this one
+        with key_lock:
+            from lib.pool import get_api_client
+            informer = self.informers.get(key)
+            if informer is not None:
+                if informer.api_client is get_api_client(context):
+                    return informer if informer.synced else None
+                informer.stop()
+                del self.informers[key]
+            if not start or time.monotonic() - self.failures.get(key, -RETRY_FAILED) < RETRY_FAILED:
+                return None
+            try:
+                from lib.discovery import resolve_resource
+                informer = Informer(context, resolve_resource(context, kind), namespace, metadata_only).start()
+            except (Exception, SystemExit) as e:
+                self.failures[key] = time.monotonic()
+                print("Could not cache", kind, "of context", context + ":", str(e).split("\n")[0], file=sys.stderr)
+                return None
+            self.informers[key] = informer
+            return informer
+
+    def stop(self):
+        with self.lock:
+            informers = list(self.informers.values())
+            self.informers.clear()
+            self.failures.clear()
+        for informer in informers:
+            informer.stop()
+
+
+informer_cache = InformerCache()
+
+
+def enable_informers(enabled=True):
+    """
+    Called by the long running modes (daemon, shell), False stops all informers
+    """
+    informer_cache.enabled = enabled
+    if not enabled:
+        informer_cache.stop()
+
+
+def get_informer(context, kind, namespace=None, metadata_only=False) -> Informer:
+    return informer_cache.get(context, kind, namespace, metadata_only)
+
+
+def cached_fields(context, kind, paths, namespace=None, label_selector=None, field_selector=None, **options):
+    """
+    A tuple of the given field paths for every cached object of a kind like lib.fields.list_fields or None if the
+    kind is not cached, neither by an informer nor by a snapshot (see lib.snapshot)
+    :param options: further list options (see lib.fields.list_options), max_staleness is used for snapshots, the others
+    do not matter for cached objects
+    """
+    metadata_only = is_metadata_only(list(paths) + field_selector_paths(field_selector))
+    informer = get_informer(context, kind, namespace, metadata_only)
+    if informer is None:
+        # commands of separate processes may use a snapshot on disk instead
+        from lib.snapshot import snapshot_fields
+        return snapshot_fields(context, kind, paths, namespace, label_selector, field_selector, **options)
+    split_paths = [split_path(i) for i in paths]
+    return [tuple(extract(item, i) for i in split_paths)
+            for item in informer.select(namespace, label_selector, field_selector)]
+
+
+def iter_cached_fields(context, kind, api_method, paths, namespace=None, max_staleness=None, **options):
+    """
+    Same as lib.fields.iter_fields, the objects of the informer are used if the kind is cached
+    :param api_method: list method of the namespace (see lib.fields.namespaced), called if the kind is not cached
+    :param max_staleness: seconds a snapshot is used without a request (see lib.snapshot)
+    """
+    items = cached_fields(context, kind, paths, namespace, max_staleness=max_staleness, **options)
+    if items is None:
+        return iter_fields(api_method, paths, **options)
+    return iter(items)
+
+
+def list_cached(context, kind, paths, list_function, namespace=None) -> list:
+    """
+    Same as cached_fields, list_function() is called if the kind is not cached
+    """
+    items = cached_fields(context, kind, paths, namespace)
+    return list_function() if items is None else items
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
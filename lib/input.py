@@ -23,9 +23,8 @@
 #
 from abc import abstractmethod
 
-from prompt_toolkit.shortcuts import radiolist_dialog, input_dialog, yes_no_dialog, prompt
-
-"""This file contains files for user input mechanism and the usage of ALL external input libraries"""
+"""This file contains files for user input mechanism and the usage of ALL external input libraries.
+The input libraries are imported on first use only, non-interactive runs never load them."""
 
 
 class AbstractInputAdapter(object):
@@ -66,6 +65,7 @@ class PromptToolkitAdapter(AbstractInputAdapter):
     """Implementation of prompt toolkit for cross plattform integration"""
 
     def yes_no(self, title, message) -> bool:
+        from prompt_toolkit.shortcuts import yes_no_dialog
         ret = yes_no_dialog(
             title=title,
             text=message)
@@ -73,16 +73,19 @@ class PromptToolkitAdapter(AbstractInputAdapter):
         return ret
 
     def radio_list(self, title, text, options) -> str:
+        from prompt_toolkit.shortcuts import radiolist_dialog
         ret = radiolist_dialog("Select a " + title + ":", text, values=options)
         print("user selected:", ret)
         return ret
 
     def string(self, title, message) -> str:
+        from prompt_toolkit.shortcuts import input_dialog
         ret = input_dialog(title=title, text=message)
         print("user typed:", ret)
         return ret
 
     def prompt(self, message) -> str:
+        from prompt_toolkit.shortcuts import prompt
         ret = prompt(message + " ")
         return ret
 
@@ -118,11 +121,38 @@ class InquirerAdapter(AbstractInputAdapter):
         pass
 
 
+class NonInteractiveAdapter(AbstractInputAdapter):
+    """Used where nobody can answer, e.g. in daemon mode. Every missing input ends the command."""
+
+    def yes_no(self, title, message) -> bool:
+        raise SystemExit("No interactive input available to confirm: " + message)
+
+    def radio_list(self, title, text, options) -> str:
+        raise SystemExit("No interactive input available to select a " + title
+                         + " - please provide all arguments on the command line")
+
+    def string(self, title, message) -> str:
+        raise SystemExit("No interactive input available for: " + message)
+
+
+current_input_adapter = None
+
+
+def set_current_input_adapter(input_adapter):
+    """
+    Replaces the input mechanism of the whole application, None restores the default
+    """
+    global current_input_adapter
+    current_input_adapter = input_adapter
+
+
 def get_current_input_adapter() -> AbstractInputAdapter:
     """
     Application wide definition of input mechanism - important for cross-plattform support as some
     libraries are working only on some OS.
     """
+    if current_input_adapter is not None:
+        return current_input_adapter
     return PromptToolkitAdapter()
 
 
@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import threading
+
+"""Parsed kubeconfig files, shared by the whole process. Large kubeconfigs (or long KUBECONFIG lists) are parsed once
+and again only after one of the files changed, the daemon keeps them across commands."""
+
+# this is the default of kubectl and of the kubernetes library
+KUBE_CONFIG_DEFAULT_LOCATION = "~/.kube/config"
+
+
+def kube_config_paths(config_file=None) -> [str]:
+    """
+    Returns all existing kubeconfig files, by default of the KUBECONFIG env (evaluated on every call)
+    """
+    from kubernetes.config.kube_config import ENV_KUBECONFIG_PATH_SEPARATOR
+    if config_file is None:
+        config_file = os.environ.get("KUBECONFIG", KUBE_CONFIG_DEFAULT_LOCATION)
+    paths = list()
+    for i in config_file.split(ENV_KUBECONFIG_PATH_SEPARATOR):
+        if i:
+            path = os.path.expanduser(i)
+            if os.path.exists(path):
+                paths.append(path)
+    return paths
+
+
+def kube_config_fingerprint(config_file=None) -> tuple:
+    """
+    Path, modification time and size of every kubeconfig file. Any change invalidates the parsed configuration.
+    """
+    fingerprint = list()
+    for path in kube_config_paths(config_file):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+class KubeConfigCache:
+    """
+    Merged kubeconfig files keyed by their fingerprint
+    """
+
+    def __init__(self):
+        self.mergers = dict()
+        self.lock = threading.Lock()
+        self.parse_count = 0
+
+    def merger(self, config_file=None):
+        from kubernetes.config.config_exception import ConfigException
+        from kubernetes.config.kube_config import KubeConfigMerger, ENV_KUBECONFIG_PATH_SEPARATOR
+        fingerprint = kube_config_fingerprint(config_file)
+        if not fingerprint:
+            raise ConfigException("Invalid kube-config file. No configuration found.")
+        key = config_file
+        with self.lock:
+            cached = self.mergers.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+            merger = KubeConfigMerger(ENV_KUBECONFIG_PATH_SEPARATOR.join(i[0] for i in fingerprint))
+            self.parse_count += 1
+            if merger.config is None:
+                raise ConfigException("Invalid kube-config file. No configuration found.")
+            self.mergers[key] = (fingerprint, merger)
+            return merger
+
+    def loader(self, context=None, config_file=None):
+        from lib.credentials import CachingKubeConfigLoader
+        merger = self.merger(config_file)
+        return CachingKubeConfigLoader(config_dict=merger.config, active_context=context, config_base_path=None,
+                                config_persister=merger.save_changes)
+
+    def list_contexts(self, config_file=None) -> (list, dict):
+        loader = self.loader(config_file=config_file)
+        return loader.list_contexts(), loader.current_context
+
+    def new_client(self, context, config_file=None, retries=None):
+        from kubernetes import client
+        configuration = type.__call__(client.Configuration)
+        self.loader(context, config_file).load_and_set(configuration)
+        if retries is not None:
+            configuration.retries = retries
+        return client.ApiClient(configuration=configuration)
+
+    def clear(self):
+        with self.lock:
+            self.mergers.clear()
+
+
+kube_config_cache = KubeConfigCache()
+
+
+def list_kube_config_contexts(config_file=None) -> (list, dict):
+    """
+    Same as config.list_kube_config_contexts of the kubernetes library, but parses the kubeconfig only once
+    """
+    return kube_config_cache.list_contexts(config_file)
+
+
+def new_client_from_kube_config(context, config_file=None, retries=None):
+    """
+    Same as config.new_client_from_config of the kubernetes library, but parses the kubeconfig only once
+    :param retries: urllib3 retries of the connections
+    """
+    return kube_config_cache.new_client(context, config_file, retries)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
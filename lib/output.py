@@ -0,0 +1,391 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import csv
+import functools
+import io
+import json
+import sys
+import threading
+from abc import abstractmethod
+from contextlib import contextmanager, redirect_stdout
+
+from lib.fields import CHUNK_SIZE, compression_enabled, decode_stream, iter_pages
+from lib.util import ThreadLocalStream
+
+"""Output formats of the list commands. "text" is the own format of a command, "table" prints the columns the API
+server renders itself (meta.k8s.io/v1 Table, the same columns as kubectl get), so neither full objects are sent nor
+fields are extracted here. The machine readable formats write the rows of a command as they are read, page by page,
+with the context in the first column."""
+
+TEXT = "text"
+TABLE = "table"
+JSONL = "jsonl"
+CSV = "csv"
+TSV = "tsv"
+PARQUET = "parquet"
+ROW_FORMATS = [JSONL, CSV, TSV, PARQUET]
+OUTPUT_FORMATS = [TEXT, TABLE] + ROW_FORMATS
+
+# rows of a parquet file are buffered and written in groups of this size
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# older API servers (before 1.15) know the beta version of tables only
+TABLE_ACCEPT = "application/json;as=Table;v=v1;g=meta.k8s.io, application/json;as=Table;v=v1beta1;g=meta.k8s.io, " \
+               "application/json"
+
+# the object of a row is its metadata only (includeObject=Metadata is the default of the API server)
+ROW_FIELDS = ["cells", "object.metadata.namespace"]
+
+
+def table_page(api_method, compress=None, **kwargs) -> (list, list, dict):
+    """
+    Calls a list method of the kubernetes API once and returns the column definitions, the rows as (cells, namespace)
+    and the list metadata of the table
+    """
+    headers = {"Accept": TABLE_ACCEPT}
+    if compress is None:
+        compress = compression_enabled()
+    if compress:
+        headers["Accept-Encoding"] = "gzip"
+    response = api_method(_preload_content=False, _headers=headers, **kwargs)
+    document = dict()
+    try:
+        rows, metadata = decode_stream(response.stream(CHUNK_SIZE), ROW_FIELDS, items_key="rows", document=document)
+    finally:
+        response.release_conn()
+    if document.get("kind") != "Table":
+        raise SystemExit("The API server cannot render a table of this list")
+    return document.get("columnDefinitions") or list(), rows, metadata
+
+
+def iter_table(api_method, namespace_column=False, page_size=None, wire_format=None, max_staleness=None, **kwargs):
+    """
+    Yields the column names and then the cells of every row of the table of a list method, page by page. Columns of
+    a priority above 0 are left out like in kubectl get without -o wide.
+    :param namespace_column: adds the namespace of every row in the first column, e.g. for all namespaces
+    :param wire_format: ignored, tables are always sent as JSON
+    :param max_staleness: ignored, tables are not kept in snapshots
+    """
+    visible = None
+    for columns, rows, metadata in iter_pages(functools.partial(table_page, api_method), page_size, **kwargs):
+        if visible is None:
+            visible = [i for i, column in enumerate(columns) if not column.get("priority")]
+            yield (["Namespace"] if namespace_column else []) + [columns[i]["name"] for i in visible]
+        for cells, namespace in rows:
+            values = [cells[i] if i < len(cells or ()) else "" for i in visible]
+            yield ([namespace or ""] if namespace_column else []) + values
+
+
+def print_table(api_method, namespace_column=False, page_size=None, wire_format=None, **kwargs) -> int:
+    """
+    Prints the table of a list method tab separated, page by page (see iter_table). Returns the number of rows.
+    """
+    rows = iter_table(api_method, namespace_column, page_size, **kwargs)
+    header = next(rows, None)
+    if header is None:
+        return 0
+    print("\t".join(i.upper() for i in header))
+    count = 0
+    for row in rows:
+        print("\t".join(format_cell(i) for i in row))
+        count += 1
+    return count
+
+
+def format_cell(value) -> str:
+    if value is None:
+        return "<none>"
+    if isinstance(value, list):
+        return ",".join(str(i) for i in value)
+    return str(value)
+
+
+def list_kind(context, kind, args):
+    """
+    Prints the table of any kind the cluster serves, custom resources included
+    """
+    from lib.discovery import list_method, resolve_resource
+    from lib.fields import list_options
+    resource = resolve_resource(context, kind)
+    namespace = getattr(args, "namespace", None) if resource.namespaced else None
+    api_method = list_method(context, resource, namespace)
+    namespace_column = resource.namespaced and not namespace
+    if getattr(args, "output", None) in ROW_FORMATS:
+        rows = iter_table(api_method, namespace_column, **list_options(args))
+        header = next(rows, None) or list()
+        count = write_rows(args, context, [column_name(i) for i in header], rows)
+    else:
+        count = print_table(api_method, namespace_column, **list_options(args))
+    print("results:", count)
+
+
+def column_name(name) -> str:
+    """
+    "Nominated Node" -> "nominated_node"
+    """
+    return "_".join(name.lower().split())
+
+
+def text_value(value) -> str:
+    """
+    A field as text of a csv cell or a parquet string, lists and objects as JSON
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+
+class RowWriter:
+    """
+    Writes rows of field values with the given column names to a stream
+    """
+
+    def __init__(self, stream, columns):
+        self.stream = stream
+        self.columns = columns
+
+    @abstractmethod
+    def write(self, row):
+        ...
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+
+
+class JsonLinesWriter(RowWriter):
+    """
+    One JSON object per row, fields keep their JSON types
+    """
+
+    def write(self, row):
+        self.stream.write(json.dumps(dict(zip(self.columns, row)), separators=(",", ":")) + "\n")
+
+
+class DelimitedWriter(RowWriter):
+    """
+    CSV or TSV with a header line, values with delimiters or line breaks are quoted
+    """
+
+    def __init__(self, stream, columns, delimiter=","):
+        super().__init__(stream, columns)
+        self.writer = csv.writer(stream, delimiter=delimiter, lineterminator="\n")
+        self.writer.writerow(columns)
+
+    def write(self, row):
+        self.writer.writerow([text_value(i) for i in row])
+
+
+class ParquetWriter(RowWriter):
+    """
+    Parquet file with a string column per field, written in row groups. Needs the package pyarrow.
+    """
+
+    def __init__(self, stream, columns):
+        super().__init__(stream, columns)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("The output format parquet needs the package pyarrow (pip install pyarrow)")
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(i, pyarrow.string()) for i in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(PositionStream(stream), self.schema)
+        self.rows = list()
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= PARQUET_ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            data = {name: [None if row[i] is None else text_value(row[i]) for row in self.rows]
+                    for i, name in enumerate(self.columns)}
+            self.writer.write_table(self.pyarrow.Table.from_pydict(data, schema=self.schema))
+            self.rows = list()
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        self.stream.flush()
+
+
+class PositionStream(io.RawIOBase):
+    """
+    Binary stream which counts the written bytes, parquet writers ask for the position of pipes, too
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.stream.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        # the stream belongs to the caller
+        self.flush()
+        super().close()
+
+
+WRITERS = {JSONL: JsonLinesWriter, CSV: DelimitedWriter, TSV: functools.partial(DelimitedWriter, delimiter="\t"),
+           PARQUET: ParquetWriter}
+
+
+def current_stdout():
+    """
+    The stream stdout of the current thread writes to
+    """
+    if isinstance(sys.stdout, ThreadLocalStream):
+        return sys.stdout.target()
+    return sys.stdout
+
+
+def current_stderr():
+    if isinstance(sys.stderr, ThreadLocalStream):
+        return sys.stderr.target()
+    return sys.stderr
+
+
+class RowOutput:
+    """
+    Destination of the rows of a command in a machine readable format. One output is shared by the contexts of a
+    multi-context run: the writer is created with the columns of the first rows and every row is written at once.
+    """
+
+    def __init__(self, output_format, stream, file_name=None):
+        self.output_format = output_format
+        self.stream = stream
+        self.file_name = file_name
+        self.file = None
+        self.writer = None
+        self.lock = threading.Lock()
+
+    def open(self, columns) -> RowWriter:
+        with self.lock:
+            if self.writer is None:
+                self.writer = WRITERS[self.output_format](self.target(), columns)
+            return self.writer
+
+    def target(self):
+        binary = self.output_format == PARQUET
+        if self.file_name:
+            self.file = open(self.file_name, "wb") if binary else open(self.file_name, "w", newline="")
+            return self.file
+        if binary:
+            stream = getattr(self.stream, "buffer", None)
+            if stream is None:
+                raise SystemExit("The output format parquet cannot be written to this stdout, "
+                                 "please use --output-file")
+            self.stream.flush()
+            return stream
+        return self.stream
+
+    def write(self, context, columns, rows) -> int:
+        """
+        Writes the rows (field tuples) with the context in the first column, returns the number of rows
+        """
+        writer = self.open(["context"] + list(columns))
+        count = 0
+        for row in rows:
+            with self.lock:
+                writer.write([context] + list(row))
+            count += 1
+        with self.lock:
+            writer.flush()
+        return count
+
+    def close(self):
+        with self.lock:
+            try:
+                if self.writer is not None:
+                    self.writer.close()
+            finally:
+                if self.file is not None:
+                    self.file.close()
+
+    @contextmanager
+    def status_to_stderr(self):
+        """
+        Everything printed to stdout goes to stderr meanwhile, only the rows are written to stdout
+        """
+        if isinstance(sys.stdout, ThreadLocalStream):
+            with sys.stdout.redirect(current_stderr()):
+                yield
+        else:
+            with redirect_stdout(sys.stderr):
+                yield
+
+
+def open_row_output(args):
+    """
+    The output of a command line in a machine readable format (stdout or --output-file) or None for text output
+    """
+    if getattr(args, "output", None) not in ROW_FORMATS:
+        return None
+    args.row_output = RowOutput(args.output, current_stdout(), getattr(args, "output_file", None))
+    return args.row_output
+
+
+def write_rows(args, context, columns, rows) -> int:
+    """
+    Writes the rows (field tuples) of a list command in the format of --output as they are read. Returns the number
+    of rows.
+    """
+    row_output = getattr(args, "row_output", None)
+    if row_output is not None:
+        return row_output.write(context, columns, rows)
+    # the command is run without main.py, e.g. by a test
+    row_output = RowOutput(args.output, current_stdout(), getattr(args, "output_file", None))
+    try:
+        return row_output.write(context, columns, rows)
+    finally:
+        row_output.close()
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import threading
+
+from lib.kubeconfig import kube_config_fingerprint, new_client_from_kube_config
+from lib.probe import timeout_client
+from lib.retry import retry_client, transport_retries
+from lib.throttle import throttle_client
+
+"""Pool of kubernetes API clients. Every context gets its own ApiClient which is created once and shared by all
+functions and threads, so several contexts can be used at the same time without touching the global default
+configuration of the kubernetes library."""
+
+
+class ClientPool:
+    """
+    ApiClient instances keyed by context
+    """
+
+    def __init__(self, config_file=None):
+        self.config_file = config_file
+        self.clients = dict()
+        self.lock = threading.Lock()
+        self.context_locks = dict()
+
+    def get(self, context):
+        if context is None:
+            raise SystemExit("invalid empty context given")
+        # a changed kubeconfig (e.g. in daemon mode) replaces the client
+        fingerprint = kube_config_fingerprint(self.config_file)
+        cached = self.clients.get(context)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        with self.lock:
+            context_lock = self.context_locks.setdefault(context, threading.Lock())
+        # other contexts are not blocked while this client is created
+        with context_lock:
+            cached = self.clients.get(context)
+            if cached is None or cached[0] != fingerprint:
+                replaced = cached
+                cached = (fingerprint, self.create(context))
+                self.clients[context] = cached
+                # the connections and threads of the old client are not needed anymore
+                if replaced is not None:
+                    replaced[1].close()
+            return cached[1]
+
+    def create(self, context):
+        print("Loading context: ", context)
+        api_client = new_client_from_kube_config(context, self.config_file, transport_retries())
+        timeout_client(api_client, context)
+        # every retry passes the rate limiter again
+        throttle_client(api_client, context)
+        return retry_client(api_client, context)
+
+    def clear(self):
+        with self.lock:
+            clients = list(self.clients.values())
+            self.clients.clear()
+        for fingerprint, client in clients:
+            client.close()
+
+
+client_pool = ClientPool()
+
+
+def get_api_client(context):
+    """
+    Returns the shared ApiClient of a context, use it for the API classes: client.CoreV1Api(get_api_client(context))
+    """
+    return client_pool.get(context)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
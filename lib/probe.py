@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.throttle import parse_limit
+
+"""Timeouts of all API requests and a fast reachability check of contexts. Without timeouts an unreachable cluster
+blocks the first request for minutes. Timeouts are read from the environment like the rate limits, e.g.
+K8S_PYTHON_TOOLS_CONNECT_TIMEOUT="5,prod=10" waits 10 seconds for connections to the context prod."""
+
+CONNECT_TIMEOUT_ENV = "K8S_PYTHON_TOOLS_CONNECT_TIMEOUT"
+READ_TIMEOUT_ENV = "K8S_PYTHON_TOOLS_READ_TIMEOUT"
+PROBE_TIMEOUT_ENV = "K8S_PYTHON_TOOLS_PROBE_TIMEOUT"
+
+# seconds, a read timeout applies to every single read of a response and not to the whole list
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_PROBE_TIMEOUT = 0.5
+
+# each probe creates the client of its context, which may run a credential plugin
+PROBE_WORKERS = 8
+
+PROBE_PATH = "/version"
+
+
+def request_timeout(context) -> (float, float):
+    """
+    (connect, read) timeout of the requests of a context, 0 waits forever
+    """
+    connect = parse_limit(os.environ.get(CONNECT_TIMEOUT_ENV), context, DEFAULT_CONNECT_TIMEOUT)
+    read = parse_limit(os.environ.get(READ_TIMEOUT_ENV), context, DEFAULT_READ_TIMEOUT)
+    return connect or None, read or None
+
+
+def timeout_client(api_client, context):
+    """
+    Sets the timeouts of the context for every request of the given ApiClient which has no own timeout
+    """
+    rest_client = api_client.rest_client
+    request = rest_client.request
+    timeout = request_timeout(context)
+
+    def timed_request(*args, **kwargs):
+        if not kwargs.get("_request_timeout"):
+            kwargs["_request_timeout"] = timeout
+        return request(*args, **kwargs)
+
+    rest_client.request = timed_request
+    return api_client
+
+
+class ProbeResult:
+    """
+    Reachability of the API server of a context
+    """
+
+    def __init__(self, context, reachable, latency, error=""):
+        self.context = context
+        self.reachable = reachable
+        self.latency = latency
+        self.error = error
+
+    def label(self) -> str:
+        if self.reachable:
+            return "%s (%d ms)" % (self.context, self.latency * 1000)
+        return "%s (unreachable: %s)" % (self.context, self.error)
+
+
+def probe_timeout(context) -> float:
+    return parse_limit(os.environ.get(PROBE_TIMEOUT_ENV), context, DEFAULT_PROBE_TIMEOUT)
+
+
+def probe(context) -> ProbeResult:
+    """
+    Sends a single request to the API server of a context without retries and rate limit. Every HTTP response
+    below 500 counts as reachable, /version needs no permissions.
+    """
+    import urllib3
+    from lib.pool import get_api_client
+    start = time.monotonic()
+    try:
+        api_client = get_api_client(context)
+        method, url, headers, body, post_params = api_client.param_serialize(
+            "GET", PROBE_PATH, header_params={"Accept": "application/json"}, auth_settings=["BearerToken"])
+        timeout = probe_timeout(context)
+        response = api_client.rest_client.pool_manager.request(
+            method, url, headers=headers, retries=False, timeout=urllib3.Timeout(connect=timeout, read=timeout))
+    except Exception as e:
+        return ProbeResult(context, False, time.monotonic() - start, probe_error(e))
+    latency = time.monotonic() - start
+    if response.status >= 500:
+        return ProbeResult(context, False, latency, "status %d" % response.status)
+    return ProbeResult(context, True, latency)
+
+
+def probe_error(error) -> str:
+    reason = getattr(error, "reason", None) or error
+    return "%s: %s" % (type(reason).__name__, str(reason).strip().split("\n")[0])
+
+
+def probe_contexts(contexts: [str]) -> {str: ProbeResult}:
+    """
+    Probes up to PROBE_WORKERS contexts at the same time
+    """
+    if not contexts:
+        return dict()
+    with ThreadPoolExecutor(max_workers=min(len(contexts), PROBE_WORKERS)) as executor:
+        return {i.context: i for i in executor.map(probe, contexts)}
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from lib.fields import split_path, extract
+
+"""Decoder of the protobuf wire format of the API server (application/vnd.kubernetes.protobuf) for list responses.
+Like lib.fields it keeps only the requested field paths of every item, all other fields are skipped without being
+decoded. Only the fields below are known, their numbers are the ones of k8s.io/api/core/v1/generated.proto and
+k8s.io/apimachinery/pkg/apis/meta/v1/generated.proto."""
+
+CONTENT_TYPE = "application/vnd.kubernetes.protobuf"
+
+# every protobuf message of the API server starts with these bytes, followed by a runtime.Unknown message
+MAGIC = b"k8s\x00"
+
+STRING = "string"
+INT = "int"
+BOOL = "bool"
+MAP = "map"
+
+# message -> JSON field name -> (field number, type), a list type is a repeated field
+MESSAGES = {
+    "Unknown": {"typeMeta": (1, "TypeMeta"), "raw": (2, "bytes"), "contentEncoding": (3, STRING),
+                "contentType": (4, STRING)},
+    "TypeMeta": {"apiVersion": (1, STRING), "kind": (2, STRING)},
+    "ListMeta": {"selfLink": (1, STRING), "resourceVersion": (2, STRING), "continue": (3, STRING),
+                 "remainingItemCount": (4, INT)},
+    "ObjectMeta": {"name": (1, STRING), "generateName": (2, STRING), "namespace": (3, STRING), "uid": (5, STRING),
+                   "resourceVersion": (6, STRING), "generation": (7, INT), "labels": (11, MAP),
+                   "annotations": (12, MAP), "ownerReferences": (13, ["OwnerReference"]),
+                   "finalizers": (14, [STRING])},
+    "OwnerReference": {"kind": (1, STRING), "name": (3, STRING), "uid": (4, STRING), "apiVersion": (5, STRING),
+                       "controller": (6, BOOL)},
+    "Pod": {"metadata": (1, "ObjectMeta"), "spec": (2, "PodSpec"), "status": (3, "PodStatus")},
+    "PodSpec": {"serviceAccountName": (8, STRING), "nodeName": (10, STRING)},
+    "PodStatus": {"phase": (1, STRING), "message": (3, STRING), "reason": (4, STRING), "hostIP": (5, STRING),
+                  "podIP": (6, STRING), "qosClass": (9, STRING)},
+    "PersistentVolumeClaim": {"metadata": (1, "ObjectMeta"), "spec": (2, "PersistentVolumeClaimSpec"),
+                              "status": (3, "PersistentVolumeClaimStatus")},
+    "PersistentVolumeClaimSpec": {"volumeName": (3, STRING), "storageClassName": (5, STRING)},
+    "PersistentVolumeClaimStatus": {"phase": (1, STRING)},
+    "Service": {"metadata": (1, "ObjectMeta"), "spec": (2, "ServiceSpec")},
+    "ServiceSpec": {"clusterIP": (3, STRING), "type": (4, STRING), "externalName": (10, STRING)},
+    "Ingress": {"metadata": (1, "ObjectMeta"), "spec": (2, "IngressSpec")},
+    "IngressSpec": {"rules": (3, ["IngressRule"])},
+    "IngressRule": {"host": (1, STRING)},
+    "CronJob": {"metadata": (1, "ObjectMeta"), "status": (3, "CronJobStatus")},
+    "CronJobStatus": {"active": (1, ["ObjectReference"])},
+    "ObjectReference": {"kind": (1, STRING), "namespace": (2, STRING), "name": (3, STRING), "uid": (4, STRING),
+                        "apiVersion": (5, STRING)},
+    "Event": {"metadata": (1, "ObjectMeta"), "reason": (3, STRING), "message": (4, STRING), "count": (8, INT),
+              "type": (9, STRING)},
+    # all objects have their metadata in field 1
+    "Object": {"metadata": (1, "ObjectMeta")},
+}
+
+# field numbers of the entries of map fields
+MAP_ENTRY = {"key": (1, STRING), "value": (2, STRING)}
+
+
+def read_varint(data, index) -> (int, int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[index]
+        index += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, index
+        shift += 7
+
+
+def iter_fields(data, start, end):
+    """
+    Yields field number, wire type and value of every field of a message. The value of a length-delimited field is
+    the (start, end) range of its content.
+    """
+    index = start
+    while index < end:
+        key, index = read_varint(data, index)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, index = read_varint(data, index)
+        elif wire_type == 2:
+            length, index = read_varint(data, index)
+            value = (index, index + length)
+            index += length
+        elif wire_type == 1:
+            value = int.from_bytes(data[index:index + 8], "little")
+            index += 8
+        elif wire_type == 5:
+            value = int.from_bytes(data[index:index + 4], "little")
+            index += 4
+        else:
+            raise ValueError("unsupported protobuf wire type %d" % wire_type)
+        yield number, wire_type, value
+
+
+def field_tree(paths) -> dict:
+    """
+    Nested dict of the requested JSON field names, list indexes are left out. An empty dict requests the whole value.
+    """
+    tree = dict()
+    for path in paths:
+        node = tree
+        for key in path:
+            if isinstance(key, int):
+                continue
+            node = node.setdefault(key, dict())
+    return tree
+
+
+def compile_plan(message, tree, path="") -> dict:
+    """
+    Returns field number -> (name, type, plan of a message type, repeated) for the fields of the tree (all known
+    fields if the tree is empty). A plan is compiled once per response and used for all items.
+    """
+    fields = MESSAGES[message]
+    for name in tree:
+        if name not in fields:
+            raise SystemExit("Field %s%s is not supported with the protobuf wire format" % (path, name))
+    plan = dict()
+    for name, (number, field_type) in fields.items():
+        if tree and name not in tree:
+            continue
+        repeated = isinstance(field_type, list)
+        if repeated:
+            field_type = field_type[0]
+        sub_plan = None
+        if field_type in MESSAGES:
+            sub_plan = compile_plan(field_type, tree.get(name, {}), path + name + ".")
+        plan[number] = (name, field_type, sub_plan, repeated)
+    return plan
+
+
+MAP_ENTRY_PLAN = {1: ("key", STRING, None, False), 2: ("value", STRING, None, False)}
+
+
+def decode_message(data, start, end, plan: dict) -> dict:
+    """
+    Decodes the fields of a compiled plan into a dict with JSON field names, all other fields are skipped
+    """
+    result = dict()
+    index = start
+    while index < end:
+        key = data[index]
+        index += 1
+        if key & 0x80:
+            key, index = read_varint(data, index - 1)
+        wire_type = key & 7
+        if wire_type == 2:
+            length = data[index]
+            index += 1
+            if length & 0x80:
+                length, index = read_varint(data, index - 1)
+            value_end = index + length
+            entry = plan.get(key >> 3)
+            if entry is not None:
+                name, field_type, sub_plan, repeated = entry
+                if field_type == STRING:
+                    value = data[index:value_end].decode("utf-8")
+                elif sub_plan is not None:
+                    value = decode_message(data, index, value_end, sub_plan)
+                elif field_type == MAP:
+                    map_entry = decode_message(data, index, value_end, MAP_ENTRY_PLAN)
+                    result.setdefault(name, dict())[map_entry.get("key")] = map_entry.get("value")
+                    index = value_end
+                    continue
+                else:
+                    value = data[index:value_end]
+                if repeated:
+                    result.setdefault(name, list()).append(value)
+                else:
+                    result[name] = value
+            index = value_end
+        elif wire_type == 0:
+            value, index = read_varint(data, index)
+            entry = plan.get(key >> 3)
+            if entry is not None:
+                if entry[1] == BOOL:
+                    value = bool(value)
+                elif value >= 1 << 63:
+                    # int64 values are two's complement
+                    value -= 1 << 64
+                result[entry[0]] = value
+        elif wire_type == 1:
+            index += 8
+        elif wire_type == 5:
+            index += 4
+        else:
+            raise ValueError("unsupported protobuf wire type %d" % wire_type)
+    return result
+
+
+def decode_list(data, paths) -> (list, dict):
+    """
+    Decodes a protobuf list object (e.g. PodList) and returns a tuple of the given field paths for every item and the
+    list metadata, the same as lib.fields.decode_list does for JSON
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("no kubernetes protobuf message")
+    data = bytes(data)
+    unknown = decode_message(data, len(MAGIC), len(data), compile_plan("Unknown", {}))
+    kind = unknown.get("typeMeta", {}).get("kind", "")
+    item_message = kind[:-len("List")] if kind.endswith("List") else kind
+    if item_message not in MESSAGES:
+        item_message = "Object"
+
+    split_paths = [split_path(i) for i in paths]
+    item_plan = compile_plan(item_message, field_tree(split_paths))
+    metadata_plan = compile_plan("ListMeta", {})
+
+    raw = bytes(unknown.get("raw", b""))
+    items = list()
+    metadata = dict()
+    # a list message has its ListMeta in field 1 and the items in field 2
+    for number, wire_type, value in iter_fields(raw, 0, len(raw)):
+        if number == 2:
+            item = decode_message(raw, value[0], value[1], item_plan)
+            items.append(tuple(extract(item, i) for i in split_paths))
+        elif number == 1:
+            metadata = decode_message(raw, value[0], value[1], metadata_plan)
+    return items, metadata
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
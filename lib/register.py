@@ -22,26 +22,136 @@
 # under the License.
 #
 import importlib
+import json
 import os
 import pkgutil
+import sys
 
-from lib.common import AbstractCommand
+from lib.common import AbstractCommand, ArgumentConfig, CustomParameter
+from lib.util import cache_dir
 
 ACTION_MODULES = ["execute", "list", "drop"]
 
+MANIFEST_FILE = "commands.json"
+
+# input types of CustomParameter which are real python types and not DynamicArgs constants
+MANIFEST_INPUT_TYPES = {"str": str, "int": int}
+
+
+class ManifestEntry:
+    """
+    Import-free description of a single command, read from the cached command manifest.
+    """
+
+    def __init__(self, command, module, class_name, attr_config, additional_attr_config):
+        split = command.split(" ")
+        if len(split) < 2:
+            raise SystemExit("invalid command given")
+        self.command = command
+        self.subcommand = split[0]
+        self.subsubcommand = split[1]
+        self.module = module
+        self.class_name = class_name
+        self.attr_config = attr_config
+        self.additional_attr_config = additional_attr_config
+
+    def get_attr_config(self) -> ArgumentConfig:
+        return self.attr_config
+
+    def get_additional_attr_config(self) -> [CustomParameter]:
+        return self.additional_attr_config
+
+    def load_class(self) -> type:
+        """
+        Imports the module of this command (and only this one) and returns the command class
+        """
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)
+
+    @staticmethod
+    def from_command(cmd: AbstractCommand):
+        return ManifestEntry(cmd.get_command(), type(cmd).__module__, type(cmd).__name__, cmd.get_attr_config(),
+                             list(cmd.get_additional_attr_config() or ()))
+
+    @staticmethod
+    def from_dict(data: dict):
+        attr_config = ArgumentConfig()
+        for name in data["attr_config"]:
+            setattr(attr_config, name, True)
+        additional = list()
+        for param in data["additional_attr_config"]:
+            input_type = MANIFEST_INPUT_TYPES.get(param["input_type"], param["input_type"])
+            additional.append(CustomParameter(param["name"], param["help"], input_type, required=param["required"],
+                                              dependency=param["dependency"], prompt=param["prompt"],
+                                              default=param["default"], multi=param["multi"]))
+        return ManifestEntry(data["command"], data["module"], data["class"], attr_config, additional)
+
+    def to_dict(self) -> dict:
+        additional = list()
+        for param in self.additional_attr_config:
+            input_type = param.input_type
+            if isinstance(input_type, type):
+                input_type = input_type.__name__
+            additional.append({"name": param.name, "help": param.help, "input_type": input_type,
+                               "required": param.required, "dependency": param.dependency, "prompt": param.prompt,
+                               "default": param.default, "multi": param.multi})
+        return {"command": self.command, "module": self.module, "class": self.class_name,
+                "attr_config": [i for i in dir(ArgumentConfig)
+                                if not i.startswith("_") and getattr(self.attr_config, i) is True],
+                "additional_attr_config": additional}
+
 
 class Register:
     """
     This class automatically imports everything of the directories above in *lib.actions*.
+    It is the registry of all commands: the manifest is read once and every command class is instantiated at most once
+    per Register instance.
     """
 
+    def __init__(self):
+        self._entries = None
+        self._instances = dict()
+
     def all_commands(self) -> [AbstractCommand]:
-        for i in ACTION_MODULES:
-            module_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "actions", i)
-            for (module_loader, name, ispkg) in pkgutil.iter_modules([module_path]):
-                importlib.import_module('.actions.' + i + "." + name, __package__)
+        for i in self.action_module_names():
+            importlib.import_module(i)
         # the following line loads ALL known direct subclasses of AbstractCommand
-        return [cls() for cls in AbstractCommand.__subclasses__()]
+        return [self.instance_of(cls) for cls in AbstractCommand.__subclasses__()]
+
+    def instance_of(self, cls) -> AbstractCommand:
+        if cls not in self._instances:
+            self._instances[cls] = cls()
+        return self._instances[cls]
+
+    def entries(self) -> dict:
+        """
+        Returns all manifest entries keyed by (subcommand, subsubcommand)
+        """
+        if self._entries is None:
+            self._entries = {(i.subcommand, i.subsubcommand): i for i in self.load_manifest()}
+        return self._entries
+
+    def get(self, subcommand, subsubcommand) -> ManifestEntry:
+        return self.entries().get((subcommand, subsubcommand))
+
+    def command(self, subcommand, subsubcommand) -> AbstractCommand:
+        """
+        Returns the (shared) instance of a command or None. Only the module of this command is imported.
+        """
+        entry = self.get(subcommand, subsubcommand)
+        if entry is None:
+            return None
+        return self.instance_of(entry.load_class())
+
+    def action_module_names(self) -> [str]:
+        names = list()
+        for i in ACTION_MODULES:
+            for (module_loader, name, ispkg) in pkgutil.iter_modules([self.action_path(i)]):
+                names.append(__package__ + '.actions.' + i + "." + name)
+        return names
+
+    def action_path(self, action_module) -> str:
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)), "actions", action_module)
 
     def command_list(self) -> dict:
         """
@@ -49,7 +159,7 @@ class Register:
         :return:
         """
         job_dict = dict()
-        commands = self.all_commands()
+        commands = self.manifest()
         # print("Loading", len(commands), "commands")
         for abstract_cmd in commands:
             if abstract_cmd.subcommand not in job_dict.keys():
@@ -58,6 +168,68 @@ class Register:
 
         return job_dict
 
+    def manifest(self) -> [ManifestEntry]:
+        return list(self.entries().values())
+
+    def load_manifest(self) -> [ManifestEntry]:
+        """
+        Returns the description of all commands without importing their modules. The manifest is generated once by
+        importing all action modules and cached on disk until an action module changes.
+        """
+        fingerprint = self.manifest_fingerprint()
+        manifest_file = os.path.join(cache_dir(), MANIFEST_FILE)
+        try:
+            with open(manifest_file, 'r') as file:
+                data = json.load(file)
+            if data["fingerprint"] == fingerprint:
+                return [ManifestEntry.from_dict(i) for i in data["commands"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        entries = self.generate_manifest()
+        try:
+            tmp_file = manifest_file + ".%d.tmp" % os.getpid()
+            with open(tmp_file, 'w') as file:
+                json.dump({"fingerprint": fingerprint, "commands": [i.to_dict() for i in entries]}, file)
+            os.replace(tmp_file, manifest_file)
+        except OSError as e:
+            print("Could not write command manifest", manifest_file, e, file=sys.stderr)
+        return entries
+
+    def generate_manifest(self) -> [ManifestEntry]:
+        action_modules = set(self.action_module_names())
+        return [ManifestEntry.from_command(i) for i in self.all_commands() if type(i).__module__ in action_modules]
+
+    def manifest_fingerprint(self) -> list:
+        """
+        Path, modification time and size of every action module and of lib/common.py, which defines how the
+        arguments are stored in the manifest. Any change invalidates the cached manifest.
+        """
+        fingerprint = list()
+        common = os.path.join(os.path.dirname(os.path.realpath(__file__)), "common.py")
+        stat = os.stat(common)
+        fingerprint.append([common, stat.st_mtime_ns, stat.st_size])
+        for i in ACTION_MODULES:
+            path = self.action_path(i)
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".py"):
+                    stat = os.stat(os.path.join(path, name))
+                    fingerprint.append([os.path.join(path, name), stat.st_mtime_ns, stat.st_size])
+        return fingerprint
+
+
+_register = None
+
+
+def get_register() -> Register:
+    """
+    Application wide registry, built once per process
+    """
+    global _register
+    if _register is None:
+        _register = Register()
+    return _register
+
 
 def main():
     pass
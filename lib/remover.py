@@ -22,7 +22,9 @@
 # under the License.
 #
 from kubernetes import client
-from lib.common import SetType, load_kube
+from lib.common import SetType
+from lib.discovery import get_api
+from lib.pool import get_api_client
 
 # DO NOT EDIT this file manually, use "python codegen.py" in root folder to generate and change file in "templates" folder
 # Use templates/def_remove.py.j2
@@ -37,8 +39,7 @@ def remove_namespace(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Namespace given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Namespace", "CoreV1Api")
     ret, status, _ = api.delete_namespace_with_http_info(namespace)
     handle_status(ret, status, "Namespace", namespace, name)
 
@@ -51,8 +52,7 @@ def remove_deployment(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Deployment given")
 
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "Deployment", "AppsV1Api")
     ret, status, _ = api.delete_namespaced_deployment_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Deployment", namespace, name)
 
@@ -65,8 +65,7 @@ def remove_pod(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Pod given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Pod", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_pod_with_http_info(name=name, namespace=namespace)
     handle_status(ret, status, "Pod", namespace, name)
 
@@ -79,8 +78,7 @@ def remove_service(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Service given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Service", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_service_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Service", namespace, name)
 
@@ -93,8 +91,7 @@ def remove_replication_controller(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for ReplicationController given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ReplicationController", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_replication_controller_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "ReplicationController", namespace, name)
 
@@ -107,8 +104,7 @@ def remove_persistent_volume_claim(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for PersistentVolumeClaim given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PersistentVolumeClaim", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_persistent_volume_claim_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "PersistentVolumeClaim", namespace, name)
 
@@ -121,8 +117,7 @@ def remove_ingress(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Ingress given")
 
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "Ingress", "NetworkingV1Api")
     ret, status, _ = api.delete_namespaced_ingress_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Ingress", namespace, name)
 
@@ -135,8 +130,7 @@ def remove_network_policy(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for NetworkPolicy given")
 
-    load_kube(context)
-    api = client.ExtensionsV1beta1Api()
+    api = get_api(context, "NetworkPolicy", "NetworkingV1Api")
     ret, status, _ = api.delete_namespaced_network_policy_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "NetworkPolicy", namespace, name)
 
@@ -149,8 +143,7 @@ def remove_job(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Job given")
 
-    load_kube(context)
-    api = client.BatchV1Api()
+    api = get_api(context, "Job", "BatchV1Api")
     ret, status, _ = api.delete_namespaced_job_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Job", namespace, name)
 
@@ -163,8 +156,7 @@ def remove_cron_job(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for CronJob given")
 
-    load_kube(context)
-    api = client.BatchV1beta1Api()
+    api = get_api(context, "CronJob", "BatchV1Api")
     ret, status, _ = api.delete_namespaced_cron_job_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "CronJob", namespace, name)
 
@@ -177,8 +169,7 @@ def remove_config_map(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for ConfigMap given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ConfigMap", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_config_map_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "ConfigMap", namespace, name)
 
@@ -191,8 +182,7 @@ def remove_secret(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Secret given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Secret", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_secret_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Secret", namespace, name)
 
@@ -205,8 +195,7 @@ def remove_service_account(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for ServiceAccount given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ServiceAccount", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_service_account_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "ServiceAccount", namespace, name)
 
@@ -219,8 +208,7 @@ def remove_resource_quota(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for ResourceQuota given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "ResourceQuota", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_resource_quota_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "ResourceQuota", namespace, name)
 
@@ -233,8 +221,7 @@ def remove_endpoints(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Endpoints given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Endpoints", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_endpoints_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Endpoints", namespace, name)
 
@@ -247,8 +234,7 @@ def remove_pod_template(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for PodTemplate given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PodTemplate", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_pod_template_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "PodTemplate", namespace, name)
 
@@ -261,8 +247,7 @@ def remove_role_binding(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for RoleBinding given")
 
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "RoleBinding", "RbacAuthorizationV1Api")
     ret, status, _ = api.delete_namespaced_role_binding_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "RoleBinding", namespace, name)
 
@@ -275,8 +260,7 @@ def remove_role(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Role given")
 
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "Role", "RbacAuthorizationV1Api")
     ret, status, _ = api.delete_namespaced_role_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Role", namespace, name)
 
@@ -289,8 +273,7 @@ def remove_pod_disruption_budget(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for PodDisruptionBudget given")
 
-    load_kube(context)
-    api = client.PolicyV1beta1Api()
+    api = get_api(context, "PodDisruptionBudget", "PolicyV1Api")
     ret, status, _ = api.delete_namespaced_pod_disruption_budget_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "PodDisruptionBudget", namespace, name)
 
@@ -303,8 +286,7 @@ def remove_event(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Event given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Event", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_event_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Event", namespace, name)
 
@@ -317,8 +299,7 @@ def remove_lease(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for Lease given")
 
-    load_kube(context)
-    api = client.CoordinationV1beta1Api()
+    api = get_api(context, "Lease", "CoordinationV1Api")
     ret, status, _ = api.delete_namespaced_lease_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "Lease", namespace, name)
 
@@ -331,8 +312,7 @@ def remove_horizontal_pod_autoscaler(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for HorizontalPodAutoscaler given")
 
-    load_kube(context)
-    api = client.AutoscalingV1Api()
+    api = get_api(context, "HorizontalPodAutoscaler", "AutoscalingV1Api")
     ret, status, _ = api.delete_namespaced_horizontal_pod_autoscaler_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "HorizontalPodAutoscaler", namespace, name)
 
@@ -345,8 +325,7 @@ def remove_controller_revision(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for ControllerRevision given")
 
-    load_kube(context)
-    api = client.AppsV1Api()
+    api = get_api(context, "ControllerRevision", "AppsV1Api")
     ret, status, _ = api.delete_namespaced_controller_revision_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "ControllerRevision", namespace, name)
 
@@ -359,8 +338,7 @@ def remove_limit_range(context, namespace, name):
     if name is None:
         raise SystemExit("invalid empty name for LimitRange given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "LimitRange", "CoreV1Api")
     ret, status, _ = api.delete_namespaced_limit_range_with_http_info(name, namespace=namespace)
     handle_status(ret, status, "LimitRange", namespace, name)
 
@@ -371,8 +349,7 @@ def remove_cluster_role(context, name):
     if name is None:
         raise SystemExit("invalid empty name for ClusterRole given")
 
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "ClusterRole", "RbacAuthorizationV1Api")
     ret, status, _ = api.delete_cluster_role_with_http_info(name)
     handle_status(ret, status, "ClusterRole", None, name)
 
@@ -383,32 +360,18 @@ def remove_cluster_role_binding(context, name):
     if name is None:
         raise SystemExit("invalid empty name for ClusterRoleBinding given")
 
-    load_kube(context)
-    api = client.RbacAuthorizationV1Api()
+    api = get_api(context, "ClusterRoleBinding", "RbacAuthorizationV1Api")
     ret, status, _ = api.delete_cluster_role_binding_with_http_info(name)
     handle_status(ret, status, "ClusterRoleBinding", None, name)
 
 
-def remove_pod_security_policy(context, name):
-    if context is None:
-        raise SystemExit("invalid empty context for PodSecurityPolicy given")
-    if name is None:
-        raise SystemExit("invalid empty name for PodSecurityPolicy given")
-
-    load_kube(context)
-    api = client.PolicyV1beta1Api()
-    ret, status, _ = api.delete_pod_security_policy_with_http_info(name)
-    handle_status(ret, status, "PodSecurityPolicy", None, name)
-
-
 def remove_persistent_volume(context, name):
     if context is None:
         raise SystemExit("invalid empty context for PersistentVolume given")
     if name is None:
         raise SystemExit("invalid empty name for PersistentVolume given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "PersistentVolume", "CoreV1Api")
     ret, status, _ = api.delete_persistent_volume_with_http_info(name)
     handle_status(ret, status, "PersistentVolume", None, name)
 
@@ -419,8 +382,7 @@ def remove_volume_attachment(context, name):
     if name is None:
         raise SystemExit("invalid empty name for VolumeAttachment given")
 
-    load_kube(context)
-    api = client.StorageV1Api()
+    api = get_api(context, "VolumeAttachment", "StorageV1Api")
     ret, status, _ = api.delete_volume_attachment_with_http_info(name)
     handle_status(ret, status, "VolumeAttachment", None, name)
 
@@ -431,8 +393,7 @@ def remove_storage_class(context, name):
     if name is None:
         raise SystemExit("invalid empty name for StorageClass given")
 
-    load_kube(context)
-    api = client.StorageV1Api()
+    api = get_api(context, "StorageClass", "StorageV1Api")
     ret, status, _ = api.delete_storage_class_with_http_info(name)
     handle_status(ret, status, "StorageClass", None, name)
 
@@ -443,8 +404,7 @@ def remove_priority_class(context, name):
     if name is None:
         raise SystemExit("invalid empty name for PriorityClass given")
 
-    load_kube(context)
-    api = client.SchedulingV1beta1Api()
+    api = get_api(context, "PriorityClass", "SchedulingV1Api")
     ret, status, _ = api.delete_priority_class_with_http_info(name)
     handle_status(ret, status, "PriorityClass", None, name)
 
@@ -455,8 +415,7 @@ def remove_node(context, name):
     if name is None:
         raise SystemExit("invalid empty name for Node given")
 
-    load_kube(context)
-    api = client.CoreV1Api()
+    api = get_api(context, "Node", "CoreV1Api")
     ret, status, _ = api.delete_node_with_http_info(name)
     handle_status(ret, status, "Node", None, name)
 
@@ -467,8 +426,7 @@ def remove_custom_resource_definition(context, name):
     if name is None:
         raise SystemExit("invalid empty name for CustomResourceDefinition given")
 
-    load_kube(context)
-    api = client.ApiextensionsV1beta1Api()
+    api = get_api(context, "CustomResourceDefinition", "ApiextensionsV1Api")
     ret, status, _ = api.delete_custom_resource_definition_with_http_info(name)
     handle_status(ret, status, "CustomResourceDefinition", None, name)
 
@@ -479,15 +437,13 @@ def remove_certificate_signing_request(context, name):
     if name is None:
         raise SystemExit("invalid empty name for CertificateSigningRequest given")
 
-    load_kube(context)
-    api = client.CertificatesV1beta1Api()
+    api = get_api(context, "CertificateSigningRequest", "CertificatesV1Api")
     ret, status, _ = api.delete_certificate_signing_request_with_http_info(name)
     handle_status(ret, status, "CertificateSigningRequest", None, name)
 
 
 def remove_set(context, namespace, set_type: SetType, set_name: str):
-    load_kube(context)
-    api = client.AppsV1Api()
+    api = client.AppsV1Api(get_api_client(context))
     print("remove set of type", set_type, "and name", set_name, "in namespace", namespace)
 
     if not isinstance(set_type, SetType):
@@ -521,4 +477,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
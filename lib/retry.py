@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import email.utils
+import os
+import random
+import time
+
+from lib.stats import request_stats
+
+"""Central retry policy of all requests of an ApiClient. Throttling (429) and server errors (5xx) are retried with a
+jittered exponential backoff or after the time the server asks for (Retry-After). Other errors, e.g. 404, are passed
+to the caller at once."""
+
+RETRIES_ENV = "K8S_PYTHON_TOOLS_RETRIES"
+
+DEFAULT_RETRIES = 5
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# requests with these methods can be sent again after any error, others only if the server did not process them (429)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def parse_retry_after(value):
+    """
+    Returns the seconds of a Retry-After header (seconds or HTTP date) or None
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def default_retries() -> int:
+    try:
+        return int(os.environ.get(RETRIES_ENV, DEFAULT_RETRIES))
+    except ValueError:
+        raise SystemExit("invalid value of %s: %s" % (RETRIES_ENV, os.environ.get(RETRIES_ENV)))
+
+
+class RetryPolicy:
+    """
+    Decides if and when a failed request is sent again
+    """
+
+    def __init__(self, max_retries=None, base_delay=0.5, max_delay=30.0, sleep=time.sleep, rand=random.uniform):
+        if max_retries is None:
+            max_retries = default_retries()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.rand = rand
+
+    def should_retry(self, method, status, attempt) -> bool:
+        """
+        :param status: HTTP status or None for connection errors
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status == 429:
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status is None or status in RETRY_STATUS
+
+    def delay(self, attempt, retry_after=None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # "full jitter": clients which failed together do not retry together
+        return self.rand(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+retry_policy = RetryPolicy()
+
+
+def transport_retries():
+    """
+    urllib3 retries of the ApiClients: connection errors only, responses are retried by retry_client
+    """
+    from urllib3.util.retry import Retry
+    return Retry(total=3, status=0, redirect=5, respect_retry_after_header=False, raise_on_status=False)
+
+
+def response_status(response):
+    """
+    Returns status and headers of a response or an ApiException
+    """
+    headers = getattr(response, "headers", None)
+    if headers is None and hasattr(response, "getheaders"):
+        headers = response.getheaders()
+    return getattr(response, "status", None), headers or {}
+
+
+def retry_client(api_client, context, policy=None):
+    """
+    Sends failed requests of the given ApiClient again according to the retry policy
+    """
+    from urllib3.exceptions import MaxRetryError, ProtocolError, TimeoutError
+    from kubernetes.client.rest import ApiException
+    rest_client = api_client.rest_client
+    request = rest_client.request
+
+    def retrying_request(method, url, *args, **kwargs):
+        attempt = 0
+        while True:
+            current_policy = policy or retry_policy
+            try:
+                response = request(method, url, *args, **kwargs)
+                error = None
+                status, headers = response_status(response)
+            except ApiException as e:
+                response = None
+                error = e
+                status, headers = response_status(e)
+            except (MaxRetryError, ProtocolError, TimeoutError) as e:
+                response = None
+                error = e
+                status, headers = None, {}
+            if (status is not None and status < 400) or not current_policy.should_retry(method, status, attempt):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = current_policy.delay(attempt, parse_retry_after(headers.get("Retry-After")))
+            request_stats.add(context, "retries")
+            request_stats.add(context, "retry_wait_s", delay)
+            if response is not None:
+                # the (small) error body is read, so the connection can be used again
+                response.read()
+            attempt += 1
+            current_policy.sleep(delay)
+
+    rest_client.request = retrying_request
+    return api_client
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -23,8 +23,13 @@
 #
 import argparse
 import os
+import sys
+import traceback
 
-from lib.register import Register
+from lib.common import build_arguments
+from lib.fanout import FanOut, fan_out_contexts
+from lib.register import get_register
+from lib.stats import print_request_stats
 
 # this is the env key we search for to exclude mingw shells
 MSYSTEM = "MSYSTEM"
@@ -32,38 +37,94 @@ MSYSTEM = "MSYSTEM"
 
 class Runner(object):
 
-    def handle_args(self):
+    def __init__(self, register=None):
+        self.register = register if register is not None else get_register()
+
+    def handle_args(self, argv=None):
         """
-        The following lines builds up the command (line arguments) structure
+        The following lines builds up the command (line arguments) structure.
+        Only the branch of the selected subcommand (and subsubcommand) is built, the full tree is built for the
+        main help and for invalid input only.
         :return:
         """
-        reg = Register()
+        if argv is None:
+            argv = sys.argv[1:]
+        reg = self.register
         job_dict = reg.command_list()
+        selected_command, selected_subcommand = self.peek_command(argv, job_dict)
 
         # check for correct shell environment
         # basically exclude mingw shells
         if not self.check_shells():
             raise SystemExit("Please use Powershell!")
 
-        self.main_parser = argparse.ArgumentParser(add_help=True, prog="python3 main.py")
+        self.main_parser = argparse.ArgumentParser(add_help=True, prog="python3 main.py",
+                                                   epilog="further modes: shell, batch, daemon "
+                                                          "(see python3 main.py <mode> -h)")
+        self.add_main_arguments(self.main_parser)
         subparsers = self.main_parser.add_subparsers(dest="subcmd")
         self.command_parsers = dict()
         for tl_subcommand in job_dict.keys():
-            self.parse_single_command(reg, subparsers, tl_subcommand)
+            if selected_command is None or selected_command == tl_subcommand:
+                self.parse_single_command(reg, subparsers, tl_subcommand, selected_subcommand)
 
-        self.args = self.main_parser.parse_args()
+        self.args = self.main_parser.parse_args(argv)
         return self.args
 
-    def parse_single_command(self, reg, subparsers, tl_subcommand):
+    def add_main_arguments(self, parser):
+        """
+        Options of the main parser, given before the subcommand
+        """
+        parser.add_argument("--stats", action="store_true",
+                            help="print request statistics per context to stderr at the end")
+        parser.add_argument("--max-staleness", type=float, metavar="SECONDS",
+                            help="use lists of a snapshot on disk which is at most this old, older snapshots "
+                                 "are refreshed by a watch")
+
+    def peek_command(self, argv, job_dict) -> (str, str):
+        """
+        Detects subcommand and subsubcommand of the given arguments without parsing them.
+        Returns None for a part which is not (yet) known.
+        """
+        # the values of the main options are no positionals
+        peek_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+        self.add_main_arguments(peek_parser)
+        peek_parser.error = invalid_main_options
+        try:
+            argv = peek_parser.parse_known_args(argv)[1]
+        except ValueError:
+            # reported by the full parser
+            return None, None
+        positionals = list()
+        for i in argv:
+            if i.startswith("-"):
+                if not positionals and i in ("-h", "--help"):
+                    return None, None
+                continue
+            positionals.append(i)
+            if len(positionals) == 2:
+                break
+
+        if not positionals or positionals[0] not in job_dict:
+            return None, None
+        if len(positionals) < 2 or positionals[1] not in job_dict[positionals[0]]:
+            return positionals[0], None
+        return positionals[0], positionals[1]
+
+    def parse_single_command(self, reg, subparsers, tl_subcommand, selected_subcommand=None):
         command_parser = subparsers.add_parser(tl_subcommand, help=tl_subcommand + " -h")
         subsubparser = command_parser.add_subparsers(dest="subsubcmd")
         self.command_parsers[tl_subcommand] = command_parser
         subsubcommands = set()
-        for subsubcommand in reg.all_commands():
+        if selected_subcommand is not None:
+            entries = [reg.get(tl_subcommand, selected_subcommand)]
+        else:
+            entries = reg.manifest()
+        for subsubcommand in entries:
             if subsubcommand.subcommand != tl_subcommand:
                 continue
             parser = subsubparser.add_parser(subsubcommand.subsubcommand)
-            subsubcommand.build_args(subsubcommand.get_attr_config(), parser)
+            build_arguments(subsubcommand.get_attr_config(), parser)
             if subsubcommand.get_additional_attr_config() is not None \
                     and len(subsubcommand.get_additional_attr_config()) != 0:
                 for j in subsubcommand.get_additional_attr_config():
@@ -93,20 +154,75 @@ class Runner(object):
     def execute(self):
         command = self.args.subcmd
         subcommand = self.args.subsubcmd
-        is_executed = False
-
-        for cmd in Register().all_commands():
-            if cmd.subcommand == command and cmd.subsubcommand == subcommand:
-                # run the command!
-                cmd.run(self.args)
-                is_executed = True
-                break
-
-        if not is_executed:
+        cmd = self.register.command(command, subcommand)
+        if cmd is not None:
+            # run the command! only its own module is imported here
+            row_output = None
+            if getattr(self.args, "output", None):
+                from lib.output import open_row_output
+                row_output = open_row_output(self.args)
+            try:
+                if row_output is None:
+                    self.run_command(cmd)
+                else:
+                    with row_output.status_to_stderr():
+                        self.run_command(cmd)
+            finally:
+                if row_output is not None:
+                    row_output.close()
+                if self.args.stats:
+                    print_request_stats()
+        else:
             print("No valid input")
             self.main_parser.print_help()
 
+    def run_command(self, cmd):
+        contexts = fan_out_contexts(self.args)
+        if contexts is None:
+            cmd.run(self.args)
+        elif FanOut(cmd, self.args, contexts).run() != 0:
+            raise SystemExit(1)
+
     def check_shells(self) -> bool:
         if MSYSTEM in os.environ.keys() and os.environ.get(MSYSTEM) == "MINGW64":
             return False
         return True
+
+
+def invalid_main_options(message):
+    raise ValueError(message)
+
+
+def run_command_line(argv, register=None, defaults=None) -> int:
+    """
+    Runs a single command line (without the program name) in this process and returns its exit status.
+    Used by all modes which execute several commands in one process.
+    :param defaults: dict of argument values which are used if the command has such an argument and it is not given
+    """
+    runner = Runner(register)
+    try:
+        args = runner.handle_args(argv)
+        for key, value in (defaults or {}).items():
+            if value is not None and key in vars(args) and vars(args)[key] is None:
+                setattr(args, key, value)
+        runner.handle_invalid_input()
+        runner.execute()
+    except SystemExit as e:
+        return exit_status(e)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def exit_status(system_exit: SystemExit) -> int:
+    """
+    Same exit status the interpreter would use for the given SystemExit, messages are printed to stderr
+    """
+    if system_exit.code is None:
+        return 0
+    if isinstance(system_exit.code, int):
+        return system_exit.code
+    print(system_exit.code, file=sys.stderr)
+    return 1
+
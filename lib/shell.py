@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import argparse
+import shlex
+
+from lib.informer import enable_informers
+from lib.input import get_current_input_adapter
+from lib.register import get_register
+from lib.runner import run_command_line
+
+SHELL_HELP = """Commands:
+  context [NAME]      show or select the current context
+  namespace [NAME]    show or select the current namespace
+  help                show this help
+  exit, quit          leave the shell
+Every other line is executed like the arguments of main.py, e.g. "drop pod" or "list pods-by-context".
+Context and namespace are used for all commands which accept --context and --namespace."""
+
+
+class Shell:
+    """
+    Interactive REPL which executes commands in one process. Context, namespace, the command registry and the
+    kubernetes clients are kept between the commands.
+    """
+
+    def __init__(self, context=None, namespace=None, register=None):
+        self.context = context
+        self.namespace = namespace
+        self.register = register if register is not None else get_register()
+        self.running = True
+
+    def run(self) -> int:
+        input_adapter = get_current_input_adapter()
+        print("k8s-python-tools shell, type 'help' for help")
+        # frequently used kinds are listed once and watched instead of listed by every command
+        enable_informers()
+        status = 0
+        try:
+            while self.running:
+                try:
+                    line = input_adapter.prompt(self.prompt_message())
+                except KeyboardInterrupt:
+                    continue
+                except EOFError:
+                    break
+                status = self.handle_line(line)
+        finally:
+            enable_informers(False)
+        return status
+
+    def prompt_message(self) -> str:
+        return "k8s [%s/%s]>" % (self.context or "-", self.namespace or "-")
+
+    def handle_line(self, line) -> int:
+        """
+        Executes a single line of input and returns its exit status
+        """
+        try:
+            argv = shlex.split(line or "")
+        except ValueError as e:
+            print("invalid input:", e)
+            return 2
+        if not argv:
+            return 0
+
+        if argv[0] in ("exit", "quit"):
+            self.running = False
+            return 0
+        if argv[0] == "help":
+            print(SHELL_HELP)
+            return 0
+        if argv[0] == "context":
+            return self.select_context(argv[1] if len(argv) > 1 else None)
+        if argv[0] == "namespace":
+            return self.select_namespace(argv[1] if len(argv) > 1 else None)
+
+        return run_command_line(argv, self.register, {"context": self.context, "namespace": self.namespace})
+
+    def select_context(self, context) -> int:
+        try:
+            if context is None:
+                from lib.confirmer import confirm_context
+                context = confirm_context()
+            from lib.common import choose_context
+            self.context = choose_context(context)
+        except (SystemExit, Exception) as e:
+            print("Could not select", e)
+            return 1
+        # the namespace belongs to the previous context
+        self.namespace = None
+        return 0
+
+    def select_namespace(self, namespace) -> int:
+        if self.context is None and self.select_context(None) != 0:
+            return 1
+        try:
+            if namespace is None:
+                from lib.confirmer import confirm_namespace
+                namespace = confirm_namespace(self.context, show_warning=False)
+        except (SystemExit, Exception) as e:
+            print("Could not select", e)
+            return 1
+        self.namespace = namespace
+        print("Using namespace:", namespace)
+        return 0
+
+
+def run_shell(argv) -> int:
+    """
+    Entry point of "main.py shell"
+    """
+    parser = argparse.ArgumentParser(prog="python3 main.py shell",
+                                     description="interactive shell which keeps context, namespace and clients")
+    parser.add_argument("--context", "-c", type=str, help="a name of the cluster to work on")
+    parser.add_argument("--namespace", "-n", type=str, help="a namespace name")
+    args = parser.parse_args(argv)
+    return Shell(args.context, args.namespace).run()
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
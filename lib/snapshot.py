@@ -0,0 +1,238 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+
+from lib.fields import JSON, accept_header, extract, is_metadata_only, iter_pages, list_page, split_path
+from lib.informer import ResourceVersionExpired, iter_events, start_watch
+from lib.util import cache_dir
+
+"""Opt-in snapshots of list results on disk for commands which run in separate processes. A snapshot keeps the
+requested fields of every object and the resourceVersion of the list. A young snapshot is used without a request, an
+older one is brought up to date by a short watch from its resourceVersion instead of a new list."""
+
+SNAPSHOT_DIR = "snapshots"
+
+# seconds, snapshots of at most this age are used without a request, unset disables the snapshots
+MAX_STALENESS_ENV = "K8S_PYTHON_TOOLS_MAX_STALENESS"
+# seconds, older snapshots are listed again instead of refreshed
+SNAPSHOT_TTL_ENV = "K8S_PYTHON_TOOLS_SNAPSHOT_TTL"
+DEFAULT_SNAPSHOT_TTL = 600.0
+
+# seconds until the API server ends the watch which refreshes a snapshot, an upper bound only: the watch is left at
+# its first bookmark or as soon as no event is pending
+REFRESH_SECONDS = 10
+# seconds without an event after which the API server has sent all changes since the snapshot
+REFRESH_IDLE_SECONDS = 0.2
+
+# namespace and name of every row, followed by the requested fields
+KEY_PATHS = ["metadata.namespace", "metadata.name"]
+
+
+def default_max_staleness():
+    """
+    Seconds a snapshot is used without a request unless --max-staleness is given, None if snapshots are disabled
+    """
+    value = os.environ.get(MAX_STALENESS_ENV)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise SystemExit("invalid value of %s: %s" % (MAX_STALENESS_ENV, value))
+
+
+def snapshot_ttl() -> float:
+    try:
+        return float(os.environ.get(SNAPSHOT_TTL_ENV, DEFAULT_SNAPSHOT_TTL))
+    except ValueError:
+        raise SystemExit("invalid value of %s: %s" % (SNAPSHOT_TTL_ENV, os.environ.get(SNAPSHOT_TTL_ENV)))
+
+
+def row_key(row) -> tuple:
+    return row[0] or "", row[1] or ""
+
+
+def set_read_timeout(response, seconds):
+    """
+    Sets the read timeout of the rest of a streamed response and returns the previous one
+    """
+    sock = getattr(response.connection, "sock", None)
+    if sock is None:
+        return None
+    previous = sock.gettimeout()
+    sock.settimeout(seconds)
+    return previous
+
+
+class SnapshotCache:
+    """
+    Snapshots keyed by cluster, context, resource, namespace, selectors and field paths, one compressed json file
+    per snapshot
+    """
+
+    def __init__(self, path=None, clock=time.time):
+        self.path = path
+        self.clock = clock
+
+    def file_name(self, context, resource, key) -> str:
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()[:16]
+        name = "%s_%s_%s.json.gz" % (re.sub(r"[^\w.-]", "_", context), resource.name, digest)
+        return os.path.join(self.path or cache_dir(SNAPSHOT_DIR), name)
+
+    def read(self, file_name, key):
+        try:
+            with gzip.open(file_name, "rt", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            if snapshot["key"] != key or not snapshot["resourceVersion"]:
+                return None
+            return snapshot
+        except (OSError, ValueError, EOFError, KeyError, TypeError):
+            return None
+
+    def write(self, file_name, snapshot: dict):
+        tmp_file = file_name + ".%d.tmp" % os.getpid()
+        try:
+            with gzip.open(tmp_file, "wt", encoding="utf-8") as file:
+                json.dump(snapshot, file, separators=(",", ":"))
+            os.replace(tmp_file, file_name)
+        except OSError as e:
+            print("Could not write snapshot", file_name, e)
+
+    def fields(self, context, resource, paths, staleness, namespace=None, label_selector=None, field_selector=None,
+               page_size=None, wire_format=JSON, compress=None) -> [tuple]:
+        """
+        A tuple of the given field paths for every object like lib.fields.list_fields, from a snapshot which is at
+        most staleness seconds old
+        """
+        from lib.discovery import list_method
+        from lib.pool import get_api_client
+        api_method = list_method(context, resource, namespace)
+        namespace = namespace if resource.namespaced else None
+        key = [get_api_client(context).configuration.host, context, resource.group_version(), resource.name,
+               namespace, label_selector, field_selector, list(paths)]
+        file_name = self.file_name(context, resource, key)
+        selectors = {"label_selector": label_selector, "field_selector": field_selector}
+
+        now = self.clock()
+        snapshot = self.read(file_name, key)
+        if snapshot is not None and now - snapshot["refreshed"] > staleness:
+            if now - snapshot["listed"] > snapshot_ttl():
+                snapshot = None
+            else:
+                try:
+                    self.refresh(api_method, snapshot, paths, **selectors)
+                    snapshot["refreshed"] = now
+                    self.write(file_name, snapshot)
+                except ResourceVersionExpired:
+                    # the changes since the snapshot are compacted, it is listed again
+                    snapshot = None
+        if snapshot is None:
+            snapshot = self.list(api_method, key, paths, page_size, wire_format=wire_format, compress=compress,
+                                 **selectors)
+            snapshot["listed"] = snapshot["refreshed"] = now
+            self.write(file_name, snapshot)
+        return [tuple(i[len(KEY_PATHS):]) for i in snapshot["rows"]]
+
+    def list(self, api_method, key, paths, page_size=None, **kwargs) -> dict:
+        page_function = functools.partial(list_page, api_method, KEY_PATHS + list(paths))
+        rows = list()
+        metadata = dict()
+        for items, metadata in iter_pages(page_function, page_size, **kwargs):
+            rows += [list(i) for i in items]
+        return {"key": key, "resourceVersion": metadata.get("resourceVersion"), "rows": rows}
+
+    def refresh(self, api_method, snapshot: dict, paths, **selectors):
+        """
+        Applies all changes since the resourceVersion of the snapshot. The watch ends at the first bookmark or when
+        no further event arrives within REFRESH_IDLE_SECONDS, the API server sends the pending changes at once.
+        """
+        from urllib3.exceptions import ReadTimeoutError
+        all_paths = KEY_PATHS + list(paths)
+        split_paths = [split_path(i) for i in all_paths]
+        headers = {"Accept": accept_header(JSON, is_metadata_only(all_paths), watch=True)}
+        response = start_watch(api_method, snapshot["resourceVersion"], timeout_seconds=REFRESH_SECONDS,
+                               _headers=headers, **selectors)
+        read_timeout = set_read_timeout(response, REFRESH_IDLE_SECONDS)
+        rows = {row_key(i): i for i in snapshot["rows"]}
+        completed = False
+        try:
+            for event in iter_events(response):
+                item = event.get("object") or {}
+                version = (item.get("metadata") or {}).get("resourceVersion")
+                if version:
+                    snapshot["resourceVersion"] = version
+                if event.get("type") == "BOOKMARK":
+                    break
+                row = [extract(item, i) for i in split_paths]
+                if event.get("type") in ("ADDED", "MODIFIED"):
+                    rows[row_key(row)] = row
+                elif event.get("type") == "DELETED":
+                    rows.pop(row_key(row), None)
+            else:
+                completed = True
+        except ReadTimeoutError:
+            # no event is pending
+            pass
+        finally:
+            if completed:
+                set_read_timeout(response, read_timeout)
+                response.release_conn()
+            else:
+                response.close()
+        snapshot["rows"] = [rows[i] for i in sorted(rows)]
+
+
+snapshot_cache = SnapshotCache()
+
+
+def snapshot_fields(context, kind, paths, namespace=None, label_selector=None, field_selector=None,
+                    max_staleness=None, **options):
+    """
+    Field tuples of a kind from a snapshot (see SnapshotCache.fields) or None if snapshots are disabled
+    :param max_staleness: seconds a snapshot is used without a request, K8S_PYTHON_TOOLS_MAX_STALENESS for None
+    :param options: further list options (see lib.fields.list_options), page size and wire format are used for lists
+    """
+    if max_staleness is None:
+        max_staleness = default_max_staleness()
+        if max_staleness is None:
+            return None
+    from lib.discovery import core_resource, resolve_resource
+    resource = core_resource(kind) or resolve_resource(context, kind)
+    list_arguments = {i: options[i] for i in ("page_size", "wire_format", "compress") if i in options}
+    return snapshot_cache.fields(context, resource, paths, max_staleness, namespace, label_selector, field_selector,
+                                 **list_arguments)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import sys
+import threading
+
+"""Counters of the requests sent to the API servers, per context. Printed with --stats to tune rate limits,
+retries and timeouts."""
+
+
+class RequestStats:
+    """
+    Thread-safe counters keyed by context and name
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = dict()
+
+    def add(self, context, name, value=1):
+        with self.lock:
+            counters = self.counters.setdefault(context, dict())
+            counters[name] = counters.get(name, 0) + value
+
+    def get(self, context, name):
+        with self.lock:
+            return self.counters.get(context, {}).get(name, 0)
+
+    def summary(self) -> [str]:
+        with self.lock:
+            lines = list()
+            for context in sorted(self.counters, key=str):
+                values = ["%s=%s" % (name, round(value, 3) if isinstance(value, float) else value)
+                          for name, value in sorted(self.counters[context].items())]
+                lines.append("%s\t%s" % (context, " ".join(values)))
+            return lines
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+
+request_stats = RequestStats()
+
+
+def print_request_stats(file=None):
+    file = file or sys.stderr
+    print("Request statistics per context:", file=file)
+    for i in request_stats.summary():
+        print(i, file=file)
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import threading
+import time
+
+from lib.stats import request_stats
+
+"""Client-side rate limiting of all requests of an ApiClient, a token bucket per context like client-go.
+The limits are read from the environment, e.g. K8S_PYTHON_TOOLS_QPS="50,prod=5" uses 5 requests per second for the
+context prod and 50 for all others."""
+
+QPS_ENV = "K8S_PYTHON_TOOLS_QPS"
+BURST_ENV = "K8S_PYTHON_TOOLS_BURST"
+
+# same defaults as kubectl, a qps of 0 disables rate limiting
+DEFAULT_QPS = 50.0
+DEFAULT_BURST = 300
+
+
+def parse_limit(value, context, default, value_type=float):
+    """
+    Returns the limit of a context of a comma separated list of "limit" and "context=limit" entries
+    """
+    limit = default
+    for i in (value or "").split(","):
+        i = i.strip()
+        if not i:
+            continue
+        try:
+            if "=" in i:
+                name, number = i.rsplit("=", 1)
+                if name == context:
+                    return value_type(number)
+            else:
+                limit = value_type(i)
+        except ValueError:
+            raise SystemExit("Invalid rate limit '%s'" % i)
+    return limit
+
+
+class TokenBucket:
+    """
+    Allows *burst* requests at once and *qps* requests per second on average. Requests which exceed the budget reserve
+    a token in the future and wait for it.
+    """
+
+    def __init__(self, qps, burst, context=None, clock=time.monotonic, sleep=time.sleep):
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.context = context
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(self.burst)
+        self.last = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waits until it is available and returns the time waited
+        """
+        if self.qps <= 0:
+            return 0.0
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.qps)
+            self.last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.qps if self.tokens < 0 else 0.0
+        request_stats.add(self.context, "requests")
+        if wait > 0:
+            request_stats.add(self.context, "throttled")
+            request_stats.add(self.context, "throttle_wait_s", wait)
+            self.sleep(wait)
+        return wait
+
+
+rate_limiters = dict()
+rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(context) -> TokenBucket:
+    """
+    Returns the token bucket of a context, shared by all clients of this context
+    """
+    with rate_limiters_lock:
+        if context not in rate_limiters:
+            qps = parse_limit(os.environ.get(QPS_ENV), context, DEFAULT_QPS)
+            burst = parse_limit(os.environ.get(BURST_ENV), context, DEFAULT_BURST, int)
+            rate_limiters[context] = TokenBucket(qps, burst, context)
+        return rate_limiters[context]
+
+
+def throttle_client(api_client, context):
+    """
+    Wraps every request of the given ApiClient with the rate limiter of its context
+    """
+    rest_client = api_client.rest_client
+    request = rest_client.request
+    limiter = get_rate_limiter(context)
+
+    def throttled_request(*args, **kwargs):
+        limiter.acquire()
+        return request(*args, **kwargs)
+
+    rest_client.request = throttled_request
+    return api_client
+
+
+def main():
+    pass
+
+
+if __name__ == "__main__":
+    main()
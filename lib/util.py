@@ -22,8 +22,14 @@
 # under the License.
 #
 
+import io
 import os
 import shutil
+import threading
+from contextlib import contextmanager
+
+# this env key overrides the location of all on-disk caches of this tool
+CACHE_DIR_ENV = "K8S_PYTHON_TOOLS_CACHE"
 
 
 def clean_directory(folder):
@@ -37,3 +43,49 @@ def clean_directory(folder):
                 shutil.rmtree(file_path)
         except Exception as e:
             print(e)
+
+
+def cache_dir(*sub_dirs) -> str:
+    """
+    Returns (and creates) a directory below the cache folder of this tool, by default ~/.cache/k8s-python-tools
+    """
+    base = os.environ.get(CACHE_DIR_ENV)
+    if not base:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg_cache, "k8s-python-tools")
+    path = os.path.join(base, *sub_dirs)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class ThreadLocalStream(io.TextIOBase):
+    """
+    Text stream which writes to a stream of the current thread if one is set (see redirect) and to the default
+    stream otherwise. Installed as sys.stdout, it separates the output of commands running in parallel threads.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def target(self):
+        return getattr(self.local, "stream", None) or self.default
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self.target().write(data)
+
+    def flush(self):
+        self.target().flush()
+
+    @contextmanager
+    def redirect(self, stream):
+        previous = getattr(self.local, "stream", None)
+        self.local.stream = stream
+        try:
+            yield stream
+        finally:
+            self.local.stream = previous
+
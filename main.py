@@ -22,11 +22,28 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import sys
 
-from lib.runner import Runner
+from lib.daemon import is_daemon_enabled, forward_to_daemon, run_daemon
 
 
 def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] == "daemon":
+        raise SystemExit(run_daemon(argv[1:]))
+    if argv and argv[0] == "batch":
+        from lib.batch import run_batch
+        raise SystemExit(run_batch(argv[1:]))
+    if argv and argv[0] == "shell":
+        from lib.shell import run_shell
+        raise SystemExit(run_shell(argv[1:]))
+    if is_daemon_enabled():
+        status = forward_to_daemon(argv)
+        if status is not None:
+            raise SystemExit(status)
+        print("No daemon is running, executing command in this process", file=sys.stderr)
+
+    from lib.runner import Runner
     runner = Runner()
     runner.handle_args()
     runner.handle_invalid_input()
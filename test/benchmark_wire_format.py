@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import sys
+import time
+
+from lib.actions.list.pods_by_context import POD_FIELDS
+from lib.fields import decode_list as decode_json_list
+from lib.protobuf import decode_list as decode_protobuf_list
+from test.wire_fixtures import pod_list_fixtures
+
+"""Compares size and decoding time of pod lists in JSON and protobuf wire format.
+Usage: python -m test.benchmark_wire_format [number of pods ...]"""
+
+
+def measure(function, repeat=3) -> float:
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main(argv):
+    counts = [int(i) for i in argv] or [10000, 50000]
+    print("pods\tformat\tsize MB\tdecode s")
+    for count in counts:
+        json_data, protobuf_data = pod_list_fixtures(count)
+        json_time = measure(lambda: decode_json_list(json_data, POD_FIELDS))
+        protobuf_time = measure(lambda: decode_protobuf_list(protobuf_data, POD_FIELDS))
+        print("%d\tjson\t%.1f\t%.3f" % (count, len(json_data) / 1e6, json_time))
+        print("%d\tprotobuf\t%.1f\t%.3f" % (count, len(protobuf_data) / 1e6, protobuf_time))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import time
+
+import pytest
+
+from lib.util import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """every test gets its own cache folder, the user's ~/.cache is never touched"""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache))
+    return cache
+
+
+KUBE_CONFIG = """apiVersion: v1
+kind: Config
+current-context: alpha
+clusters:
+- name: alpha
+  cluster:
+    server: http://127.0.0.1:1
+- name: beta
+  cluster:
+    server: http://127.0.0.1:2
+contexts:
+- name: alpha
+  context:
+    cluster: alpha
+    user: alpha
+- name: beta
+  context:
+    cluster: beta
+    user: beta
+users:
+- name: alpha
+  user:
+    token: alpha-token
+- name: beta
+  user:
+    token: beta-token
+"""
+
+
+def wait_until(condition, timeout=5.0) -> bool:
+    """waits for a condition which another thread fulfills, False after the timeout"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def write_kube_config(path, servers: dict):
+    """writes a kubeconfig with one context per server url, named like the key, the first one is the current"""
+    path.write_text("apiVersion: v1\nkind: Config\ncurrent-context: %s\n" % next(iter(servers))
+                    + "clusters:\n" + "".join("- name: %s\n  cluster:\n    server: %s\n" % i for i in servers.items())
+                    + "contexts:\n" + "".join("- name: %s\n  context:\n    cluster: %s\n    user: user\n" % (i, i)
+                                              for i in servers)
+                    + "users:\n- name: user\n  user:\n    token: token\n")
+    return str(path)
+
+
+@pytest.fixture
+def kube_config(tmp_path):
+    """path of a kubeconfig with the two contexts alpha and beta"""
+    path = tmp_path / "kubeconfig"
+    path.write_text(KUBE_CONFIG)
+    return str(path)
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    """local fake API server, used by get_api_client for the context "fake" """
+    import lib.discovery
+    import lib.pool
+    from lib.discovery import DiscoveryCache
+    from lib.pool import ClientPool
+    from test.fake_api import FakeApiServer
+    server = FakeApiServer().start()
+    path = tmp_path / "fake-kubeconfig"
+    path.write_text(server.kube_config())
+    server.kube_config_file = str(path)
+    server.pool = ClientPool(str(path))
+    monkeypatch.setattr(lib.pool, "client_pool", server.pool)
+    monkeypatch.setattr(lib.discovery, "discovery_cache", DiscoveryCache())
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def discovered_fake_api(fake_api):
+    """fake API server which answers the (legacy) discovery of the core group and of the API groups apps and
+    networking.k8s.io"""
+    from test.fake_api import CORE, GROUPS, RESOURCES
+    fake_api.add("/api", CORE)
+    fake_api.add("/apis", GROUPS)
+    for path, body in RESOURCES.items():
+        fake_api.add(path, body)
+    return fake_api
@@ -0,0 +1,249 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import json
+import queue
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+"""Local stand-in for a Kubernetes API server. Tests register the responses of a path, every request is recorded.
+The builders below create the bodies of typical responses."""
+
+# discovery of the core group, two API groups and their resources (see the discovered_fake_api fixture)
+CORE = {"kind": "APIVersions", "versions": ["v1"]}
+
+GROUPS = {"kind": "APIGroupList", "groups": [
+    {"name": "apps", "versions": [{"groupVersion": "apps/v1", "version": "v1"}],
+     "preferredVersion": {"groupVersion": "apps/v1", "version": "v1"}},
+    {"name": "networking.k8s.io", "versions": [{"groupVersion": "networking.k8s.io/v1beta1", "version": "v1beta1"},
+                                               {"groupVersion": "networking.k8s.io/v1", "version": "v1"}],
+     "preferredVersion": {"groupVersion": "networking.k8s.io/v1", "version": "v1"}},
+]}
+
+RESOURCES = {
+    "/api/v1": {"resources": [{"name": "pods", "kind": "Pod", "namespaced": True},
+                              {"name": "pods/log", "kind": "Pod", "namespaced": True},
+                              {"name": "nodes", "kind": "Node", "namespaced": False}]},
+    "/apis/apps/v1": {"resources": [{"name": "deployments", "kind": "Deployment", "namespaced": True}]},
+    "/apis/networking.k8s.io/v1": {"resources": [{"name": "ingresses", "kind": "Ingress", "namespaced": True}]},
+    "/apis/networking.k8s.io/v1beta1": {"resources": [{"name": "ingresses", "kind": "Ingress", "namespaced": True}]},
+}
+
+TABLE_COLUMNS = [{"name": "Name", "type": "string", "priority": 0},
+                 {"name": "Ready", "type": "string", "priority": 0},
+                 {"name": "IP", "type": "string", "priority": 1}, {"name": "Age", "type": "string", "priority": 0}]
+
+
+def table(rows, token=None) -> dict:
+    """server-side table (as=Table) with the TABLE_COLUMNS, rows are (namespace, cells)"""
+    metadata = {"resourceVersion": "42"}
+    if token:
+        metadata["continue"] = token
+    return {"kind": "Table", "apiVersion": "meta.k8s.io/v1", "metadata": metadata, "columnDefinitions": TABLE_COLUMNS,
+            "rows": [{"cells": cells, "object": {"kind": "PartialObjectMetadata",
+                                                 "metadata": {"name": cells[0], "namespace": namespace}}}
+                     for namespace, cells in rows]}
+
+
+def page(names, token=None) -> dict:
+    """page of a paged pod list"""
+    metadata = {"resourceVersion": "42"}
+    if token:
+        metadata["continue"] = token
+    return {"kind": "PodList", "metadata": metadata,
+            "items": [{"metadata": {"name": i, "namespace": "test"}, "status": {"podIP": "10.0.0.1"}} for i in names]}
+
+
+def pod(name, namespace="test", version="1", labels=None) -> dict:
+    """pod as sent by a list or a watch"""
+    return {"metadata": {"name": name, "namespace": namespace, "resourceVersion": version, "labels": labels or {},
+                         "managedFields": [{"manager": "kubectl"}]},
+            "status": {"podIP": "10.0.0.1"}}
+
+
+def pod_list(pods, version="10") -> dict:
+    return {"kind": "PodList", "metadata": {"resourceVersion": version}, "items": pods}
+
+
+class FakeResponse:
+
+    def __init__(self, body=None, status=200, headers=None):
+        self.body = body
+        self.status = status
+        self.headers = headers or dict()
+
+    def encoded_body(self) -> bytes:
+        if self.body is None:
+            return b""
+        if isinstance(self.body, bytes):
+            return self.body
+        if isinstance(self.body, str):
+            return self.body.encode("utf-8")
+        return json.dumps(self.body).encode("utf-8")
+
+
+class FakeRequest:
+
+    def __init__(self, method, path, query, headers):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+
+
+class FakeWatch:
+    """
+    Response of a list path which can be watched: lists get the list object, a watch (watch=true) gets the events
+    added by emit as a chunked stream of lines until the watch is closed
+    """
+
+    def __init__(self, list_body):
+        self.list_body = list_body
+        self.events = queue.Queue()
+
+    def emit(self, event_type, obj):
+        self.events.put({"type": event_type, "object": obj})
+
+    def close(self):
+        self.events.put(None)
+
+    def __call__(self, handler, request):
+        if "watch=true" not in request.query:
+            handler.send(FakeResponse(self.list_body))
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            data = json.dumps(event).encode("utf-8") + b"\n"
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            handler.wfile.flush()
+        handler.wfile.write(b"0\r\n\r\n")
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle_request(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        request = FakeRequest(self.command, url.path, url.query, dict(self.headers))
+        self.server.requests.append(request)
+        response = self.server.response(request)
+        if callable(response):
+            response(self, request)
+            return
+        self.send(response)
+
+    def send(self, response: FakeResponse):
+        body = response.encoded_body()
+        self.send_response(response.status)
+        headers = dict(response.headers)
+        headers.setdefault("Content-Type", "application/json")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeApiHandler)
+        self.routes = dict()
+        self.requests = list()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def add(self, path, body=None, status=200, headers=None, method="GET"):
+        """
+        Adds a response of a path, responses are sent in the given order and the last one is repeated.
+        A function (handler, request) as body writes the response itself.
+        """
+        response = body if callable(body) else FakeResponse(body, status, headers)
+        self.routes.setdefault((method, path), list()).append(response)
+
+    def response(self, request):
+        with self.lock:
+            responses = self.routes.get((request.method, request.path))
+            if not responses:
+                return FakeResponse({"kind": "Status", "code": 404, "reason": "NotFound"}, 404)
+            if len(responses) > 1:
+                return responses.pop(0)
+            return responses[0]
+
+    def handle_error(self, request, client_address):
+        # a client which gave up after its timeout is no error of the server
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def requests_of(self, path) -> [FakeRequest]:
+        return [i for i in self.requests if i.path == path]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def kube_config(self, context="fake") -> str:
+        return """apiVersion: v1
+kind: Config
+current-context: {0}
+clusters:
+- name: {0}
+  cluster:
+    server: {1}
+contexts:
+- name: {0}
+  context:
+    cluster: {0}
+    user: {0}
+users:
+- name: {0}
+  user:
+    token: fake-token
+""".format(context, self.url)
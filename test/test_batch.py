@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import io
+
+from lib.actions.execute.exec_pod import ExecPod
+import lib.input
+from lib.batch import Batch, read_batch_file
+from lib.input import NonInteractiveAdapter, set_current_input_adapter
+from lib.register import Register
+
+
+class TestBatch:
+
+    def test_batch_file_formats(self):
+        lines = read_batch_file(io.StringIO('# comment\n\n'
+                                            'drop pod -c ctx -n "my ns" -p a\n'
+                                            '["list", "pods-by-context", "-c", "ctx"]\n'
+                                            '{"argv": ["execute", "pod"]}\n'))
+        assert [i.number for i in lines] == [3, 4, 5]
+        assert [i.argv for i in lines] == [["drop", "pod", "-c", "ctx", "-n", "my ns", "-p", "a"],
+                                           ["list", "pods-by-context", "-c", "ctx"],
+                                           ["execute", "pod"]]
+
+    def test_parallel_batch_reports_status_per_line(self, monkeypatch, capsys):
+        executed = list()
+
+        def run(cmd, args):
+            print("running", args.pod)
+            executed.append(args.pod)
+
+        monkeypatch.setattr(ExecPod, "run", run)
+        lines = read_batch_file(io.StringIO("execute pod -c ctx -n ns -p first\n"
+                                            "execute unknown\n"
+                                            "execute pod -c ctx -n ns -p second\n"))
+
+        assert Batch(lines, parallel=2, register=Register()).run() == 1
+
+        assert sorted(executed) == ["first", "second"]
+        assert [i.status for i in lines] == [0, 2, 0]
+        output = capsys.readouterr().out
+        assert output.index("running first") < output.index("running second")
+        assert "1 of 3 command lines failed" in output
+
+    def test_previous_input_adapter_is_restored(self, monkeypatch):
+        adapters = list()
+        monkeypatch.setattr(ExecPod, "run", lambda cmd, args: adapters.append(lib.input.current_input_adapter))
+        shell_adapter = object()
+        set_current_input_adapter(shell_adapter)
+        try:
+            Batch(read_batch_file(io.StringIO("execute pod -c ctx -n ns -p a\n")), register=Register()).run()
+            assert isinstance(adapters[0], NonInteractiveAdapter)
+            assert lib.input.current_input_adapter is shell_adapter
+        finally:
+            set_current_input_adapter(None)
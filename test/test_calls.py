@@ -21,7 +21,15 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import collections
+import os
+import sys
+
+from lib.actions.execute.exec_pod import ExecPod
+from lib.common import AbstractCommand
 from lib.register import Register
+from lib import runner as runner_module
+from lib.runner import Runner
 
 class TestCalls:
 
@@ -33,3 +41,65 @@ class TestCalls:
             assert i.subcommand != None
             assert i.subsubcommand != None
 
+    def test_manifest_describes_all_commands(self, isolated_cache_dir):
+        generated = Register().manifest()
+        assert (isolated_cache_dir / "commands.json").is_file()
+        cached = Register().manifest()
+
+        assert [i.to_dict() for i in cached] == [i.to_dict() for i in generated]
+        assert sorted(i.command for i in cached) == sorted(i.get_command() for i in Register().all_commands())
+        for i in cached:
+            assert Register().command(i.subcommand, i.subsubcommand).get_command() == i.command
+
+    def test_manifest_fingerprint_covers_argument_definitions(self):
+        paths = [i[0] for i in Register().manifest_fingerprint()]
+        assert any(i.endswith(os.path.join("lib", "common.py")) for i in paths)
+
+    def test_startup_constructs_each_command_at_most_once(self, monkeypatch):
+        constructed = collections.Counter()
+        executed = list()
+        original_init = AbstractCommand.__init__
+
+        def counting_init(cmd):
+            constructed[type(cmd)] += 1
+            original_init(cmd)
+
+        monkeypatch.setattr(AbstractCommand, "__init__", counting_init)
+        monkeypatch.setattr(ExecPod, "run", lambda cmd, args: executed.append(args))
+        monkeypatch.setattr(sys, "argv", ["main.py", "execute", "pod", "-c", "ctx", "-n", "ns", "-p", "a-pod"])
+
+        # the cache folder is empty, so the manifest is generated from all commands, too
+        runner = Runner(Register())
+        runner.handle_args()
+        runner.handle_invalid_input()
+        runner.execute()
+
+        assert len(executed) == 1 and executed[0].pod == "a-pod"
+        assert len(constructed) > 1
+        assert max(constructed.values()) == 1
+
+    def test_parser_is_built_for_selected_command_only(self, monkeypatch):
+        built = list()
+        original_build_arguments = runner_module.build_arguments
+
+        def counting_build_arguments(argument_config, parser):
+            built.append(parser.prog)
+            original_build_arguments(argument_config, parser)
+
+        monkeypatch.setattr(runner_module, "build_arguments", counting_build_arguments)
+
+        args = Runner(Register()).handle_args(["drop", "pod", "-c", "ctx", "-n", "ns", "-p", "a-pod"])
+        assert built == ["python3 main.py drop pod"]
+        assert (args.subcmd, args.subsubcmd, args.context, args.namespace, args.pod) == \
+               ("drop", "pod", "ctx", "ns", "a-pod")
+
+        # values of main options are no commands
+        built.clear()
+        args = Runner(Register()).handle_args(["--max-staleness", "30", "--stats", "drop", "pod", "-c", "ctx"])
+        assert built == ["python3 main.py drop pod"]
+        assert (args.max_staleness, args.stats, args.subsubcmd) == (30.0, True, "pod")
+
+        built.clear()
+        Runner(Register()).handle_args(["list"])
+        assert len(built) == len(Register().command_list()["list"])
+
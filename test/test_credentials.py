@@ -0,0 +1,118 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import stat
+import sys
+
+import pytest
+
+from lib.credentials import CredentialCache, CachingKubeConfigLoader
+from lib.kubeconfig import KubeConfigCache
+
+FAKE_PLUGIN = """import datetime, json, sys
+with open(sys.argv[1], "a") as file:
+    file.write("x")
+expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=int(sys.argv[2]))
+print(json.dumps({"apiVersion": "client.authentication.k8s.io/v1beta1", "kind": "ExecCredential",
+                  "status": {"token": "plugin-token", "expirationTimestamp": expiry.strftime("%Y-%m-%dT%H:%M:%SZ")}}))
+"""
+
+EXEC_KUBE_CONFIG = """apiVersion: v1
+kind: Config
+current-context: eks
+clusters:
+- name: eks
+  cluster:
+    server: http://127.0.0.1:1
+contexts:
+- name: eks
+  context:
+    cluster: eks
+    user: eks
+users:
+- name: eks
+  user:
+    exec:
+      apiVersion: client.authentication.k8s.io/v1beta1
+      command: {python}
+      args: [{plugin}, {counter}, "{lifetime}"]
+"""
+
+
+@pytest.fixture
+def exec_kube_config(tmp_path, monkeypatch):
+    """writes a kubeconfig with a fake exec plugin, returns a function which creates a client and the invocation
+    counter of the plugin"""
+    plugin = tmp_path / "plugin.py"
+    plugin.write_text(FAKE_PLUGIN)
+    counter = tmp_path / "invocations"
+    counter.write_text("")
+    monkeypatch.setattr(CachingKubeConfigLoader, "credential_cache", CredentialCache(str(tmp_path / "credentials")))
+
+    def write(lifetime):
+        path = tmp_path / "kubeconfig"
+        path.write_text(EXEC_KUBE_CONFIG.format(python=sys.executable, plugin=plugin, counter=counter,
+                                                lifetime=lifetime))
+        return str(path)
+
+    return write, lambda: len(counter.read_text())
+
+
+class TestCredentialCache:
+
+    def test_plugin_runs_once_until_expiry(self, exec_kube_config, tmp_path):
+        write, invocations = exec_kube_config
+        kube_config = write(3600)
+        for i in range(3):
+            # every new cache is a new run of this tool
+            api_client = KubeConfigCache().new_client("eks", kube_config)
+            assert list(api_client.configuration.api_key.values()) == ["Bearer plugin-token"]
+        assert invocations() == 1
+
+        files = os.listdir(str(tmp_path / "credentials"))
+        assert len(files) == 1
+        assert stat.S_IMODE(os.stat(str(tmp_path / "credentials" / files[0])).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(str(tmp_path / "credentials")).st_mode) == 0o700
+
+    def test_expired_credentials_are_not_used(self, exec_kube_config):
+        write, invocations = exec_kube_config
+        kube_config = write(30)
+        KubeConfigCache().new_client("eks", kube_config)
+        KubeConfigCache().new_client("eks", kube_config)
+        assert invocations() == 2
+
+    def test_files_readable_by_others_are_ignored(self, tmp_path):
+        cache = CredentialCache(str(tmp_path))
+        status = {"token": "t", "expirationTimestamp": "2999-01-01T00:00:00Z"}
+        cache.put("key", status)
+        assert cache.get("key") == status
+
+        os.chmod(str(tmp_path / "key.json"), 0o644)
+        assert cache.get("key") is None
+
+    def test_credentials_without_expiry_are_not_written(self, tmp_path):
+        cache = CredentialCache(str(tmp_path))
+        cache.put("key", {"token": "t"})
+        assert cache.get("key") is None
+        assert os.listdir(str(tmp_path)) == []
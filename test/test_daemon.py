@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import io
+import threading
+
+from lib.daemon import Daemon, command_environment, forward_command, forward_to_daemon
+from lib.input import set_current_input_adapter
+
+
+class TestDaemon:
+
+    def test_forwarded_commands_stream_output_and_exit_status(self, tmp_path):
+        socket_path = str(tmp_path / "daemon.sock")
+        daemon = Daemon(socket_path)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        try:
+            stdout, stderr = io.StringIO(), io.StringIO()
+            status = forward_command(socket_path, {"argv": ["list", "-h"], "cwd": str(tmp_path),
+                                                   "env": command_environment()}, stdout, stderr)
+            assert status == 0
+            assert "usage: python3 main.py list" in stdout.getvalue()
+
+            stdout, stderr = io.StringIO(), io.StringIO()
+            status = forward_command(socket_path, {"argv": ["unknown"], "env": command_environment()}, stdout,
+                                     stderr)
+            assert status == 2
+            assert "invalid choice" in stderr.getvalue()
+
+            # the client sends its own environment, a different one is refused
+            stdout, stderr = io.StringIO(), io.StringIO()
+            request = {"argv": ["list", "-h"], "env": dict(command_environment(), KUBECONFIG="/other/config",
+                                                           K8S_PYTHON_TOOLS_RETRIES="0")}
+            assert forward_command(socket_path, request, stdout, stderr) == 1
+            assert "other values of K8S_PYTHON_TOOLS_RETRIES, KUBECONFIG" in stderr.getvalue()
+            assert stdout.getvalue() == ""
+
+            assert forward_command(socket_path, {"command": "stop"}) == 0
+            thread.join(5)
+            assert not thread.is_alive()
+        finally:
+            daemon.shutdown()
+            daemon.server_close()
+            set_current_input_adapter(None)
+
+    def test_client_without_daemon(self, tmp_path):
+        assert forward_to_daemon(["list", "-h"], str(tmp_path / "missing.sock")) is None
@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import pytest
+
+import lib.discovery
+from lib.confirmer import confirm_deployment
+from lib.discovery import DiscoveryCache, Resource, get_api, resolve_resource, TTL_ENV
+from lib.input import set_current_input_adapter
+from lib.pool import get_api_client
+from test.test_fields import SelectFirst
+
+AGGREGATED_CORE = {"kind": "APIGroupDiscoveryList", "items": [{"metadata": {}, "versions": [{"version": "v1", "resources": [
+    {"resource": "pods", "responseKind": {"group": "", "version": "v1", "kind": "Pod"}, "scope": "Namespaced"}]}]}]}
+
+AGGREGATED_GROUPS = {"kind": "APIGroupDiscoveryList", "items": [
+    {"metadata": {"name": "batch"}, "versions": [
+        {"version": "v1", "resources": [
+            {"resource": "cronjobs", "responseKind": {"group": "batch", "version": "v1", "kind": "CronJob"},
+             "scope": "Namespaced"}]},
+        {"version": "v1beta1", "resources": [
+            {"resource": "cronjobs", "responseKind": {"group": "batch", "version": "v1beta1", "kind": "CronJob"},
+             "scope": "Namespaced"}]}]}]}
+
+
+def discovery_requests(fake_api) -> [str]:
+    return [i.path for i in fake_api.requests if i.path == "/api" or i.path.startswith("/apis")
+            or i.path == "/api/v1"]
+
+
+class TestDiscovery:
+
+    def test_preferred_version_is_resolved(self, discovered_fake_api):
+        resource = resolve_resource("fake", "Ingress")
+        assert resource.group_version() == "networking.k8s.io/v1"
+        assert resource.path() == "/apis/networking.k8s.io/v1/ingresses"
+        assert resource.api_class_name() == "NetworkingV1Api"
+        assert resolve_resource("fake", "Node").path() == "/api/v1/nodes"
+        assert not resolve_resource("fake", "Node").namespaced
+        with pytest.raises(SystemExit):
+            resolve_resource("fake", "PodSecurityPolicy")
+
+    def test_discovery_is_cached_on_disk(self, discovered_fake_api, monkeypatch):
+        assert type(get_api("fake", "Deployment", "ExtensionsV1beta1Api")).__name__ == "AppsV1Api"
+        assert len(discovery_requests(discovered_fake_api)) == 6
+
+        # a new process reads the cached file
+        cache = DiscoveryCache()
+        monkeypatch.setattr(lib.discovery, "discovery_cache", cache)
+        assert cache.resolve(get_api_client("fake"), "Deployment")[0].group_version() == "apps/v1"
+        assert len(discovery_requests(discovered_fake_api)) == 6
+
+    def test_expired_discovery_is_refreshed(self, discovered_fake_api, monkeypatch):
+        now = [1000.0]
+        cache = DiscoveryCache(clock=lambda: now[0])
+        cache.resolve(get_api_client("fake"), "Pod")
+        now[0] += 60
+        cache.resolve(get_api_client("fake"), "Pod")
+        assert len(discovery_requests(discovered_fake_api)) == 6
+        monkeypatch.setenv(TTL_ENV, "30")
+        DiscoveryCache(clock=lambda: now[0]).resolve(get_api_client("fake"), "Pod")
+        assert len(discovery_requests(discovered_fake_api)) == 12
+
+    def test_aggregated_discovery(self, fake_api):
+        fake_api.add("/api", AGGREGATED_CORE)
+        fake_api.add("/apis", AGGREGATED_GROUPS)
+        assert [i.group_version() for i in lib.discovery.discovery_cache.resolve(get_api_client("fake"), "CronJob")] \
+            == ["batch/v1", "batch/v1beta1"]
+        assert "as=APIGroupDiscoveryList" in fake_api.requests[0].headers["Accept"]
+        assert discovery_requests(fake_api) == ["/api", "/apis"]
+
+    def test_core_kinds_need_no_discovery(self, fake_api):
+        assert type(get_api("fake", "Pod", "CoreV1Api")).__name__ == "CoreV1Api"
+        assert fake_api.requests == []
+
+    def test_generated_functions_use_discovered_version(self, discovered_fake_api):
+        discovered_fake_api.add("/apis/apps/v1/namespaces/test/deployments",
+                                {"kind": "DeploymentList", "items": [{"metadata": {"name": "web"}}]})
+        adapter = SelectFirst()
+        set_current_input_adapter(adapter)
+        try:
+            assert confirm_deployment("fake", "test") == "web"
+        finally:
+            set_current_input_adapter(None)
+        assert adapter.options == ["web"]
+
+    def test_api_class_names(self):
+        assert Resource("X", "rbac.authorization.k8s.io", "v1", "x", True).api_class_name() == "RbacAuthorizationV1Api"
+        assert Resource("X", "policy", "v1beta1", "x", True).api_class_name() == "PolicyV1beta1Api"
+        assert Resource("X", "", "v1", "x", True).api_class_name() == "CoreV1Api"
@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import io
+import sys
+import time
+from argparse import Namespace
+
+import pytest
+
+import lib.discovery
+import lib.pool
+from lib.discovery import DiscoveryCache
+from lib.fanout import FanOut
+from lib.pool import ClientPool
+from lib.probe import ProbeResult
+from lib.runner import run_command_line
+from test.conftest import wait_until, write_kube_config
+from test.fake_api import FakeApiServer, FakeResponse
+from test.test_fields import POD_LIST
+
+CLUSTERS = ["fast", "slow", "broken"]
+
+
+def slow_pod_list(http, request):
+    time.sleep(0.5)
+    http.send(FakeResponse(POD_LIST))
+
+
+@pytest.fixture
+def clusters(tmp_path, monkeypatch):
+    """one fake API server per context"""
+    servers = {i: FakeApiServer().start() for i in CLUSTERS}
+    servers["fast"].add("/api/v1/pods", POD_LIST)
+    servers["slow"].add("/api/v1/pods", slow_pod_list)
+    servers["broken"].add("/api/v1/pods", {"kind": "Status", "code": 403}, status=403)
+    path = write_kube_config(tmp_path / "kubeconfig", {name: server.url for name, server in servers.items()})
+    monkeypatch.setattr(lib.pool, "client_pool", ClientPool(path))
+    monkeypatch.setattr(lib.discovery, "discovery_cache", DiscoveryCache())
+    yield servers
+    for server in servers.values():
+        server.stop()
+
+
+class TestFanOut:
+
+    def test_all_contexts_are_queried_at_once(self, clusters, capsys):
+        status = run_command_line(["list", "pods-by-context", "--all-contexts"])
+        captured = capsys.readouterr()
+        assert status == 1
+        out = captured.out.splitlines()
+        assert "fast\t10.0.0.1\ttest\tcache-0\tStatefulSet(cache)\t" in out
+        assert "slow\t10.0.0.1\ttest\tcache-0\tStatefulSet(cache)\t" in out
+        # the slow cluster does not hold back the output of the others
+        assert out.index("fast\tresults: 2") < out.index("slow\tresults: 2")
+        summary = captured.err.splitlines()
+        assert summary[0] == "Context\tStatus\tSeconds\tRequests\tError"
+        assert [i.split("\t")[:2] for i in summary[1:4]] == [["broken", "1"], ["fast", "0"], ["slow", "0"]]
+        assert summary[1].endswith("ForbiddenException: (403)")
+        assert summary[-1] == "1 of 3 contexts failed"
+
+    def test_given_contexts(self, clusters, capsys):
+        assert run_command_line(["list", "pods-by-context", "--contexts", "slow, fast,slow"]) == 0
+        captured = capsys.readouterr()
+        assert {i.split("\t")[0] for i in captured.out.splitlines()} == {"fast", "slow"}
+        assert not clusters["broken"].requests
+        assert captured.err.splitlines()[-1] == "0 of 2 contexts failed"
+
+    def test_rows_of_all_contexts_in_one_output(self, clusters, capsys):
+        assert run_command_line(["list", "pods-by-context", "--contexts", "slow,fast", "-o", "csv"]) == 0
+        captured = capsys.readouterr()
+        out = captured.out.splitlines()
+        assert out[0] == "context,ip,namespace,name,owner_kind,owner_name"
+        assert sorted(out[1:]) == ["fast,,test,debug,,", "fast,10.0.0.1,test,cache-0,StatefulSet,cache",
+                                   "slow,,test,debug,,", "slow,10.0.0.1,test,cache-0,StatefulSet,cache"]
+        assert "fast\tresults: 2" in captured.err.splitlines()
+
+    def test_single_context_or_many(self, clusters):
+        assert run_command_line(["list", "pods-by-context", "-c", "fast", "--contexts", "slow"]) == 1
+
+    def test_lines_are_printed_while_the_context_runs(self, monkeypatch):
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        seen = list()
+
+        class Command:
+            def run(self, args):
+                print("started")
+                # the first line is out before the command ends
+                seen.append(wait_until(lambda: "fake\tstarted\n" in stdout.getvalue()))
+                print("done", end="")
+
+        monkeypatch.setattr("lib.fanout.probe", lambda context: ProbeResult(context, True, 0.0))
+        assert FanOut(Command(), Namespace(), ["fake"]).run() == 0
+        assert seen == [True]
+        assert stdout.getvalue() == "fake\tstarted\nfake\tdone\n"
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from argparse import Namespace
+
+import pytest
+from kubernetes import client
+
+from lib.actions.list.pods_by_context import ListPodsByContext
+from lib.confirmer import confirm_pod
+from lib.fields import decode_list, list_fields
+from lib.input import set_current_input_adapter, NonInteractiveAdapter
+from lib.pool import get_api_client
+
+POD_LIST = {"kind": "PodList", "apiVersion": "v1", "metadata": {"resourceVersion": "42"}, "items": [
+    {"metadata": {"name": "cache-0", "namespace": "test",
+                  "ownerReferences": [{"kind": "StatefulSet", "name": "cache"}]},
+     "spec": {"containers": [{"name": "redis", "image": "redis"}]},
+     "status": {"podIP": "10.0.0.1", "phase": "Running"}},
+    {"metadata": {"name": "debug", "namespace": "test"}, "status": {}},
+]}
+
+
+class SelectFirst(NonInteractiveAdapter):
+
+    def radio_list(self, title, text, options):
+        self.options = options
+        return options[0]
+
+
+class TestFields:
+
+    def test_decode_list(self):
+        data = b' {"kind": "PodList",\n "metadata": {"continue": "abc"}, "items": [ {"metadata": {"name": "a",' \
+               b' "labels": {"app": "x"}}}, {"metadata": {"name": "b"}} ] } '
+        items, metadata = decode_list(data, ["metadata.name", "metadata.labels.app", "spec.containers.0.name"])
+        assert items == [("a", "x", None), ("b", None, None)]
+        assert metadata == {"continue": "abc"}
+
+        assert decode_list('{"kind": "PodList", "items": null}', ["metadata.name"]) == ([], {})
+        with pytest.raises(ValueError):
+            decode_list('{"items": [{}, }', ["metadata.name"])
+
+    def test_list_pods_reads_raw_json(self, fake_api, capsys):
+        fake_api.add("/api/v1/pods", POD_LIST)
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="json"))
+        out = capsys.readouterr().out
+        assert "10.0.0.1\ttest\tcache-0\tStatefulSet(cache)\t" in out
+        assert "None\ttest\tdebug\t\t" in out
+
+    def test_confirm_offers_names(self, fake_api):
+        fake_api.add("/api/v1/namespaces/test/pods", POD_LIST)
+        adapter = SelectFirst()
+        set_current_input_adapter(adapter)
+        try:
+            assert confirm_pod("fake", "test") == "cache-0"
+        finally:
+            set_current_input_adapter(None)
+        assert adapter.options == ["cache-0", "debug"]
+        # the dialog needs names only
+        assert fake_api.requests[0].headers["Accept"] == \
+            "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1, application/json"
+
+    def test_metadata_only_with_protobuf(self, fake_api):
+        fake_api.add("/api/v1/namespaces/test/pods", POD_LIST)
+        api = client.CoreV1Api(get_api_client("fake"))
+        assert list_fields(api.list_namespaced_pod, ["metadata.name"], wire_format="protobuf", namespace="test") \
+            == [("cache-0",), ("debug",)]
+        assert list_fields(api.list_namespaced_pod, ["status.phase"], namespace="test") == [("Running",), (None,)]
+        assert [i.headers.get("Accept") for i in fake_api.requests] == [
+            "application/vnd.kubernetes.protobuf;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1, "
+            "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1, "
+            "application/vnd.kubernetes.protobuf, application/json",
+            "application/json"]
@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import gzip
+import json
+from argparse import Namespace
+
+from lib.actions.list.pods_by_context import ListPodsByContext, POD_FIELDS
+from lib.fields import decode_stream, decode_list
+from test.wire_fixtures import pod_list_fixtures
+
+
+def gzip_handler(body: bytes):
+    """responds compressed if the client accepts it, the compressed body is sent in several small writes"""
+
+    def handler(http, request):
+        compressed = "gzip" in request.headers.get("Accept-Encoding", "")
+        data = gzip.compress(body) if compressed else body
+        http.send_response(200)
+        http.send_header("Content-Type", "application/json")
+        if compressed:
+            http.send_header("Content-Encoding", "gzip")
+        http.send_header("Content-Length", str(len(data)))
+        http.end_headers()
+        for i in range(0, len(data), 1000):
+            http.wfile.write(data[i:i + 1000])
+    return handler
+
+
+class TestGzip:
+
+    def test_compressed_response_is_decoded(self, fake_api, capsys):
+        json_data, protobuf_data = pod_list_fixtures(200)
+        fake_api.add("/api/v1/pods", gzip_handler(json_data))
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="json", no_gzip=False))
+        out = capsys.readouterr().out
+        assert "results: 200" in out
+        assert "10.2.0.199\tteam-39\tapp-99-7d9f8c6b5-x00199\tReplicaSet(app-99-7d9f8c6b5)\t" in out
+        assert fake_api.requests[0].headers["Accept-Encoding"] == "gzip"
+
+    def test_compression_can_be_disabled(self, fake_api, capsys, monkeypatch):
+        json_data, protobuf_data = pod_list_fixtures(2)
+        fake_api.add("/api/v1/pods", gzip_handler(json_data))
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="json", no_gzip=True))
+        assert "results: 2" in capsys.readouterr().out
+
+        monkeypatch.setenv("K8S_PYTHON_TOOLS_GZIP", "0")
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="json", no_gzip=False))
+        assert [i.headers.get("Accept-Encoding", "identity") for i in fake_api.requests] == ["identity"] * 2
+
+    def test_stream_of_small_chunks(self):
+        data = json.dumps({"kind": "PodList", "metadata": {"continue": "ä"},
+                           "items": [{"metadata": {"name": "pöd-%d" % i}} for i in range(50)]},
+                          ensure_ascii=False).encode("utf-8")
+        for size in (1, 3, 7, 64):
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            assert decode_stream(chunks, POD_FIELDS) == decode_list(data, POD_FIELDS)
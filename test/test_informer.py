@@ -0,0 +1,151 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+
+from lib.checker import wait_for_pod_is_away
+from lib.confirmer import confirm_pod
+from lib.informer import enable_informers, get_informer, matches_labels, parse_label_selector
+from lib.input import set_current_input_adapter
+from lib.runner import run_command_line
+from test.conftest import wait_until
+from test.fake_api import FakeWatch, pod, pod_list
+from test.test_fields import SelectFirst
+
+
+NAMESPACE_PATH = "/api/v1/namespaces/test/pods"
+
+
+@pytest.fixture
+def watch(discovered_fake_api):
+    pods = FakeWatch(pod_list([pod("a", labels={"app": "web"}), pod("b"), pod("c", "prod")]))
+    discovered_fake_api.add("/api/v1/pods", pods)
+    discovered_fake_api.add(NAMESPACE_PATH, pods)
+    enable_informers()
+    yield pods
+    enable_informers(False)
+    pods.close()
+
+
+def watches(fake_api, path="/api/v1/pods") -> list:
+    return [parse_qs(i.query) for i in fake_api.requests_of(path) if "watch=true" in i.query]
+
+
+def lists(fake_api, path="/api/v1/pods") -> list:
+    return [i for i in fake_api.requests_of(path) if "watch=true" not in i.query]
+
+
+class TestInformer:
+
+    def test_list_then_watch(self, fake_api, watch):
+        informer = get_informer("fake", "Pod")
+        assert [i["metadata"]["name"] for i in informer.select()] == ["c", "a", "b"]
+        assert "managedFields" not in informer.get("test", "a")["metadata"]
+        assert wait_until(lambda: watches(fake_api))
+        query = watches(fake_api)[0]
+        assert query["resourceVersion"] == ["10"]
+        assert query["allowWatchBookmarks"] == ["true"]
+
+        watch.emit("ADDED", pod("d", version="11", labels={"app": "web"}))
+        watch.emit("MODIFIED", pod("a", version="12", labels={"app": "db"}))
+        watch.emit("DELETED", pod("b", version="13"))
+        watch.emit("BOOKMARK", {"metadata": {"resourceVersion": "14"}})
+        assert wait_until(lambda: informer.resource_version == "14")
+        assert [i["metadata"]["name"] for i in informer.select("test")] == ["a", "d"]
+        assert [i["metadata"]["name"] for i in informer.select(label_selector="app=web")] == ["d"]
+        assert [i["metadata"]["name"] for i in informer.select(label_selector="app notin (web)")] == ["c", "a"]
+        assert [i["metadata"]["name"] for i in informer.select(field_selector="metadata.namespace!=test")] == ["c"]
+
+        # a watch which is ended by the API server is started again at the last resourceVersion
+        watch.close()
+        assert wait_until(lambda: len(watches(fake_api)) == 2)
+        assert watches(fake_api)[1]["resourceVersion"] == ["14"]
+        assert get_informer("fake", "Pod") is informer
+
+    def test_expired_watch_lists_again(self, fake_api, watch):
+        informer = get_informer("fake", "Pod")
+        assert wait_until(lambda: watches(fake_api))
+        watch.list_body = pod_list([pod("x")], "20")
+        watch.emit("ERROR", {"kind": "Status", "code": 410, "reason": "Expired"})
+        assert wait_until(lambda: informer.resource_version == "20")
+        assert [i["metadata"]["name"] for i in informer.select()] == ["x"]
+        assert wait_until(lambda: len(watches(fake_api)) == 2)
+        assert watches(fake_api)[1]["resourceVersion"] == ["20"]
+
+    def test_commands_and_dialogs_use_the_cache(self, fake_api, watch, capsys):
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-n", "test"]) == 0
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-l", "app=web"]) == 0
+        out = capsys.readouterr().out.splitlines()
+        assert [i.split("\t")[2] for i in out if i.startswith("10.0.0.1")] == ["a", "b", "a"]
+        assert out[-1] == "results: 1"
+
+        set_current_input_adapter(SelectFirst())
+        try:
+            assert confirm_pod("fake", "test") == "a"
+        finally:
+            set_current_input_adapter(None)
+        # an informer of the namespace and one of all namespaces, the dialog uses one of them
+        assert len(lists(fake_api)) == 1
+        assert len(lists(fake_api, NAMESPACE_PATH)) == 1
+
+    def test_dialog_caches_metadata_of_its_namespace(self, fake_api, watch):
+        set_current_input_adapter(SelectFirst())
+        try:
+            assert confirm_pod("fake", "test") == "a"
+            assert confirm_pod("fake", "test") == "a"
+        finally:
+            set_current_input_adapter(None)
+        assert not fake_api.requests_of("/api/v1/pods")
+        assert len(lists(fake_api, NAMESPACE_PATH)) == 1
+        assert "as=PartialObjectMetadataList" in lists(fake_api, NAMESPACE_PATH)[0].headers["Accept"]
+        assert wait_until(lambda: watches(fake_api, NAMESPACE_PATH))
+        watch_request = [i for i in fake_api.requests_of(NAMESPACE_PATH) if "watch=true" in i.query][0]
+        assert watch_request.headers["Accept"].startswith("application/json;as=PartialObjectMetadata;")
+
+    def test_wait_for_removal_without_polling(self, fake_api, watch):
+        get_informer("fake", "Pod")
+        threading.Timer(0.2, watch.emit, ("DELETED", pod("b", version="11"))).start()
+        assert wait_for_pod_is_away("fake", "test", "b")
+        assert not fake_api.requests_of("/api/v1/namespaces/test/pods/b/status")
+
+    def test_only_long_running_modes_cache(self, fake_api, watch):
+        enable_informers(False)
+        assert get_informer("fake", "Pod") is None
+        assert not fake_api.requests_of("/api/v1/pods")
+
+
+class TestLabelSelector:
+
+    def test_parse_and_match(self):
+        requirements = parse_label_selector("app in (web, db),tier!=cache,!canary,release")
+        assert requirements == [("app", "in", {"web", "db"}), ("tier", "notin", {"cache"}), ("canary", "!", set()),
+                                ("release", "exists", set())]
+        assert matches_labels({"app": "db", "release": "1"}, requirements)
+        assert not matches_labels({"app": "db", "release": "1", "canary": "true"}, requirements)
+        assert not matches_labels({"app": "db", "tier": "cache", "release": "1"}, requirements)
+        assert not matches_labels({"app": "web"}, requirements)
+        with pytest.raises(SystemExit):
+            parse_label_selector("app in web")
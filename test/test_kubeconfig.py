@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+
+from lib.kubeconfig import KubeConfigCache
+from lib.pool import ClientPool
+
+
+class TestKubeConfigCache:
+
+    def test_parsed_once_until_file_changes(self, kube_config):
+        cache = KubeConfigCache()
+        contexts, active = cache.list_contexts(kube_config)
+        assert [i["name"] for i in contexts] == ["alpha", "beta"]
+        assert active["name"] == "alpha"
+        cache.new_client("alpha", kube_config)
+        cache.new_client("beta", kube_config)
+        assert cache.parse_count == 1
+
+        with open(kube_config, "a") as file:
+            file.write("preferences: {}\n")
+        cache.list_contexts(kube_config)
+        assert cache.parse_count == 2
+
+    def test_merged_files_of_kubeconfig_env(self, kube_config, tmp_path, monkeypatch):
+        other = tmp_path / "other"
+        other.write_text("""apiVersion: v1
+kind: Config
+clusters:
+- name: gamma
+  cluster:
+    server: http://127.0.0.1:3
+contexts:
+- name: gamma
+  context:
+    cluster: gamma
+users: []
+""")
+        monkeypatch.setenv("KUBECONFIG", os.pathsep.join([kube_config, str(tmp_path / "missing"), str(other)]))
+        cache = KubeConfigCache()
+        contexts, active = cache.list_contexts()
+        assert [i["name"] for i in contexts] == ["alpha", "beta", "gamma"]
+        assert cache.new_client("gamma").configuration.host == "http://127.0.0.1:3"
+
+        os.utime(str(other), ns=(0, 0))
+        cache.list_contexts()
+        assert cache.parse_count == 2
+
+    def test_pool_replaces_client_of_changed_kubeconfig(self, kube_config):
+        pool = ClientPool(kube_config)
+        alpha = pool.get("alpha")
+        assert pool.get("alpha") is alpha
+
+        with open(kube_config) as file:
+            content = file.read()
+        with open(kube_config, "w") as file:
+            file.write(content.replace("127.0.0.1:1", "127.0.0.1:11"))
+        assert pool.get("alpha").configuration.host == "http://127.0.0.1:11"
@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import csv
+import io
+import json
+
+import pytest
+
+from lib.output import CSV, PARQUET, RowOutput
+from lib.runner import run_command_line
+from test.fake_api import page, table
+
+
+class Pipe(io.RawIOBase):
+    """binary stdout which cannot tell its position, like a pipe"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.data += data
+        return len(data)
+
+    def tell(self) -> int:
+        raise OSError("not seekable")
+
+
+@pytest.fixture
+def pods(fake_api):
+    fake_api.add("/api/v1/pods", page(["a", "b"], "t1"))
+    fake_api.add("/api/v1/pods", {"kind": "PodList", "metadata": {}, "items": [
+        {"metadata": {"name": "c, d", "namespace": "test",
+                      "ownerReferences": [{"kind": "ReplicaSet", "name": "web-1"}]}}]})
+    return fake_api
+
+
+class TestOutput:
+
+    def test_json_lines(self, pods, capsys):
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "jsonl", "--page-size", "2"]) == 0
+        out, err = capsys.readouterr()
+        assert [json.loads(i) for i in out.splitlines()] == [
+            {"context": "fake", "ip": "10.0.0.1", "namespace": "test", "name": "a", "owner_kind": None,
+             "owner_name": None},
+            {"context": "fake", "ip": "10.0.0.1", "namespace": "test", "name": "b", "owner_kind": None,
+             "owner_name": None},
+            {"context": "fake", "ip": None, "namespace": "test", "name": "c, d", "owner_kind": "ReplicaSet",
+             "owner_name": "web-1"}]
+        # messages do not mix with the rows
+        assert "Listing pods" in err
+        assert "results: 3" in err
+
+    def test_csv_and_tsv(self, pods, capsys, tmp_path):
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "csv", "--page-size", "2"]) == 0
+        assert list(csv.reader(io.StringIO(capsys.readouterr().out))) == [
+            ["context", "ip", "namespace", "name", "owner_kind", "owner_name"],
+            ["fake", "10.0.0.1", "test", "a", "", ""], ["fake", "10.0.0.1", "test", "b", "", ""],
+            ["fake", "", "test", "c, d", "ReplicaSet", "web-1"]]
+
+        output_file = tmp_path / "pods.tsv"
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "tsv", "--page-size", "0",
+                                 "--output-file", str(output_file)]) == 0
+        assert "results: 1" in capsys.readouterr().err
+        assert output_file.read_text().splitlines() == ["context\tip\tnamespace\tname\towner_kind\towner_name",
+                                                       "fake\t\ttest\tc, d\tReplicaSet\tweb-1"]
+
+    @pytest.mark.usefixtures("discovered_fake_api")
+    def test_server_side_table_rows(self, fake_api, capsys):
+        fake_api.add("/apis/apps/v1/deployments", table([("test", ["web", "2/2", "", "1h"])]))
+        assert run_command_line(["list", "deployment", "-c", "fake", "-o", "jsonl"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"context": "fake", "namespace": "test", "name": "web",
+                                                       "ready": "2/2", "age": "1h"}
+
+    def test_table_is_rejected_without_table_columns(self, fake_api, capsys):
+        assert run_command_line(["list", "svc-cluster-local", "-c", "fake", "-o", "table"]) == 1
+        assert "list svc-cluster-local has no table output" in capsys.readouterr().err
+        assert not fake_api.requests
+
+    def test_contexts_share_one_output(self):
+        stream = io.StringIO()
+        output = RowOutput(CSV, stream)
+        assert output.write("alpha", ["name", "labels"], [("a", {"app": "web"})]) == 1
+        assert output.write("beta", ["name", "labels"], [("b", None), ("c", [])]) == 2
+        output.close()
+        assert stream.getvalue().splitlines() == ["context,name,labels", 'alpha,a,"{""app"":""web""}"', "beta,b,",
+                                                  "beta,c,[]"]
+
+    def test_parquet(self, pods, capsys, tmp_path, monkeypatch):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        monkeypatch.setattr("lib.output.PARQUET_ROW_GROUP_SIZE", 2)
+        output_file = tmp_path / "pods.parquet"
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "parquet", "--page-size", "2",
+                                 "--output-file", str(output_file)]) == 0
+        parquet_file = parquet.ParquetFile(str(output_file))
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.read().column("name").to_pylist() == ["a", "b", "c, d"]
+
+    def test_parquet_to_pipe(self, monkeypatch):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        monkeypatch.setattr("lib.output.PARQUET_ROW_GROUP_SIZE", 2)
+        pipe = Pipe()
+        output = RowOutput(PARQUET, io.TextIOWrapper(pipe))
+        assert output.write("alpha", ["name"], [("a",), ("b",), ("c",)]) == 3
+        output.close()
+        table = parquet.read_table(io.BytesIO(bytes(pipe.data)))
+        assert table.column("context").to_pylist() == ["alpha"] * 3
+        assert table.column("name").to_pylist() == ["a", "b", "c"]
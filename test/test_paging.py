@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from argparse import Namespace
+from urllib.parse import parse_qs
+
+import pytest
+from kubernetes import client
+
+from lib.actions.list.pods_by_context import ListPodsByContext
+from lib.fields import iter_fields, list_fields
+from lib.pool import get_api_client
+from test.fake_api import page
+
+
+@pytest.fixture
+def pages(fake_api):
+    fake_api.add("/api/v1/pods", page(["a", "b"], "t1"))
+    fake_api.add("/api/v1/pods", page(["c", "d"], "t2"))
+    fake_api.add("/api/v1/pods", page(["e"]))
+    return fake_api
+
+
+class TestPaging:
+
+    def test_pages_are_requested_on_demand(self, pages):
+        api = client.CoreV1Api(get_api_client("fake"))
+        items = iter_fields(api.list_pod_for_all_namespaces, ["metadata.name"], page_size=2)
+        assert next(items) == ("a",)
+        assert len(pages.requests) == 1
+        assert list(items) == [("b",), ("c",), ("d",), ("e",)]
+        queries = [parse_qs(i.query) for i in pages.requests]
+        assert [i["limit"] for i in queries] == [["2"]] * 3
+        assert [i.get("continue") for i in queries] == [None, ["t1"], ["t2"]]
+
+    def test_list_command_prints_all_pages(self, pages, capsys):
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="json", no_gzip=False, page_size=2))
+        out = capsys.readouterr().out.splitlines()
+        assert [i.split("\t")[2] for i in out if i.startswith("10.0.0.1")] == ["a", "b", "c", "d", "e"]
+        assert out[-1] == "results: 5"
+
+    def test_without_page_size_the_list_is_read_at_once(self, pages):
+        api = client.CoreV1Api(get_api_client("fake"))
+        assert list_fields(api.list_pod_for_all_namespaces, ["metadata.name"]) == [("a",), ("b",)]
+        assert "limit" not in pages.requests[0].query
+
+    def test_expired_continue_token(self, fake_api):
+        fake_api.add("/api/v1/pods", page(["a"], "t1"))
+        fake_api.add("/api/v1/pods", {"kind": "Status", "code": 410, "reason": "Expired"}, status=410)
+        api = client.CoreV1Api(get_api_client("fake"))
+        with pytest.raises(SystemExit, match="larger page size"):
+            list_fields(api.list_pod_for_all_namespaces, ["metadata.name"], page_size=1)
@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lib.pool import ClientPool
+
+
+class TestClientPool:
+
+    def test_one_client_per_context(self, kube_config):
+        pool = ClientPool(kube_config)
+        alpha = pool.get("alpha")
+        beta = pool.get("beta")
+
+        assert pool.get("alpha") is alpha
+        assert alpha.configuration.host == "http://127.0.0.1:1"
+        assert beta.configuration.host == "http://127.0.0.1:2"
+        assert list(alpha.configuration.api_key.values()) == ["Bearer alpha-token"]
+        assert list(beta.configuration.api_key.values()) == ["Bearer beta-token"]
+
+    def test_concurrent_access_creates_client_once(self, kube_config, monkeypatch):
+        pool = ClientPool(kube_config)
+        created = list()
+        create = pool.create
+        monkeypatch.setattr(pool, "create", lambda context: created.append(context) or create(context))
+
+        with ThreadPoolExecutor(8) as executor:
+            clients = list(executor.map(pool.get, ["alpha", "beta"] * 8))
+        assert sorted(created) == ["alpha", "beta"]
+        assert len(set(map(id, clients))) == 2
+
+    def test_changed_kube_config_closes_replaced_client(self, kube_config, monkeypatch):
+        pool = ClientPool(kube_config)
+        alpha = pool.get("alpha")
+        closed = list()
+        monkeypatch.setattr(alpha, "close", lambda: closed.append(alpha))
+
+        with open(kube_config, "a") as file:
+            file.write("\n")
+        assert pool.get("alpha") is not alpha
+        assert closed == [alpha]
+
+    def test_empty_context(self, kube_config):
+        with pytest.raises(SystemExit):
+            ClientPool(kube_config).get(None)
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import socket
+import threading
+import time
+
+import pytest
+from kubernetes import client
+
+import lib.pool
+import lib.probe
+import lib.retry
+from lib.common import choose_context
+from lib.pool import ClientPool, get_api_client
+from lib.probe import probe, probe_contexts, request_timeout, ProbeResult, READ_TIMEOUT_ENV, PROBE_TIMEOUT_ENV, \
+    CONNECT_TIMEOUT_ENV, PROBE_WORKERS
+from lib.retry import RetryPolicy
+from test.conftest import write_kube_config
+from test.fake_api import FakeResponse
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def silent_server():
+    """accepts connections but never answers"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    yield "http://127.0.0.1:%d" % server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def contexts(fake_api, silent_server, tmp_path, monkeypatch):
+    servers = {"up": fake_api.url, "refused": "http://127.0.0.1:%d" % free_port(), "silent": silent_server}
+    path = write_kube_config(tmp_path / "kubeconfig", servers)
+    monkeypatch.setattr(lib.pool, "client_pool", ClientPool(path))
+    monkeypatch.setenv(PROBE_TIMEOUT_ENV, "0.3")
+    return servers
+
+
+class TestProbe:
+
+    def test_all_contexts_are_probed_at_once(self, contexts, fake_api):
+        get_api_client("silent")
+        start = time.monotonic()
+        results = probe_contexts(list(contexts))
+        assert time.monotonic() - start < 1.0
+        assert results["up"].reachable
+        assert results["up"].label().startswith("up (")
+        assert not results["refused"].reachable
+        assert not results["silent"].reachable
+        assert "ReadTimeoutError" in results["silent"].error
+        assert results["silent"].label().startswith("silent (unreachable: ")
+        assert fake_api.requests_of("/version")[0].headers["authorization"] == "Bearer token"
+
+    def test_probes_run_with_limited_workers(self, monkeypatch):
+        running = list()
+        most = list()
+        lock = threading.Lock()
+
+        def counting_probe(context):
+            with lock:
+                running.append(context)
+                most.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(context)
+            return ProbeResult(context, True, 0.0)
+
+        monkeypatch.setattr(lib.probe, "probe", counting_probe)
+        results = probe_contexts(["context-%d" % i for i in range(3 * PROBE_WORKERS)])
+        assert len(results) == 3 * PROBE_WORKERS
+        assert max(most) == PROBE_WORKERS
+
+    def test_chosen_context_is_not_probed(self, fake_api):
+        assert choose_context("fake") == "fake"
+        assert fake_api.requests == []
+
+    def test_server_errors_are_unreachable(self, fake_api):
+        fake_api.add("/version", status=503)
+        assert probe("fake").error == "status 503"
+        assert not probe("fake").reachable
+
+    def test_fan_out_skips_dead_clusters(self, contexts, fake_api, capsys):
+        from lib.runner import run_command_line
+        from test.test_fields import POD_LIST
+        fake_api.add("/api/v1/pods", POD_LIST)
+        assert run_command_line(["list", "pods-by-context", "--contexts", "up,refused"]) == 1
+        captured = capsys.readouterr()
+        assert "up\tresults: 2" in captured.out.splitlines()
+        assert "refused\t1\t" in captured.err
+        assert "unreachable: NewConnectionError" in captured.err
+        # only the fan-out probes a context
+        assert len(fake_api.requests_of("/version")) == 1
+
+    def test_requests_time_out(self, fake_api, monkeypatch):
+        def slow(http, request):
+            time.sleep(1)
+            http.send(FakeResponse({"kind": "PodList", "items": []}))
+
+        fake_api.add("/api/v1/pods", slow)
+        monkeypatch.setenv(READ_TIMEOUT_ENV, "fake=0.2")
+        monkeypatch.setattr(lib.retry, "retry_policy", RetryPolicy(0))
+        start = time.monotonic()
+        with pytest.raises(Exception):
+            client.CoreV1Api(get_api_client("fake")).list_pod_for_all_namespaces()
+        assert time.monotonic() - start < 0.9
+
+    def test_timeouts_per_context(self, monkeypatch):
+        assert request_timeout("dev") == (5.0, 60.0)
+        monkeypatch.setenv(CONNECT_TIMEOUT_ENV, "2,prod=10")
+        monkeypatch.setenv(READ_TIMEOUT_ENV, "0")
+        assert request_timeout("dev") == (2.0, None)
+        assert request_timeout("prod") == (10.0, None)
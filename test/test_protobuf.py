@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from argparse import Namespace
+
+import pytest
+
+from lib.actions.list.pods_by_context import ListPodsByContext, POD_FIELDS
+from lib.fields import decode_list as decode_json_list
+from lib.protobuf import decode_list, CONTENT_TYPE
+from test.wire_fixtures import pod_list_fixtures, encode_list
+
+
+class TestProtobuf:
+
+    def test_same_records_as_json(self):
+        json_data, protobuf_data = pod_list_fixtures(50)
+        paths = POD_FIELDS + ["metadata.labels.app", "spec.nodeName", "metadata.ownerReferences.0.controller"]
+        items, metadata = decode_list(protobuf_data, paths)
+        assert (items, metadata) == decode_json_list(json_data, paths)
+        assert items[1] == ("10.2.0.1", "team-1", "app-1-7d9f8c6b5-x00001", "ReplicaSet", "app-1-7d9f8c6b5",
+                            "app-1", "node-1", True)
+        assert len(protobuf_data) < len(json_data) / 2
+
+    def test_metadata_list(self):
+        data = encode_list({"kind": "PartialObjectMetadataList", "apiVersion": "meta.k8s.io/v1",
+                            "metadata": {"continue": "t1"},
+                            "items": [{"metadata": {"name": "a", "namespace": "test"}}, {"metadata": {"name": "b"}}]})
+        assert decode_list(data, ["metadata.name", "metadata.namespace"]) == \
+            ([("a", "test"), ("b", None)], {"continue": "t1"})
+
+    def test_unknown_fields_are_rejected(self):
+        json_data, protobuf_data = pod_list_fixtures(1)
+        with pytest.raises(SystemExit):
+            decode_list(protobuf_data, ["spec.containers.0.image"])
+
+    def test_list_pods_negotiates_protobuf(self, fake_api, capsys):
+        json_data, protobuf_data = pod_list_fixtures(3)
+        fake_api.add("/api/v1/pods", protobuf_data, headers={"Content-Type": CONTENT_TYPE})
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="protobuf"))
+        assert "10.2.0.2\tteam-2\tapp-2-7d9f8c6b5-x00002\tReplicaSet(app-2-7d9f8c6b5)\t" in capsys.readouterr().out
+        assert fake_api.requests[0].headers["Accept"].startswith(CONTENT_TYPE)
+
+    def test_json_answer_to_protobuf_request(self, fake_api, capsys):
+        json_data, protobuf_data = pod_list_fixtures(3)
+        fake_api.add("/api/v1/pods", json_data)
+        ListPodsByContext().run(Namespace(context="fake", namespace=None, wire_format="protobuf"))
+        assert "app-2-7d9f8c6b5-x00002" in capsys.readouterr().out
@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import pytest
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+
+import lib.checker
+import lib.retry
+from lib.pool import get_api_client
+from lib.retry import RetryPolicy, parse_retry_after
+from lib.stats import request_stats
+
+POD_PATH = "/api/v1/namespaces/test/pods/cache"
+
+POD = {"kind": "Pod", "apiVersion": "v1", "metadata": {"name": "cache", "namespace": "test"}}
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """retries do not sleep, the delays are recorded"""
+    delays = list()
+    monkeypatch.setattr(lib.retry, "retry_policy", RetryPolicy(3, sleep=delays.append, rand=lambda a, b: b))
+    return delays
+
+
+class TestRetry:
+
+    def test_throttling_and_server_errors_are_retried(self, fake_api, delays):
+        fake_api.add(POD_PATH, status=503)
+        fake_api.add(POD_PATH, status=429, headers={"Retry-After": "7"})
+        fake_api.add(POD_PATH, POD)
+        retries = request_stats.get("fake", "retries")
+
+        pod = client.CoreV1Api(get_api_client("fake")).read_namespaced_pod("cache", "test")
+        assert pod.metadata.name == "cache"
+        assert len(fake_api.requests_of(POD_PATH)) == 3
+        assert delays == [0.5, 7.0]
+        assert request_stats.get("fake", "retries") == retries + 2
+
+    def test_not_found_is_not_retried(self, fake_api, delays):
+        with pytest.raises(ApiException) as e:
+            client.CoreV1Api(get_api_client("fake")).read_namespaced_pod("cache", "test")
+        assert e.value.status == 404
+        assert len(fake_api.requests_of(POD_PATH)) == 1
+        assert delays == []
+
+    def test_gives_up_after_max_retries(self, fake_api, delays):
+        fake_api.add(POD_PATH, status=500)
+        with pytest.raises(ApiException) as e:
+            client.CoreV1Api(get_api_client("fake")).read_namespaced_pod("cache", "test")
+        assert e.value.status == 500
+        assert len(fake_api.requests_of(POD_PATH)) == 4
+
+    def test_server_errors_of_non_idempotent_requests_are_not_retried(self, fake_api, delays):
+        fake_api.add(POD_PATH, status=503, method="DELETE")
+        with pytest.raises(ApiException):
+            client.CoreV1Api(get_api_client("fake")).delete_namespaced_pod("cache", "test")
+        assert len(fake_api.requests_of(POD_PATH)) == 1
+
+    def test_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_invalid_retries_env(self, monkeypatch):
+        monkeypatch.setenv(lib.retry.RETRIES_ENV, "many")
+        with pytest.raises(SystemExit, match="invalid value of K8S_PYTHON_TOOLS_RETRIES"):
+            RetryPolicy()
+
+
+class TestStatusCheck:
+
+    def test_server_errors_are_not_reported_as_removed(self, fake_api, delays, monkeypatch):
+        monkeypatch.setattr(lib.checker.time, "sleep", lambda seconds: None)
+        monkeypatch.setattr(lib.checker, "wait_timeout_seconds", 1)
+        fake_api.add(POD_PATH + "/status", status=503)
+        assert not lib.checker.wait_for_pod_is_away("fake", "test", "cache")
+
+    def test_not_found_is_reported_as_removed(self, fake_api, delays, monkeypatch):
+        monkeypatch.setattr(lib.checker.time, "sleep", lambda seconds: None)
+        fake_api.add(POD_PATH + "/status", POD)
+        fake_api.add(POD_PATH + "/status", status=503)
+        fake_api.add(POD_PATH + "/status", status=404)
+        assert lib.checker.wait_for_pod_is_away("fake", "test", "cache")
+        assert len(fake_api.requests_of(POD_PATH + "/status")) == 3
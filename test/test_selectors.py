@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from urllib.parse import parse_qs
+
+from lib.runner import run_command_line
+from test.test_fields import POD_LIST
+
+
+class TestSelectors:
+
+    def test_selectors_are_sent_to_the_server(self, fake_api, capsys):
+        fake_api.add("/api/v1/namespaces/test/pods", POD_LIST)
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-n", "test", "-l", "app=web,tier!=cache",
+                                 "--field-selector", "status.phase!=Running", "--page-size", "0"]) == 0
+        assert "10.0.0.1\ttest\tcache-0\tStatefulSet(cache)\t" in capsys.readouterr().out
+        query = parse_qs(fake_api.requests[0].query)
+        assert query["labelSelector"] == ["app=web,tier!=cache"]
+        assert query["fieldSelector"] == ["status.phase!=Running"]
+        assert "limit" not in query
+
+    def test_all_namespaces_without_selectors(self, fake_api, capsys):
+        fake_api.add("/api/v1/persistentvolumeclaims", {"kind": "PersistentVolumeClaimList", "items": [
+            {"metadata": {"name": "data", "namespace": "test"}, "status": {"phase": "Bound"}}]})
+        assert run_command_line(["list", "pvc-by-context", "-c", "fake"]) == 0
+        assert "Bound\ttest\tdata\t\t" in capsys.readouterr().out
+        assert parse_qs(fake_api.requests[0].query) == {"limit": ["500"]}
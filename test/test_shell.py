@@ -0,0 +1,48 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from lib.actions.execute.exec_pod import ExecPod
+from lib.register import Register
+from lib.shell import Shell
+
+
+class TestShell:
+
+    def test_context_and_namespace_are_kept_between_commands(self, monkeypatch):
+        executed = list()
+        monkeypatch.setattr(ExecPod, "run", lambda cmd, args: executed.append(args))
+        monkeypatch.setattr(Shell, "select_context", lambda shell, context: setattr(shell, "context", context) or 0)
+
+        shell = Shell(register=Register())
+        assert shell.handle_line("context minikube") == 0
+        assert shell.handle_line("namespace test") == 0
+        assert shell.prompt_message() == "k8s [minikube/test]>"
+
+        assert shell.handle_line("execute pod -p cache") == 0
+        assert shell.handle_line("execute pod -n other -p db") == 0
+        assert [(i.context, i.namespace, i.pod) for i in executed] == \
+               [("minikube", "test", "cache"), ("minikube", "other", "db")]
+
+        assert shell.handle_line("unknown command") == 2
+        assert shell.handle_line("exit") == 0
+        assert not shell.running
@@ -0,0 +1,154 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import time
+from urllib.parse import parse_qs
+
+import pytest
+
+import lib.snapshot
+from lib.confirmer import confirm_pod
+from lib.input import set_current_input_adapter
+from lib.runner import run_command_line
+from lib.snapshot import MAX_STALENESS_ENV, SNAPSHOT_TTL_ENV, SnapshotCache
+from test.fake_api import FakeWatch, pod, pod_list
+from test.test_fields import SelectFirst
+
+PATH = "/api/v1/namespaces/test/pods"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lib.snapshot, "snapshot_cache", SnapshotCache(clock=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def pods(discovered_fake_api, clock):
+    watch = FakeWatch(pod_list([pod("a"), pod("b")]))
+    discovered_fake_api.add("/api/v1/pods", watch)
+    discovered_fake_api.add("/api/v1/namespaces/test/pods", watch)
+    yield watch
+    watch.close()
+
+
+def requests(fake_api, watch=False, path="/api/v1/pods") -> list:
+    return [parse_qs(i.query) for i in fake_api.requests_of(path) if ("watch=true" in i.query) == watch]
+
+
+def listed_pods(capsys) -> list:
+    return [i.split("\t")[2] for i in capsys.readouterr().out.splitlines() if i.startswith("10.0.0.1")]
+
+
+class TestSnapshot:
+
+    def test_young_snapshot_is_used_without_request(self, fake_api, pods, capsys):
+        argv = ["--max-staleness", "30", "list", "pods-by-context", "-c", "fake"]
+        assert run_command_line(argv) == 0
+        assert run_command_line(argv) == 0
+        assert listed_pods(capsys) == ["a", "b", "a", "b"]
+        assert len(requests(fake_api)) == 1
+        assert not requests(fake_api, watch=True)
+        # the option applies to its own command only, the pods are no kind which needs discovery
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert len(requests(fake_api)) == 2
+        assert not fake_api.requests_of("/api")
+
+    def test_stale_snapshot_is_refreshed_by_watch(self, fake_api, pods, clock, capsys, monkeypatch):
+        monkeypatch.setenv(MAX_STALENESS_ENV, "30")
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        pods.emit("ADDED", pod("c", version="11"))
+        pods.emit("DELETED", pod("a", version="12"))
+        pods.emit("BOOKMARK", {"metadata": {"resourceVersion": "13"}})
+        clock[0] += 60
+        # the watch ends at the bookmark
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert listed_pods(capsys) == ["a", "b", "b", "c"]
+        assert len(requests(fake_api)) == 1
+        watch = requests(fake_api, watch=True)[0]
+        assert watch["resourceVersion"] == ["10"]
+        assert watch["allowWatchBookmarks"] == ["true"]
+
+        # the next refresh continues at the last resourceVersion of the watch
+        pods.close()
+        clock[0] += 60
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert requests(fake_api, watch=True)[1]["resourceVersion"] == ["13"]
+
+    def test_refresh_ends_when_no_event_is_pending(self, fake_api, pods, clock, capsys, monkeypatch):
+        monkeypatch.setenv(MAX_STALENESS_ENV, "30")
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        pods.emit("MODIFIED", pod("b", version="11"))
+        clock[0] += 60
+        start = time.monotonic()
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert time.monotonic() - start < 1
+        assert listed_pods(capsys) == ["a", "b", "a", "b"]
+
+        # the snapshot continues at the last event
+        pods.close()
+        clock[0] += 60
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert requests(fake_api, watch=True)[1]["resourceVersion"] == ["11"]
+
+    def test_expired_or_old_snapshots_are_listed_again(self, fake_api, pods, clock, monkeypatch):
+        monkeypatch.setenv(MAX_STALENESS_ENV, "30")
+        set_current_input_adapter(SelectFirst())
+        try:
+            assert confirm_pod("fake", "test") == "a"
+            pods.list_body = pod_list([pod("x")], "20")
+            pods.emit("ERROR", {"kind": "Status", "code": 410, "reason": "Expired"})
+            clock[0] += 60
+            assert confirm_pod("fake", "test") == "x"
+            assert len(requests(fake_api, path=PATH)) == 2
+
+            monkeypatch.setenv(SNAPSHOT_TTL_ENV, "100")
+            clock[0] += 200
+            assert confirm_pod("fake", "test") == "x"
+            assert len(requests(fake_api, path=PATH)) == 3
+            assert len(requests(fake_api, watch=True, path=PATH)) == 1
+        finally:
+            set_current_input_adapter(None)
+        # selection dialogs ask for the metadata only
+        assert "PartialObjectMetadataList" in fake_api.requests_of(PATH)[0].headers["Accept"]
+
+    def test_refresh_of_selection_dialog_watches_metadata(self, fake_api, pods, clock, monkeypatch):
+        monkeypatch.setenv(MAX_STALENESS_ENV, "30")
+        set_current_input_adapter(SelectFirst())
+        try:
+            assert confirm_pod("fake", "test") == "a"
+            pods.close()
+            clock[0] += 60
+            assert confirm_pod("fake", "test") == "a"
+        finally:
+            set_current_input_adapter(None)
+        watch = [i for i in fake_api.requests_of(PATH) if "watch=true" in i.query][0]
+        assert watch.headers["Accept"] == "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1, " \
+                                          "application/json"
+
+    def test_disabled_by_default(self, fake_api, pods, capsys, isolated_cache_dir):
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert run_command_line(["list", "pods-by-context", "-c", "fake"]) == 0
+        assert len(requests(fake_api)) == 2
+        assert not (isolated_cache_dir / "snapshots").exists()
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import subprocess
+import sys
+
+# upper limit of the summed up import time of a non-interactive cold start, in microseconds
+IMPORT_TIME_BUDGET_US = 1500000
+
+# libraries which are needed for interactive input or templating only
+INTERACTIVE_ONLY_PACKAGES = ("prompt_toolkit", "inquirer", "jinja2", "numpy")
+
+COLD_START = """
+import sys
+sys.argv = ["main.py", "drop", "pod", "-c", "ctx", "-n", "ns", "-p", "a-pod"]
+from lib.runner import Runner
+runner = Runner()
+runner.handle_args()
+runner.handle_invalid_input()
+runner.register.command(runner.args.subcmd, runner.args.subsubcmd)
+print("\\n".join(sys.modules))
+"""
+
+
+def cold_start(isolated_cache_dir) -> (dict, list):
+    """
+    Runs the cold start in a fresh interpreter and returns the self import time of every imported module and the
+    names of all loaded modules.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    env = dict(os.environ)
+    env["K8S_PYTHON_TOOLS_CACHE"] = str(isolated_cache_dir)
+    # first run writes the command manifest
+    subprocess.run([sys.executable, "-c", COLD_START], cwd=root, env=env, check=True, capture_output=True)
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", COLD_START], cwd=root, env=env,
+                             check=True, capture_output=True, text=True)
+    times = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times, process.stdout.split()
+
+
+class TestStartup:
+
+    def test_non_interactive_cold_start(self, isolated_cache_dir):
+        times, modules = cold_start(isolated_cache_dir)
+
+        assert "lib.actions.drop.pod" in modules
+        assert [i for i in modules if i.split(".")[0] in INTERACTIVE_ONLY_PACKAGES] == []
+        assert [i for i in modules if i.startswith("lib.actions.") and i.count(".") > 2] == ["lib.actions.drop.pod"]
+        assert sum(times.values()) < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+from urllib.parse import parse_qs
+
+import pytest
+
+from lib.runner import run_command_line
+from test.fake_api import CORE, RESOURCES, table
+
+
+class TestTable:
+
+    def test_list_command_prints_server_side_table(self, fake_api, capsys):
+        fake_api.add("/api/v1/pods", table([("test", ["cache-0", "1/1", "10.0.0.1", "3d"])], "t1"))
+        fake_api.add("/api/v1/pods", table([("prod", ["web", "0/1", None, "5m"])]))
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "table", "--page-size", "1"]) == 0
+        out = capsys.readouterr().out.splitlines()
+        assert out[-4:] == ["NAMESPACE\tNAME\tREADY\tAGE", "test\tcache-0\t1/1\t3d", "prod\tweb\t0/1\t5m", "results: 2"]
+        assert "as=Table;v=v1;g=meta.k8s.io" in fake_api.requests[0].headers["Accept"]
+        assert parse_qs(fake_api.requests[1].query)["continue"] == ["t1"]
+
+    @pytest.mark.usefixtures("discovered_fake_api")
+    def test_list_kind(self, fake_api, capsys):
+        fake_api.add("/apis/apps/v1/namespaces/test/deployments", table([("test", ["web", "2/2", "", "1h"])]))
+        assert run_command_line(["list", "deployment", "-c", "fake", "-n", "test", "-l", "app=web"]) == 0
+        out = capsys.readouterr().out.splitlines()
+        assert out[-3:] == ["NAME\tREADY\tAGE", "web\t2/2\t1h", "results: 1"]
+        request = fake_api.requests_of("/apis/apps/v1/namespaces/test/deployments")[0]
+        assert parse_qs(request.query) == {"labelSelector": ["app=web"], "limit": ["500"]}
+
+    def test_list_custom_resources(self, fake_api, capsys):
+        fake_api.add("/api", CORE)
+        fake_api.add("/apis", {"kind": "APIGroupList", "groups": [
+            {"name": "cert-manager.io", "versions": [{"groupVersion": "cert-manager.io/v1", "version": "v1"}],
+             "preferredVersion": {"groupVersion": "cert-manager.io/v1", "version": "v1"}}]})
+        fake_api.add("/api/v1", RESOURCES["/api/v1"])
+        fake_api.add("/apis/cert-manager.io/v1", {"resources": [
+            {"name": "certificates", "kind": "Certificate", "namespaced": True}]})
+        fake_api.add("/apis/cert-manager.io/v1/certificates", table([("test", ["tls", "True", "", "1d"])]))
+        assert run_command_line(["list", "objects", "-c", "fake", "--kind", "Certificate"]) == 0
+        assert "test\ttls\tTrue\t1d" in capsys.readouterr().out.splitlines()
+
+    def test_server_without_tables(self, fake_api, capsys):
+        fake_api.add("/api/v1/pods", {"kind": "PodList", "items": []})
+        assert run_command_line(["list", "pods-by-context", "-c", "fake", "-o", "table"]) == 1
+        assert "cannot render a table" in capsys.readouterr().err
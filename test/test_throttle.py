@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import pytest
+
+from lib.stats import request_stats
+from lib.throttle import TokenBucket, parse_limit
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = list()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(round(seconds, 6))
+        self.now += seconds
+
+
+class TestTokenBucket:
+
+    def test_burst_then_qps(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, 3, "alpha", clock=clock, sleep=clock.sleep)
+        waits = [round(bucket.acquire(), 6) for i in range(5)]
+        assert waits == [0, 0, 0, 0.1, 0.1]
+
+        clock.now += 1
+        assert bucket.acquire() == 0
+        assert request_stats.get("alpha", "throttled") >= 2
+
+    def test_disabled(self):
+        clock = FakeClock()
+        bucket = TokenBucket(0, 1, clock=clock, sleep=clock.sleep)
+        assert [bucket.acquire() for i in range(10)] == [0.0] * 10
+        assert clock.slept == []
+
+    def test_limits_per_context(self):
+        assert parse_limit(None, "prod", 50.0) == 50.0
+        assert parse_limit("20,prod=5", "prod", 50.0) == 5.0
+        assert parse_limit("20,prod=5", "dev", 50.0) == 20.0
+        assert parse_limit("prod=7", "prod", 300, int) == 7
+        with pytest.raises(SystemExit):
+            parse_limit("fast", "prod", 50.0)
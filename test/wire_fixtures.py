@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2019 EXXETA AG and others.
+#
+# This file is part of k8s-python-tools
+# (see https://github.com/EXXETA/k8s-python-tools).
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import json
+
+from lib.protobuf import MESSAGES, MAGIC, STRING, INT, BOOL, MAP
+
+"""Pod lists in JSON and protobuf wire format for tests and benchmarks. The protobuf encoder knows some more fields
+than the decoder, so the skipped parts of a pod are part of the fixture, too."""
+
+FIXTURE_MESSAGES = dict(MESSAGES)
+FIXTURE_MESSAGES["PodSpec"] = dict(MESSAGES["PodSpec"], containers=(2, ["Container"]))
+FIXTURE_MESSAGES["PodStatus"] = dict(MESSAGES["PodStatus"], conditions=(2, ["PodCondition"]))
+FIXTURE_MESSAGES["Container"] = {"name": (1, STRING), "image": (2, STRING), "ports": (6, ["ContainerPort"]),
+                                 "env": (7, ["EnvVar"])}
+FIXTURE_MESSAGES["ContainerPort"] = {"containerPort": (3, INT)}
+FIXTURE_MESSAGES["EnvVar"] = {"name": (1, STRING), "value": (2, STRING)}
+FIXTURE_MESSAGES["PodCondition"] = {"type": (1, STRING), "status": (2, STRING)}
+FIXTURE_MESSAGES["PartialObjectMetadata"] = {"metadata": (1, "ObjectMeta")}
+
+
+def encode_varint(value) -> bytes:
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode_field(number, field_type, value) -> bytes:
+    if field_type in (INT, BOOL):
+        return encode_varint(number << 3) + encode_varint(int(value))
+    if field_type == STRING:
+        content = value.encode("utf-8")
+    elif field_type == "bytes":
+        content = value
+    elif field_type == MAP:
+        content = encode_field(1, STRING, value[0]) + encode_field(2, STRING, value[1])
+    else:
+        content = encode_message(value, field_type)
+    return encode_varint(number << 3 | 2) + encode_varint(len(content)) + content
+
+
+def encode_message(value: dict, message) -> bytes:
+    fields = FIXTURE_MESSAGES[message] if isinstance(message, str) else message
+    out = bytearray()
+    for name, (number, field_type) in sorted(fields.items(), key=lambda i: i[1][0]):
+        if value.get(name) is None:
+            continue
+        if isinstance(field_type, list):
+            for i in value[name]:
+                out += encode_field(number, field_type[0], i)
+        elif field_type == MAP:
+            for i in sorted(value[name].items()):
+                out += encode_field(number, MAP, i)
+        else:
+            out += encode_field(number, field_type, value[name])
+    return bytes(out)
+
+
+def encode_list(list_object: dict) -> bytes:
+    kind = list_object["kind"]
+    item_message = kind[:-len("List")]
+    metadata = encode_message(list_object.get("metadata", {}), "ListMeta")
+    raw = [encode_field(1, "bytes", metadata)] if metadata else []
+    for i in list_object["items"]:
+        raw.append(encode_field(2, item_message, i))
+    raw = b"".join(raw)
+    unknown = encode_field(1, "TypeMeta", {"apiVersion": list_object["apiVersion"], "kind": kind}) \
+        + encode_field(2, "bytes", raw)
+    return MAGIC + unknown
+
+
+def pod(index) -> dict:
+    name = "app-%d-7d9f8c6b5-x%05d" % (index % 100, index)
+    return {"metadata": {"name": name, "namespace": "team-%d" % (index % 40), "uid": "uid-%d" % index,
+                         "resourceVersion": str(1000 + index), "labels": {"app": "app-%d" % (index % 100),
+                                                                          "pod-template-hash": "7d9f8c6b5"},
+                         "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet",
+                                              "name": "app-%d-7d9f8c6b5" % (index % 100),
+                                              "uid": "rs-%d" % (index % 100), "controller": True}]},
+            "spec": {"nodeName": "node-%d" % (index % 50), "serviceAccountName": "default",
+                     "containers": [{"name": "app", "image": "registry.example.com/app:%d" % (index % 7),
+                                     "ports": [{"containerPort": 8080}],
+                                     "env": [{"name": "ENV_%d" % i, "value": "value-%d" % i} for i in range(12)]}]},
+            "status": {"phase": "Running", "hostIP": "10.1.%d.%d" % (index % 50, 1), "qosClass": "Burstable",
+                       "podIP": "10.2.%d.%d" % (index // 250 % 250, index % 250),
+                       "conditions": [{"type": t, "status": "True"}
+                                      for t in ["Initialized", "Ready", "ContainersReady", "PodScheduled"]]}}
+
+
+def pod_list(count) -> dict:
+    return {"kind": "PodList", "apiVersion": "v1", "metadata": {"resourceVersion": "999999"},
+            "items": [pod(i) for i in range(count)]}
+
+
+def pod_list_fixtures(count) -> (bytes, bytes):
+    """
+    Returns the same pod list as JSON and as protobuf
+    """
+    data = pod_list(count)
+    return json.dumps(data).encode("utf-8"), encode_list(data)